@@ -4,6 +4,9 @@ import os
 
 def create_app():
     app = Flask(__name__)
+    # Uploads grandes vão para um arquivo temporário que a rota pode assumir sem copiar
+    from app.services.uploads import RequisicaoUpload
+    app.request_class = RequisicaoUpload
     
     # Configuração CORS mais permissiva para desenvolvimento
     CORS(app, resources={
@@ -21,7 +24,8 @@ def create_app():
     app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key-muito-longa-aqui-123')
     app.config['MONGODB_URI'] = os.environ.get('MONGODB_URI', 'mongodb://localhost:27017/simple-lib')
     app.config['UPLOAD_FOLDER'] = os.environ.get('UPLOAD_FOLDER', 'uploads')
-    app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB
+    # Uploads maiores que 500KB são gravados em disco uma única vez e importados em streaming
+    app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get('MAX_UPLOAD_MB', 512)) * 1024 * 1024
     
     # Criar diretório de uploads
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
@@ -31,9 +35,32 @@ def create_app():
         from app.services.database import mongo
         mongo.connect()
         print("Database configurado com sucesso!")
+        
+        # Migrações e índices são aplicados por migrar_banco.py, não a cada inicialização
+        from app.services.indices import migracoes_pendentes
+        try:
+            pendentes = migracoes_pendentes()
+            if pendentes:
+                print(f"⚠️  Migrações pendentes: {pendentes}. Execute: python migrar_banco.py")
+        except Exception as e:
+            print(f"Erro ao verificar migrações pendentes: {e}")
+        
+        # Importações interrompidas por um reinício não são retomadas
+        from app.services.importacao import expirar_importacoes_abandonadas
+        try:
+            # Na inicialização nenhuma importação pendente tem worker: as antigas ficaram órfãs
+            expiradas = expirar_importacoes_abandonadas(incluir_pendentes=True)
+            if expiradas:
+                print(f"{expiradas} importação(ões) interrompida(s) marcada(s) como falha")
+        except Exception as e:
+            print(f"Erro ao expirar importações interrompidas: {e}")
     except ImportError as e:
         print(f"Erro ao importar database: {e}")
     
+    # Workers que enviam as notificações gravadas na caixa de saída
+    from app.services.caixa_saida import iniciar_verificacao_periodica
+    iniciar_verificacao_periodica()
+    
     # Registrar blueprints
     from app.routes.auth import auth_bp
     from app.routes.eventos import eventos_bp
@@ -1,6 +1,24 @@
 from datetime import datetime
+import re
+import hashlib
 from app.services.database import mongo
+from app.models.autor import normalizar_nome
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+
+def normalizar_titulo(titulo):
+    """Forma canônica do título: sem comandos e chaves LaTeX, acentos, caixa, espaços extras e ponto final"""
+    texto = re.sub(r'\\[a-zA-Z]+\*?', ' ', titulo or '')  # \textit, \emph, ...
+    texto = re.sub(r'\\[^a-zA-Z\s]', '', texto)           # acentos como \'e e \~a
+    texto = texto.replace('{', '').replace('}', '')
+    return normalizar_nome(texto).rstrip('. ')
+
+def hash_titulo(titulo):
+    """Hash do título normalizado, usado na detecção de duplicatas (None para títulos vazios)"""
+    normalizado = normalizar_titulo(titulo)
+    if not normalizado:
+        return None
+    return hashlib.sha1(normalizado.encode('utf-8')).hexdigest()
 
 class Artigo:
     def __init__(self, titulo, autores, edicao_id, resumo=None, keywords=None, pdf_path=None):
@@ -15,22 +33,30 @@ class Artigo:
     
     def save(self):
         """Salva o artigo no MongoDB"""
+        from app.services.similaridade import campos_similaridade
+        from app.services.busca_service import termos_busca
         try:
             artigos_collection = mongo.get_collection('artigos')
             artigo_data = {
                 'titulo': self.titulo,
+                'titulo_hash': hash_titulo(self.titulo),
                 'autores': self.autores,
+                'termos': termos_busca(self.titulo, self.autores),
                 'edicao_id': ObjectId(self.edicao_id),
                 'resumo': self.resumo,
                 'keywords': self.keywords,
                 'pdf_path': self.pdf_path,
                 'data_publicacao': self.data_publicacao,
-                'data_criacao': self.data_criacao
+                'data_criacao': self.data_criacao,
+                **campos_similaridade(self.titulo, self.resumo)
             }
             print(f"Tentando salvar artigo: {self.titulo}")
             result = artigos_collection.insert_one(artigo_data)
             print(f"Artigo salvo no MongoDB com ID: {result.inserted_id}")
             return result
+        except DuplicateKeyError:
+            # Já existe um artigo com o mesmo título normalizado (índice titulo_hash_unico)
+            raise
         except Exception as e:
             print(f"Erro ao salvar artigo no MongoDB: {e}")
             return None
@@ -67,16 +93,47 @@ class Artigo:
     @staticmethod
     def update(artigo_id, update_data):
         """Atualiza um artigo"""
+        from app.services.busca_service import termos_busca
         try:
             artigos_collection = mongo.get_collection('artigos')
+            if update_data.get('edicao_id'):
+                update_data['edicao_id'] = ObjectId(update_data['edicao_id'])
+            if update_data.get('titulo'):
+                update_data['titulo_hash'] = hash_titulo(update_data['titulo'])
+            if 'titulo' in update_data or 'autores' in update_data:
+                # Os termos da busca por prefixo dependem dos dois campos
+                atual = artigos_collection.find_one({'_id': ObjectId(artigo_id)}, {'titulo': 1, 'autores': 1}) or {}
+                update_data['termos'] = termos_busca(
+                    update_data.get('titulo', atual.get('titulo')),
+                    update_data.get('autores', atual.get('autores'))
+                )
             return artigos_collection.update_one(
                 {'_id': ObjectId(artigo_id)},
                 {'$set': update_data}
             )
+        except DuplicateKeyError:
+            raise
         except Exception as e:
             print(f"Erro ao atualizar artigo: {e}")
             return None
     
+    @staticmethod
+    def atualizar_similaridade(artigo_id):
+        """Recalcula a assinatura MinHash e os baldes LSH após mudança de título ou resumo"""
+        from app.services.similaridade import campos_similaridade
+        try:
+            artigos_collection = mongo.get_collection('artigos')
+            artigo = artigos_collection.find_one({'_id': ObjectId(artigo_id)}, {'titulo': 1, 'resumo': 1})
+            if not artigo:
+                return None
+            return artigos_collection.update_one(
+                {'_id': artigo['_id']},
+                {'$set': campos_similaridade(artigo.get('titulo'), artigo.get('resumo'))}
+            )
+        except Exception as e:
+            print(f"Erro ao atualizar similaridade do artigo: {e}")
+            return None
+    
     @staticmethod
     def delete(artigo_id):
         """Deleta um artigo"""
@@ -1,4 +1,13 @@
 from datetime import datetime
+import re
+import unicodedata
+from pymongo import UpdateOne
+from app.services.database import mongo
+
+def normalizar_nome(nome):
+    """Chave de um autor: sem acentos, minúsculas e com espaços simples"""
+    sem_acentos = unicodedata.normalize('NFKD', nome or '').encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'\s+', ' ', sem_acentos).strip().lower()
 
 class Autor:
     def __init__(self, nome, email, instituicao=None, orcid=None):
@@ -8,7 +17,7 @@ class Autor:
         self.orcid = orcid
         self.artigos = []  # Lista de IDs de artigos
         self.data_criacao = datetime.utcnow()
-    
+
     def to_dict(self):
         return {
             'nome': self.nome,
@@ -18,3 +27,116 @@ class Autor:
             'artigos': self.artigos,
             'data_criacao': self.data_criacao.isoformat()
         }
+
+    @staticmethod
+    def _agrupar_por_autor(artigos):
+        """Agrupa (artigo_id, autores) por nome normalizado -> (nome exibido, IDs dos artigos)"""
+        grupos = {}
+        for artigo_id, autores in artigos:
+            for autor in autores or []:
+                nome = (autor.get('nome') or '').strip()
+                chave = normalizar_nome(nome)
+                if not chave:
+                    continue
+                grupo = grupos.setdefault(chave, (nome, []))
+                grupo[1].append(artigo_id)
+        return grupos
+
+    @staticmethod
+    def registrar_artigos(artigos):
+        """Adiciona artigos aos documentos de seus autores, criando-os quando necessário.
+
+        Recebe pares (artigo_id, autores) e faz um único bulk_write com um
+        upsert por autor distinto, o que serve tanto para um artigo quanto
+        para uma importação em lote.
+        """
+        try:
+            grupos = Autor._agrupar_por_autor(artigos)
+            if not grupos:
+                return None
+            autores_collection = mongo.get_collection('autores')
+            agora = datetime.utcnow()
+            operacoes = [
+                UpdateOne(
+                    {'nome_normalizado': chave},
+                    {
+                        '$setOnInsert': {'nome_normalizado': chave, 'nome': nome, 'data_criacao': agora},
+                        '$addToSet': {'artigos': {'$each': artigos_ids}}
+                    },
+                    upsert=True
+                )
+                for chave, (nome, artigos_ids) in grupos.items()
+            ]
+            return autores_collection.bulk_write(operacoes, ordered=False)
+        except Exception as e:
+            print(f"Erro ao registrar artigos nos autores: {e}")
+            return None
+
+    @staticmethod
+    def remover_artigos(artigos):
+        """Remove artigos dos documentos de seus autores e apaga autores sem artigos"""
+        try:
+            grupos = Autor._agrupar_por_autor(artigos)
+            if not grupos:
+                return None
+            autores_collection = mongo.get_collection('autores')
+            operacoes = [
+                UpdateOne({'nome_normalizado': chave}, {'$pullAll': {'artigos': artigos_ids}})
+                for chave, (_, artigos_ids) in grupos.items()
+            ]
+            result = autores_collection.bulk_write(operacoes, ordered=False)
+            autores_collection.delete_many({'nome_normalizado': {'$in': list(grupos)}, 'artigos': {'$size': 0}})
+            return result
+        except Exception as e:
+            print(f"Erro ao remover artigos dos autores: {e}")
+            return None
+
+    @staticmethod
+    def find_by_nome(nome):
+        """Encontra o autor pelo nome (comparação normalizada)"""
+        try:
+            autores_collection = mongo.get_collection('autores')
+            autor = autores_collection.find_one({'nome_normalizado': normalizar_nome(nome)})
+            if autor:
+                autor['_id'] = str(autor['_id'])
+            return autor
+        except Exception as e:
+            print(f"Erro ao buscar autor por nome: {e}")
+            return None
+
+    @staticmethod
+    def find_all(limite=100, apos=None):
+        """Lista autores em ordem alfabética com o total de artigos de cada um.
+
+        `apos` é o nome_normalizado do último autor da página anterior.
+        """
+        try:
+            autores_collection = mongo.get_collection('autores')
+            filtro = {'nome_normalizado': {'$gt': apos}} if apos else {}
+            autores = list(autores_collection.find(
+                filtro,
+                {'nome': 1, 'nome_normalizado': 1, 'total_artigos': {'$size': '$artigos'}}
+            ).sort('nome_normalizado', 1).limit(limite))
+            for autor in autores:
+                autor['_id'] = str(autor['_id'])
+            return autores
+        except Exception as e:
+            print(f"Erro ao listar autores: {e}")
+            return []
+
+    @staticmethod
+    def reconstruir(lote=1000):
+        """Recalcula a coleção de autores a partir de todos os artigos, em lotes"""
+        artigos_collection = mongo.get_collection('artigos')
+        total = 0
+        pendentes = []
+        for artigo in artigos_collection.find({}, {'autores.nome': 1}):
+            pendentes.append((artigo['_id'], artigo.get('autores', [])))
+            if len(pendentes) >= lote:
+                Autor.registrar_artigos(pendentes)
+                total += len(pendentes)
+                pendentes = []
+        if pendentes:
+            Autor.registrar_artigos(pendentes)
+            total += len(pendentes)
+        return total
@@ -0,0 +1,150 @@
+import re
+from datetime import datetime, timedelta
+from app.services.database import mongo
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
+
+# Situações de um item da caixa de saída
+PENDENTE = 'pendente'
+PROCESSANDO = 'processando'
+CONCLUIDO = 'concluido'
+FALHOU = 'falhou'
+
+class CaixaSaida:
+    """Itens de trabalho assíncrono (notificações) gravados junto com a alteração que os originou"""
+
+    @staticmethod
+    def _documento(tipo, dados, chave=None):
+        agora = datetime.utcnow()
+        documento = {
+            'tipo': tipo,
+            'dados': dados,
+            'status': PENDENTE,
+            'tentativas': 0,
+            'proxima_tentativa': agora,
+            'reservado_ate': None,
+            'error': None,
+            'criado_em': agora,
+            'concluido_em': None
+        }
+        if chave is not None:
+            documento['chave'] = chave
+        return documento
+
+    @staticmethod
+    def adicionar(tipo, dados, chave=None):
+        """Grava um item pendente e retorna seu ID"""
+        caixa_collection = mongo.get_collection('caixa_saida')
+        return caixa_collection.insert_one(CaixaSaida._documento(tipo, dados, chave)).inserted_id
+
+    @staticmethod
+    def adicionar_em_lote(itens):
+        """Grava vários itens (tipo, dados, chave) em uma escrita não ordenada; retorna quantos foram criados.
+
+        Itens cuja `chave` já existe (índice único chave_unica) são ignorados,
+        o que torna seguro repetir a distribuição de uma notificação.
+        """
+        documentos = [CaixaSaida._documento(tipo, dados, chave) for tipo, dados, chave in itens]
+        if not documentos:
+            return 0
+        caixa_collection = mongo.get_collection('caixa_saida')
+        try:
+            return len(caixa_collection.insert_many(documentos, ordered=False).inserted_ids)
+        except BulkWriteError as e:
+            if any(erro.get('code') != 11000 for erro in e.details.get('writeErrors', [])):
+                raise
+            return e.details.get('nInserted', 0)
+
+    @staticmethod
+    def acumular(tipo, itens, disponivel_em):
+        """Acrescenta entradas a itens pendentes identificados por chave, criando-os se preciso.
+
+        `itens` é uma lista de (chave, dados, entradas). Cada item junta as
+        entradas recebidas até ficar pronto ($addToSet, então repetir a mesma
+        entrada não a duplica). O prazo só avança: cada chamada o estende até
+        `disponivel_em` ($max), para que um item que continua recebendo
+        entradas não seja enviado no meio do acúmulo. Retorna as chaves que não
+        puderam ser usadas porque o item já saiu de pendente (foi reservado por
+        um worker); quem chamou deve usar outra chave para essas entradas.
+        """
+        if not itens:
+            return []
+        documento_base = CaixaSaida._documento(tipo, None)
+        del documento_base['proxima_tentativa']
+        operacoes = []
+        for chave, dados, entradas in itens:
+            documento = {**documento_base, 'dados': dados, 'chave': chave}
+            operacoes.append(UpdateOne(
+                {'chave': chave, 'status': PENDENTE},
+                {
+                    '$setOnInsert': documento,
+                    '$max': {'proxima_tentativa': disponivel_em},
+                    '$addToSet': {'entradas': {'$each': entradas}}
+                },
+                upsert=True
+            ))
+        caixa_collection = mongo.get_collection('caixa_saida')
+        try:
+            caixa_collection.bulk_write(operacoes, ordered=False)
+        except BulkWriteError as e:
+            erros = e.details.get('writeErrors', [])
+            if any(erro.get('code') != 11000 for erro in erros):
+                raise
+            return [itens[erro['index']][0] for erro in erros]
+        return []
+
+    @staticmethod
+    def liberar(prefixo_chave):
+        """Antecipa para agora os itens pendentes cuja chave começa com o prefixo; retorna quantos"""
+        caixa_collection = mongo.get_collection('caixa_saida')
+        result = caixa_collection.update_many(
+            {'chave': {'$regex': '^' + re.escape(prefixo_chave)}, 'status': PENDENTE},
+            {'$set': {'proxima_tentativa': datetime.utcnow()}}
+        )
+        return result.modified_count
+
+    @staticmethod
+    def reservar(duracao):
+        """Reserva atomicamente o próximo item pronto para processamento, ou retorna None.
+
+        Itens em processamento cuja reserva expirou (worker interrompido)
+        voltam a ficar disponíveis.
+        """
+        agora = datetime.utcnow()
+        caixa_collection = mongo.get_collection('caixa_saida')
+        return caixa_collection.find_one_and_update(
+            {'$or': [
+                {'status': PENDENTE, 'proxima_tentativa': {'$lte': agora}},
+                {'status': PROCESSANDO, 'reservado_ate': {'$lt': agora}}
+            ]},
+            {'$set': {'status': PROCESSANDO, 'reservado_ate': agora + timedelta(seconds=duracao)},
+             '$inc': {'tentativas': 1}},
+            sort=[('proxima_tentativa', 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    @staticmethod
+    def concluir(item_id):
+        caixa_collection = mongo.get_collection('caixa_saida')
+        caixa_collection.update_one(
+            {'_id': item_id},
+            {'$set': {'status': CONCLUIDO, 'error': None, 'concluido_em': datetime.utcnow()}}
+        )
+
+    @staticmethod
+    def reagendar(item_id, error, atraso):
+        """Devolve o item à fila para nova tentativa daqui a `atraso` segundos"""
+        caixa_collection = mongo.get_collection('caixa_saida')
+        caixa_collection.update_one(
+            {'_id': item_id},
+            {'$set': {'status': PENDENTE, 'error': error, 'reservado_ate': None,
+                      'proxima_tentativa': datetime.utcnow() + timedelta(seconds=atraso)}}
+        )
+
+    @staticmethod
+    def falhar(item_id, error):
+        caixa_collection = mongo.get_collection('caixa_saida')
+        caixa_collection.update_one(
+            {'_id': item_id},
+            {'$set': {'status': FALHOU, 'error': error, 'concluido_em': datetime.utcnow()}}
+        )
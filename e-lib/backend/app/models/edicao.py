@@ -1,6 +1,7 @@
 from datetime import datetime
 from app.services.database import mongo
 from bson import ObjectId
+from bson.errors import InvalidId
 
 class EdicaoEvento:
     def __init__(self, evento_id, ano, local, data_inicio=None, data_fim=None):
@@ -30,28 +31,35 @@ class EdicaoEvento:
     def find_by_evento(evento_id):
         """Encontra todas as edições de um evento"""
         edicoes_collection = mongo.get_collection('edicoes')
-        
-        # Tentar buscar com ObjectId e com string (compatibilidade com dados antigos)
         try:
             evento_obj_id = ObjectId(evento_id)
-            edicoes = list(edicoes_collection.find({
-                '$or': [
-                    {'evento_id': evento_obj_id},
-                    {'evento_id': str(evento_id)}
-                ]
-            }))
-        except:
-            # Se não conseguir converter para ObjectId, busca apenas como string
-            edicoes = list(edicoes_collection.find({'evento_id': str(evento_id)}))
+        except (InvalidId, TypeError):
+            return []
+        
+        # evento_id é sempre gravado como ObjectId (ver migração 2 em app/services/indices.py)
+        edicoes = list(edicoes_collection.find({'evento_id': evento_obj_id}))
         
         # Converter ObjectId para string
         for edicao in edicoes:
             edicao['_id'] = str(edicao['_id'])
-            # Normalizar evento_id para string
-            if isinstance(edicao.get('evento_id'), ObjectId):
-                edicao['evento_id'] = str(edicao['evento_id'])
+            edicao['evento_id'] = str(edicao['evento_id'])
         return edicoes
     
+    @staticmethod
+    def find_by_evento_ano(evento_id, ano):
+        """Encontra a edição de um evento em um ano (índice único evento_id + ano)"""
+        edicoes_collection = mongo.get_collection('edicoes')
+        try:
+            evento_obj_id = ObjectId(evento_id)
+        except (InvalidId, TypeError):
+            return None
+        
+        edicao = edicoes_collection.find_one({'evento_id': evento_obj_id, 'ano': ano})
+        if edicao:
+            edicao['_id'] = str(edicao['_id'])
+            edicao['evento_id'] = str(edicao['evento_id'])
+        return edicao
+    
     @staticmethod
     def find_by_id(edicao_id):
         """Encontra edição por ID"""
@@ -1,6 +1,7 @@
 from datetime import datetime
 from app.services.database import mongo
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
 
 class Evento:
     def __init__(self, nome, sigla, descricao=None):
@@ -23,6 +24,9 @@ class Evento:
             result = eventos_collection.insert_one(evento_data)
             print(f"Evento salvo no MongoDB com ID: {result.inserted_id}")
             return result
+        except DuplicateKeyError:
+            # Já existe um evento com a mesma sigla (índice sigla_unica)
+            raise
         except Exception as e:
             print(f"Erro ao salvar evento no MongoDB: {e}")
             return None
@@ -65,6 +69,8 @@ class Evento:
                 {'_id': ObjectId(evento_id)},
                 {'$set': update_data}
             )
+        except DuplicateKeyError:
+            raise
         except Exception as e:
             print(f"Erro ao atualizar evento: {e}")
             return None
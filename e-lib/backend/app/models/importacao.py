@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+from app.services.database import mongo
+from bson import ObjectId
+from bson.errors import InvalidId
+
+# Situações de uma importação em lote
+PENDENTE = 'pendente'
+PROCESSANDO = 'processando'
+CONCLUIDA = 'concluida'
+FALHOU = 'falhou'
+
+class Importacao:
+    """Registro de uma importação BibTeX executada em segundo plano"""
+
+    @staticmethod
+    def create(arquivo):
+        """Cria o registro da importação e retorna seu ID"""
+        agora = datetime.utcnow()
+        importacoes_collection = mongo.get_collection('importacoes')
+        result = importacoes_collection.insert_one({
+            'arquivo': arquivo,
+            'status': PENDENTE,
+            'progresso': {'etapa': None, 'processadas': 0, 'total': 0},
+            'stats': None,
+            'error': None,
+            'criado_em': agora,
+            'atualizado_em': agora,
+            'iniciado_em': None,
+            'concluido_em': None
+        })
+        return result.inserted_id
+
+    @staticmethod
+    def find_by_id(importacao_id):
+        """Encontra uma importação por ID"""
+        try:
+            importacoes_collection = mongo.get_collection('importacoes')
+            importacao = importacoes_collection.find_one({'_id': ObjectId(importacao_id)})
+            if importacao:
+                importacao['_id'] = str(importacao['_id'])
+            return importacao
+        except (InvalidId, TypeError):
+            return None
+
+    @staticmethod
+    def iniciar(importacao_id):
+        """Passa a importação de pendente para em andamento; retorna False se ela já expirou"""
+        agora = datetime.utcnow()
+        importacoes_collection = mongo.get_collection('importacoes')
+        result = importacoes_collection.update_one(
+            {'_id': ObjectId(importacao_id), 'status': PENDENTE},
+            {'$set': {'status': PROCESSANDO, 'iniciado_em': agora, 'atualizado_em': agora}}
+        )
+        return result.modified_count > 0
+
+    @staticmethod
+    def atualizar_progresso(importacao_id, etapa, processadas, total):
+        importacoes_collection = mongo.get_collection('importacoes')
+        importacoes_collection.update_one(
+            {'_id': ObjectId(importacao_id)},
+            {'$set': {'progresso': {'etapa': etapa, 'processadas': processadas, 'total': total},
+                      'atualizado_em': datetime.utcnow()}}
+        )
+
+    @staticmethod
+    def concluir(importacao_id, stats):
+        importacoes_collection = mongo.get_collection('importacoes')
+        importacoes_collection.update_one(
+            {'_id': ObjectId(importacao_id)},
+            {'$set': {'status': CONCLUIDA, 'stats': stats, 'concluido_em': datetime.utcnow()}}
+        )
+
+    @staticmethod
+    def falhar(importacao_id, error):
+        importacoes_collection = mongo.get_collection('importacoes')
+        importacoes_collection.update_one(
+            {'_id': ObjectId(importacao_id)},
+            {'$set': {'status': FALHOU, 'error': error, 'concluido_em': datetime.utcnow()}}
+        )
+
+    @staticmethod
+    def abandonada(importacao, segundos, agora=None):
+        """Indica se uma importação em andamento está sem atualização há mais de `segundos`"""
+        if importacao.get('status') != PROCESSANDO or not importacao.get('atualizado_em'):
+            return False
+        agora = agora or datetime.utcnow()
+        return importacao['atualizado_em'] < agora - timedelta(seconds=segundos)
+
+    @staticmethod
+    def expirar_abandonadas(segundos, error, incluir_pendentes=False):
+        """Marca como falhas as importações em andamento sem atualização há `segundos`.
+
+        O worker atualiza `atualizado_em` a cada lote; uma importação parada
+        assim foi interrompida (ex.: reinício do servidor) e não será retomada.
+        Importações pendentes só entram com `incluir_pendentes` (na
+        inicialização): enquanto o servidor roda, uma pendente antiga pode estar
+        apenas esperando na fila atrás de importações longas.
+        Retorna quantas foram marcadas.
+        """
+        limite = datetime.utcnow() - timedelta(seconds=segundos)
+        status = [PENDENTE, PROCESSANDO] if incluir_pendentes else [PROCESSANDO]
+        importacoes_collection = mongo.get_collection('importacoes')
+        result = importacoes_collection.update_many(
+            {'status': {'$in': status}, '$or': [
+                {'atualizado_em': {'$lt': limite}},
+                {'atualizado_em': {'$exists': False}, 'criado_em': {'$lt': limite}}
+            ]},
+            {'$set': {'status': FALHOU, 'error': error, 'concluido_em': datetime.utcnow()}}
+        )
+        return result.modified_count
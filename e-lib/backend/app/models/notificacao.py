@@ -1,4 +1,5 @@
 from datetime import datetime
+import re
 from app.services.database import mongo
 from bson import ObjectId
 
@@ -32,7 +33,8 @@ class Notificacao:
         try:
             notificacoes_collection = mongo.get_collection('notificacoes')
             notificacoes = list(notificacoes_collection.find({
-                'nome_autor': {'$regex': nome_autor, '$options': 'i'},
+                # O nome é texto literal, não uma expressão regular
+                'nome_autor': {'$regex': re.escape(nome_autor), '$options': 'i'},
                 'ativo': True
             }))
             return notificacoes
@@ -40,6 +42,16 @@ class Notificacao:
             print(f"Erro ao buscar notificações: {e}")
             return []
     
+    @staticmethod
+    def listar_ativas():
+        """Lista email e nome do autor de todas as inscrições ativas.
+
+        Erros do banco são propagados: uma lista vazia seria confundida com
+        "nenhum inscrito" por quem monta o índice de inscrições.
+        """
+        notificacoes_collection = mongo.get_collection('notificacoes')
+        return list(notificacoes_collection.find({'ativo': True}, {'email': 1, 'nome_autor': 1}))
+
     @staticmethod
     def desativar_inscricao(notificacao_id):
         """Desativa uma inscrição"""
@@ -1,12 +1,18 @@
 from flask import Blueprint, request, jsonify
 from app.models.artigo import Artigo
+from app.models.autor import Autor
 from app.services.auth import auth_service
-from app.services.database import mongo # Importação adicionada para a busca
+from app.services.busca_service import (
+    filtro_busca, buscar_pagina, contar_resultados, enriquecer_artigos, ler_limite
+)
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
 import os
 import json
 from werkzeug.utils import secure_filename
 from app.routes.notificacoes import notificar_novo_artigo
+from app.services.cache import registrar_alteracao, condicional
+from app.services.similaridade import pares_duplicados, LIMIAR_SIMILARIDADE
 
 artigos_bp = Blueprint('artigos', __name__)
 
@@ -20,6 +26,7 @@ def allowed_file(filename):
 # --- ROTAS CRUD BÁSICAS ---
 
 @artigos_bp.route('/edicao/<edicao_id>', methods=['GET'])
+@condicional('artigos')
 def listar_artigos_edicao(edicao_id):
     """Lista todos os artigos de uma edição"""
     try:
@@ -72,22 +79,30 @@ def criar_artigo():
         if result is None:
             return jsonify({'error': 'Falha ao salvar artigo no banco de dados'}), 500
         
-        # ADICIONE AQUI A NOTIFICAÇÃO DO NOVO ARTIGO
-        if result is not None:
-            # Buscar o artigo salvo para notificar
-            artigo_salvo = Artigo.find_by_id(str(result.inserted_id))
-            if artigo_salvo:
-                notificar_novo_artigo(artigo_salvo)
+        # Manter a coleção de autores atualizada e descartar a homepage da edição em cache
+        Autor.registrar_artigos([(result.inserted_id, artigo.autores)])
+        registrar_alteracao('artigos', edicoes=[artigo.edicao_id])
+        
+        # Notificação dos inscritos: só grava na caixa de saída, o envio é assíncrono
+        notificar_novo_artigo({
+            '_id': result.inserted_id,
+            'titulo': artigo.titulo,
+            'autores': artigo.autores,
+            'resumo': artigo.resumo
+        })
         
         return jsonify({
             'message': 'Artigo criado com sucesso',
             'artigo_id': str(result.inserted_id)
         }), 201
+    except DuplicateKeyError:
+        return jsonify({'error': 'Já existe um artigo com este título'}), 409
     except Exception as e:
         print(f"Erro na rota criar_artigo: {e}")
         return jsonify({'error': str(e)}), 500
 
 @artigos_bp.route('/<artigo_id>', methods=['GET'])
+@condicional('artigos')
 def obter_artigo(artigo_id):
     """Obtém um artigo específico"""
     try:
@@ -107,10 +122,21 @@ def atualizar_artigo(artigo_id):
         if not data:
             return jsonify({'error': 'Dados de atualização necessários'}), 400
         
+        # Estado anterior, para atualizar autores e o cache da edição
+        artigo_anterior = Artigo.find_by_id(artigo_id)
+        
         result = Artigo.update(artigo_id, data)
         if result and result.modified_count > 0:
+            if 'autores' in data:
+                Autor.remover_artigos([(ObjectId(artigo_id), artigo_anterior.get('autores', []))])
+                Autor.registrar_artigos([(ObjectId(artigo_id), data['autores'])])
+            if 'titulo' in data or 'resumo' in data:
+                Artigo.atualizar_similaridade(artigo_id)
+            registrar_alteracao('artigos', edicoes=[artigo_anterior.get('edicao_id'), data.get('edicao_id')])
             return jsonify({'message': 'Artigo atualizado com sucesso'})
         return jsonify({'error': 'Artigo não encontrado ou nenhuma alteração feita'}), 404
+    except DuplicateKeyError:
+        return jsonify({'error': 'Já existe um artigo com este título'}), 409
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -125,6 +151,8 @@ def deletar_artigo(artigo_id):
         
         result = Artigo.delete(artigo_id)
         if result and result.deleted_count > 0:
+            Autor.remover_artigos([(ObjectId(artigo_id), artigo.get('autores', []))])
+            registrar_alteracao('artigos', edicoes=[artigo.get('edicao_id')])
             return jsonify({'message': 'Artigo deletado com sucesso'})
         return jsonify({'error': 'Artigo não encontrado'}), 404
     except Exception as e:
@@ -153,6 +181,8 @@ def upload_pdf_artigo(artigo_id):
             result = Artigo.update(artigo_id, {'pdf_path': file_path})
             
             if result and result.modified_count > 0:
+                artigo = Artigo.find_by_id(artigo_id)
+                registrar_alteracao('artigos', edicoes=[artigo and artigo.get('edicao_id')])
                 return jsonify({'message': 'PDF enviado com sucesso', 'pdf_path': file_path})
             return jsonify({'error': 'Artigo não encontrado'}), 404
         else:
@@ -163,75 +193,66 @@ def upload_pdf_artigo(artigo_id):
 # --- ROTA DE BUSCA ---
 
 @artigos_bp.route('/busca', methods=['GET'])
+@condicional('artigos', 'edicoes', 'eventos')
 def buscar_artigos():
-    """Busca artigos por título, autor ou evento"""
+    """Busca artigos por título, autor ou evento, paginada por cursor"""
     try:
         query = request.args.get('q', '')
         tipo = request.args.get('tipo', 'tudo')  # 'titulo', 'autor', 'evento', 'tudo'
+        cursor = request.args.get('cursor')
 
         if not query:
             return jsonify({'error': 'Parâmetro de busca (q) é obrigatório'}), 400
 
-        artigos_collection = mongo.get_collection('artigos')
-        eventos_collection = mongo.get_collection('eventos')
-        edicoes_collection = mongo.get_collection('edicoes')
-        
-        artigos = []
-
-        if tipo == 'titulo':
-            artigos = list(artigos_collection.find({'titulo': {'$regex': query, '$options': 'i'}}))
-        elif tipo == 'autor':
-            artigos = list(artigos_collection.find({'autores.nome': {'$regex': query, '$options': 'i'}}))
-        elif tipo == 'evento':
-            eventos = eventos_collection.find({'$or': [{'nome': {'$regex': query, '$options': 'i'}}, {'sigla': {'$regex': query, '$options': 'i'}}]})
-            eventos_ids = [evento['_id'] for evento in eventos]
-            edicoes = edicoes_collection.find({'evento_id': {'$in': eventos_ids}})
-            edicoes_ids = [edicao['_id'] for edicao in edicoes]
-            artigos = list(artigos_collection.find({'edicao_id': {'$in': edicoes_ids}}))
-        else:  # tipo 'tudo'
-            artigos_titulo = list(artigos_collection.find({'titulo': {'$regex': query, '$options': 'i'}}))
-            artigos_autor = list(artigos_collection.find({'autores.nome': {'$regex': query, '$options': 'i'}}))
-            
-            eventos = eventos_collection.find({'$or': [{'nome': {'$regex': query, '$options': 'i'}}, {'sigla': {'$regex': query, '$options': 'i'}}]})
-            eventos_ids = [evento['_id'] for evento in eventos]
-            edicoes = edicoes_collection.find({'evento_id': {'$in': eventos_ids}})
-            edicoes_ids = [edicao['_id'] for edicao in edicoes]
-            artigos_evento = list(artigos_collection.find({'edicao_id': {'$in': edicoes_ids}}))
-
-            # Combinar resultados, evitando duplicatas
-            artigos_dict = {}
-            for artigo in artigos_titulo + artigos_autor + artigos_evento:
-                artigos_dict[str(artigo['_id'])] = artigo
-            artigos = list(artigos_dict.values())
-
-        # Enriquecer resultados com informações de edição e evento
-        resultados = []
-        for artigo in artigos:
-            edicao_id_obj = ObjectId(artigo['edicao_id'])
-            edicao = edicoes_collection.find_one({'_id': edicao_id_obj})
-            if edicao:
-                artigo['edicao_ano'] = edicao.get('ano')
-                evento_id_obj = ObjectId(edicao['evento_id'])
-                evento = eventos_collection.find_one({'_id': evento_id_obj})
-                if evento:
-                    artigo['evento_nome'] = evento.get('nome')
-                    artigo['evento_sigla'] = evento.get('sigla')
-            
-            artigo['_id'] = str(artigo['_id'])
-            artigo['edicao_id'] = str(artigo['edicao_id'])
-            resultados.append(artigo)
+        try:
+            limite = ler_limite(request.args.get('limit'))
+            # Um único filtro para todos os tipos: no 'tudo', o $or faz a união no banco
+            filtro = filtro_busca(query, tipo)
+            artigos, proximo_cursor = buscar_pagina(filtro, limite, cursor)
+        except ValueError as e:
+            return jsonify({'error': f'Parâmetro de paginação inválido: {e}'}), 400
 
-        return jsonify({
+        # Enriquecer resultados com informações de edição e evento (consultas em lote)
+        resultados = enriquecer_artigos(artigos)
+
+        resposta = {
             'resultados': resultados,
-            'total': len(resultados),
+            # `total` é o número de artigos encontrados (só na primeira página); `quantidade` é o tamanho da página
+            'total': contar_resultados(filtro, artigos, cursor, proximo_cursor),
+            'quantidade': len(resultados),
             'query': query,
-            'tipo': tipo
-        })
+            'tipo': tipo,
+            'limit': limite,
+            'proximo_cursor': proximo_cursor
+        }
+
+        return jsonify(resposta)
 
     except Exception as e:
         print(f"Erro na busca: {e}")
         return jsonify({'error': str(e)}), 500
 
+# --- ROTA DE DUPLICATAS PROVÁVEIS ---
+
+@artigos_bp.route('/duplicatas-provaveis', methods=['GET'])
+@auth_service.admin_required
+def listar_duplicatas_provaveis():
+    """Lista pares de artigos com título e resumo muito parecidos (apenas admin)"""
+    try:
+        try:
+            limiar = float(request.args.get('limiar', LIMIAR_SIMILARIDADE))
+            limite = int(request.args.get('limit', 100))
+        except ValueError:
+            return jsonify({'error': 'Parâmetros limiar e limit devem ser numéricos'}), 400
+        if not 0 < limiar <= 1 or limite < 1:
+            return jsonify({'error': 'limiar deve estar em (0, 1] e limit ser positivo'}), 400
+
+        pares = pares_duplicados(limiar, limite)
+        return jsonify({'pares': pares, 'total': len(pares), 'limiar': limiar})
+    except Exception as e:
+        print(f"Erro ao listar duplicatas prováveis: {e}")
+        return jsonify({'error': str(e)}), 500
+
 # --- ROTA DE TESTE ---
 
 @artigos_bp.route('/test', methods=['GET'])
@@ -2,10 +2,13 @@ from flask import Blueprint, request, jsonify
 from app.models.edicao import EdicaoEvento
 from app.services.auth import auth_service
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+from app.services.cache import registrar_alteracao, condicional
 
 edicoes_bp = Blueprint('edicoes', __name__)
 
 @edicoes_bp.route('/evento/<evento_id>', methods=['GET'])
+@condicional('edicoes')
 def listar_edicoes_evento(evento_id):
     """Lista todas as edições de um evento"""
     try:
@@ -46,11 +49,14 @@ def criar_edicao():
         
         result = edicao.save()
         print(f"💾 Edição salva com ID: {result.inserted_id}")
+        registrar_alteracao('edicoes')
         
         return jsonify({
             'message': 'Edição criada com sucesso',
             'edicao_id': str(result.inserted_id)
         }), 201
+    except DuplicateKeyError:
+        return jsonify({'error': 'Já existe uma edição deste evento para este ano'}), 409
     except Exception as e:
         print(f"❌ Erro ao criar edição: {e}")
         import traceback
@@ -58,6 +64,7 @@ def criar_edicao():
         return jsonify({'error': str(e)}), 500
 
 @edicoes_bp.route('/<edicao_id>', methods=['GET'])
+@condicional('edicoes')
 def obter_edicao(edicao_id):
     """Obtém uma edição específica"""
     try:
@@ -92,9 +99,12 @@ def atualizar_edicao(edicao_id):
         result = EdicaoEvento.update(edicao_id, update_data)
         
         if result.modified_count > 0:
+            registrar_alteracao('edicoes', edicoes=[edicao_id])
             return jsonify({'message': 'Edição atualizada com sucesso'})
         else:
             return jsonify({'error': 'Edição não encontrada ou nenhuma alteração feita'}), 404
+    except DuplicateKeyError:
+        return jsonify({'error': 'Já existe uma edição deste evento para este ano'}), 409
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -106,6 +116,7 @@ def deletar_edicao(edicao_id):
         result = EdicaoEvento.delete(edicao_id)
         
         if result.deleted_count > 0:
+            registrar_alteracao('edicoes', edicoes=[edicao_id])
             return jsonify({'message': 'Edição deletada com sucesso'})
         else:
             return jsonify({'error': 'Edição não encontrada'}), 404
@@ -2,11 +2,14 @@ from flask import Blueprint, request, jsonify
 from app.models.evento import Evento
 from app.services.auth import auth_service
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+from app.services.cache import registrar_alteracao, condicional
 
 eventos_bp = Blueprint('eventos', __name__)
 
 @eventos_bp.route('/', methods=['GET'])
 @eventos_bp.route('', methods=['GET'])
+@condicional('eventos')
 def listar_eventos():
     """Lista todos os eventos"""
     try:
@@ -38,15 +41,21 @@ def criar_evento():
         if result is None:
             return jsonify({'error': 'Falha ao salvar evento no banco de dados'}), 500
         
+        registrar_alteracao('eventos')
+        
         return jsonify({
             'message': 'Evento criado com sucesso',
             'evento_id': str(result.inserted_id)
         }), 201
+    except DuplicateKeyError:
+        # A sigla é única (índice eventos.sigla_unica); o índice resolve criações simultâneas
+        return jsonify({'error': 'Já existe um evento com esta sigla'}), 409
     except Exception as e:
         print(f"Erro na rota criar_evento: {e}")
         return jsonify({'error': str(e)}), 500
 
 @eventos_bp.route('/<evento_id>', methods=['GET'])
+@condicional('eventos')
 def obter_evento(evento_id):
     """Obtém um evento específico"""
     try:
@@ -82,9 +91,12 @@ def atualizar_evento(evento_id):
         print(f"💾 Resultado: modified_count={result.modified_count}")
         
         if result.modified_count > 0:
+            registrar_alteracao('eventos', eventos=[evento_id])
             return jsonify({'message': 'Evento atualizado com sucesso'})
         else:
             return jsonify({'error': 'Evento não encontrado ou nenhuma alteração feita'}), 404
+    except DuplicateKeyError:
+        return jsonify({'error': 'Já existe um evento com esta sigla'}), 409
     except Exception as e:
         print(f"❌ Erro ao atualizar evento: {e}")
         import traceback
@@ -101,6 +113,7 @@ def deletar_evento(evento_id):
         print(f"💾 Resultado: deleted_count={result.deleted_count}")
         
         if result.deleted_count > 0:
+            registrar_alteracao('eventos', eventos=[evento_id])
             return jsonify({'message': 'Evento deletado com sucesso'})
         else:
             return jsonify({'error': 'Evento não encontrado'}), 404
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from app.services.database import mongo
 from app.services.email_service import enviar_email_confirmacao_inscricao
+from pymongo.errors import DuplicateKeyError
 from datetime import datetime
 import re
 
@@ -76,6 +77,9 @@ def criar_inscricao():
             'inscricao_id': str(result.inserted_id)
         }), 201
         
+    except DuplicateKeyError:
+        # O email é único (índice inscricoes.email_unico); outra requisição inscreveu o mesmo email antes
+        return jsonify({'error': 'Este email já está inscrito'}), 409
     except Exception as e:
         print(f"❌ Erro ao criar inscrição: {e}")
         import traceback
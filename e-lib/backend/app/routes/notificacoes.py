@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from app.models.notificacao import Notificacao
-from app.services.email_service import email_service
+from app.services.caixa_saida import registrar_novo_artigo
+from app.services.inscricoes import indice_inscricoes
 
 notificacoes_bp = Blueprint('notificacoes', __name__)
 
@@ -29,6 +30,12 @@ def inscrever_notificacao():
         if result is None:
             return jsonify({'error': 'Falha ao salvar inscrição'}), 500
         
+        indice_inscricoes.adicionar({
+            '_id': result.inserted_id,
+            'email': notificacao.email,
+            'nome_autor': notificacao.nome_autor
+        })
+        
         return jsonify({
             'message': 'Inscrição realizada com sucesso',
             'notificacao_id': str(result.inserted_id)
@@ -44,6 +51,7 @@ def desinscrever_notificacao(notificacao_id):
         result = Notificacao.desativar_inscricao(notificacao_id)
         
         if result and result.modified_count > 0:
+            indice_inscricoes.remover(notificacao_id)
             return jsonify({'message': 'Inscrição desativada com sucesso'})
         else:
             return jsonify({'error': 'Inscrição não encontrada'}), 404
@@ -53,20 +61,12 @@ def desinscrever_notificacao(notificacao_id):
 
 # Função para notificar quando um artigo é criado
 def notificar_novo_artigo(artigo):
-    """Notifica todos os inscritos quando um novo artigo é publicado"""
+    """Agenda a notificação dos inscritos sobre um novo artigo.
+
+    Apenas grava a intenção na caixa de saída; a busca dos inscritos e o envio
+    dos emails são feitos pelos workers de app/services/caixa_saida.py.
+    """
     try:
-        # Para cada autor do artigo, buscar inscrições
-        for autor in artigo.get('autores', []):
-            nome_autor = autor.get('nome', '')
-            notificacoes = Notificacao.find_by_autor(nome_autor)
-            
-            for notificacao in notificacoes:
-                print(f"Notificando {notificacao['email']} sobre novo artigo de {nome_autor}")
-                email_service.enviar_notificacao(
-                    notificacao['email'],
-                    nome_autor,
-                    artigo
-                )
-                
+        registrar_novo_artigo(artigo)
     except Exception as e:
         print(f"Erro ao notificar novo artigo: {e}")
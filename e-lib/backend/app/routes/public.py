@@ -1,14 +1,22 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request, Response
 from app.models.evento import Evento
 from app.models.edicao import EdicaoEvento
 from app.models.artigo import Artigo
+from app.models.autor import Autor
 from bson import ObjectId
 from app.services.database import mongo
+from app.services.busca_service import carregar_edicoes_eventos
+from app.services.cache import cache_respostas, tag, condicional
 
 public_bp = Blueprint('public', __name__)
 
+# Autores por página em /autores (padrão e máximo do parâmetro limit)
+LIMITE_AUTORES_PADRAO = 100
+LIMITE_AUTORES_MAXIMO = 500
+
 # Homepage para cada evento (ex: /api/public/eventos/SBES)
 @public_bp.route('/eventos/<sigla>', methods=['GET'])
+@condicional('eventos', 'edicoes')
 def homepage_evento(sigla):
     """Homepage de um evento específico com suas edições"""
     try:
@@ -33,59 +41,67 @@ def homepage_evento(sigla):
 
 # Homepage para cada edição de evento (ex: /api/public/eventos/SBES/2025)
 @public_bp.route('/eventos/<sigla>/<int:ano>', methods=['GET'])
+@condicional('eventos', 'edicoes', 'artigos')
 def homepage_edicao(sigla, ano):
     """Homepage de uma edição específica com seus artigos"""
     try:
+        # Resposta já serializada, invalidada quando a edição, o evento ou seus artigos mudam
+        chave = ('homepage_edicao', sigla, ano)
+        corpo = cache_respostas.obter(chave)
+        if corpo is not None:
+            return Response(corpo, mimetype='application/json')
+        
         # Buscar evento pela sigla
         evento = Evento.find_by_sigla(sigla)
         if not evento:
             return jsonify({'error': 'Evento não encontrado'}), 404
         
         # Buscar edição específica
-        edicoes = EdicaoEvento.find_by_evento(evento['_id'])
-        edicao = None
-        for ed in edicoes:
-            if ed['ano'] == ano:
-                edicao = ed
-                break
-        
+        edicao = EdicaoEvento.find_by_evento_ano(evento['_id'], ano)
         if not edicao:
             return jsonify({'error': 'Edição não encontrada'}), 404
         
         # Buscar artigos da edição
         artigos = Artigo.find_by_edicao(edicao['_id'])
         
-        return jsonify({
+        resposta = jsonify({
             'evento': evento,
             'edicao': edicao,
             'artigos': artigos,
             'total_artigos': len(artigos)
         })
+        cache_respostas.guardar(
+            chave,
+            resposta.get_data(),
+            tags=[tag('evento', evento['_id']), tag('edicao', edicao['_id'])]
+        )
+        return resposta
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @public_bp.route('/autores/<nome>', methods=['GET'])
+@condicional('artigos', 'edicoes')
 def homepage_autor(nome):
     """Homepage pessoal de um autor com todos os seus artigos organizados por ano"""
     try:
-        # Usar a instância do MongoDB para acessar a coleção de artigos
-        artigos_collection = mongo.get_collection('artigos')
+        # Documento pré-calculado do autor (coleção mantida a cada escrita de artigos)
+        autor = Autor.find_by_nome(nome)
+        artigos = []
+        if autor:
+            artigos_collection = mongo.get_collection('artigos')
+            artigos = list(artigos_collection.find({'_id': {'$in': autor.get('artigos', [])}}))
         
-        # Buscar artigos onde o autor está na lista de autores
-        artigos = list(artigos_collection.find({
-            'autores.nome': {'$regex': nome, '$options': 'i'}
-        }))
+        # Buscar de uma vez todas as edições referenciadas para obter o ano
+        edicoes, _ = carregar_edicoes_eventos(
+            (artigo['edicao_id'] for artigo in artigos), incluir_eventos=False
+        )
         
-        # Converter ObjectId para string
+        # Converter ObjectId para string e organizar artigos por ano
+        artigos_por_ano = {}
         for artigo in artigos:
             artigo['_id'] = str(artigo['_id'])
             artigo['edicao_id'] = str(artigo['edicao_id'])
-        
-        # Organizar artigos por ano
-        artigos_por_ano = {}
-        for artigo in artigos:
-            # Buscar a edição para obter o ano
-            edicao = EdicaoEvento.find_by_id(artigo['edicao_id'])
+            edicao = edicoes.get(artigo['edicao_id'])
             if edicao:
                 ano = edicao['ano']
                 if ano not in artigos_por_ano:
@@ -96,11 +112,36 @@ def homepage_autor(nome):
         anos_ordenados = sorted(artigos_por_ano.keys(), reverse=True)
         
         return jsonify({
-            'autor': nome,
+            'autor': autor['nome'] if autor else nome,
             'artigos_por_ano': artigos_por_ano,
             'anos_ordenados': anos_ordenados,
             'total_artigos': len(artigos)
         })
     except Exception as e:
         print(f"Erro na homepage_autor: {e}")
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
+
+@public_bp.route('/autores', methods=['GET'])
+@condicional('artigos')
+def listar_autores():
+    """Lista autores em ordem alfabética com o total de artigos de cada um"""
+    try:
+        limite = int(request.args.get('limit', LIMITE_AUTORES_PADRAO))
+    except ValueError:
+        return jsonify({'error': 'Parâmetro limit inválido'}), 400
+    if not 1 <= limite <= LIMITE_AUTORES_MAXIMO:
+        return jsonify({'error': f'Parâmetro limit deve estar entre 1 e {LIMITE_AUTORES_MAXIMO}'}), 400
+
+    try:
+        apos = request.args.get('apos')
+        autores = Autor.find_all(limite=limite, apos=apos)
+        
+        return jsonify({
+            'autores': autores,
+            'total': len(autores),
+            # Passar como ?apos= para obter a próxima página
+            'proximo': autores[-1]['nome_normalizado'] if len(autores) == limite else None
+        })
+    except Exception as e:
+        print(f"Erro ao listar autores: {e}")
+        return jsonify({'error': str(e)}), 500
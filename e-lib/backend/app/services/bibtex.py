@@ -0,0 +1,143 @@
+import re
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import bibtexparser
+
+# Quantidade de caracteres lidos do arquivo por vez
+TAMANHO_BLOCO_LEITURA = 64 * 1024
+
+# Entradas BibTeX parseadas por chamada ao bibtexparser
+TAMANHO_LOTE_PARSE = 500
+
+# Tipos de bloco que não são entradas bibliográficas
+TIPOS_IGNORADOS = {'comment', 'preamble'}
+
+_INICIO_ENTRADA = re.compile(r'@\s*(\w+)\s*([{(])')
+_DELIMITADORES = re.compile(r'[{}()]')
+
+def _fim_entrada(texto, inicio, abertura):
+    """Posição logo após o delimitador que fecha a entrada, ou None se ela ainda não terminou.
+
+    Entradas `@tipo{...}` terminam na chave correspondente; entradas
+    `@tipo(...)` terminam no primeiro ')' fora de chaves.
+    """
+    chaves = 1 if abertura == '{' else 0
+    for m in _DELIMITADORES.finditer(texto, inicio):
+        caractere = m.group()
+        if caractere == '{':
+            chaves += 1
+        elif caractere == '}':
+            chaves -= 1
+            if abertura == '{' and chaves == 0:
+                return m.end()
+        elif caractere == ')' and abertura == '(' and chaves == 0:
+            return m.end()
+    return None
+
+def dividir_entradas(arquivo, tamanho_bloco=TAMANHO_BLOCO_LEITURA):
+    """Gera (tipo, texto) de cada bloco `@tipo{...}` de um arquivo BibTeX, um por vez.
+
+    O arquivo é lido em blocos de `tamanho_bloco` caracteres e só a entrada
+    incompleta no fim do bloco fica em memória, então o consumo independe do
+    tamanho do arquivo. Texto fora das entradas é ignorado, como no bibtexparser.
+    """
+    pendente = ''
+    while True:
+        bloco = arquivo.read(tamanho_bloco)
+        if not bloco:
+            break
+        pendente += bloco
+        inicio = 0
+        while True:
+            m = _INICIO_ENTRADA.search(pendente, inicio)
+            if not m:
+                # Um '@' no fim do bloco pode ser o começo de uma entrada ainda não lida
+                arroba = pendente.rfind('@', inicio)
+                inicio = arroba if arroba >= 0 else len(pendente)
+                break
+            fim = _fim_entrada(pendente, m.end(), m.group(2))
+            if fim is None:
+                inicio = m.start()
+                break
+            yield m.group(1).lower(), pendente[m.start():fim]
+            inicio = fim
+        pendente = pendente[inicio:]
+
+def _textos_em_lotes(arquivo, tamanho_lote, pular=0):
+    """Gera (texto, blocos) de cada lote de até `tamanho_lote` entradas.
+
+    As definições `@string` encontradas são repetidas nos lotes seguintes
+    para que as macros continuem sendo expandidas. As `pular` primeiras
+    entradas são descartadas sem parse (retomada de importações). `blocos` é
+    a quantidade de entradas do arquivo no lote, que pode ser maior que a de
+    entradas parseadas (o bibtexparser descarta tipos como @online).
+    """
+    macros = []
+    blocos = []
+    for tipo, texto in dividir_entradas(arquivo):
+        if tipo in TIPOS_IGNORADOS:
+            continue
+        if tipo == 'string':
+            macros.append(texto)
+            continue
+        if pular:
+            pular -= 1
+            continue
+        blocos.append(texto)
+        if len(blocos) >= tamanho_lote:
+            yield '\n'.join(macros + blocos), len(blocos)
+            blocos = []
+    if blocos:
+        yield '\n'.join(macros + blocos), len(blocos)
+
+def _parse_texto(texto):
+    """Parse de um lote de entradas; executado também nos processos do pool"""
+    return bibtexparser.loads(texto).entries
+
+def ler_entradas_em_lotes(arquivo, tamanho_lote=TAMANHO_LOTE_PARSE, pular=0, ao_ler=None):
+    """Gera listas de entradas parseadas (dicts do bibtexparser) com até `tamanho_lote` itens.
+
+    `ao_ler(blocos)`, quando informado, é chamado antes de cada lote ser
+    devolvido com a quantidade de entradas do arquivo que ele consumiu; a
+    soma é o valor de `pular` para retomar a leitura após esse lote.
+    """
+    for texto, blocos in _textos_em_lotes(arquivo, tamanho_lote, pular):
+        entradas = _parse_texto(texto)
+        if ao_ler:
+            ao_ler(blocos)
+        yield entradas
+
+def ler_entradas_em_paralelo(arquivo, processos, tamanho_lote=TAMANHO_LOTE_PARSE, pular=0, ao_ler=None):
+    """Como ler_entradas_em_lotes, mas parseando os lotes em um pool de processos.
+
+    A divisão em entradas (barata) fica no processo atual; o parse pelo
+    bibtexparser, que usa só CPU, é distribuído entre `processos` workers.
+    Os lotes são devolvidos na ordem do arquivo e no máximo 2 por worker
+    ficam em andamento, o que mantém a memória limitada. Os workers são
+    iniciados com 'spawn' porque a importação roda em threads de um processo
+    que já tem conexões abertas com o MongoDB.
+    """
+    contexto = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=processos, mp_context=contexto) as executor:
+        pendentes = deque()
+
+        def proximo():
+            futuro, blocos = pendentes.popleft()
+            entradas = futuro.result()
+            if ao_ler:
+                ao_ler(blocos)
+            return entradas
+
+        for texto, blocos in _textos_em_lotes(arquivo, tamanho_lote, pular):
+            pendentes.append((executor.submit(_parse_texto, texto), blocos))
+            if len(pendentes) >= 2 * processos:
+                yield proximo()
+        while pendentes:
+            yield proximo()
+
+def ler_entradas(arquivo, processos=1, tamanho_lote=TAMANHO_LOTE_PARSE, pular=0, ao_ler=None):
+    """Gera os lotes de entradas do arquivo, em paralelo quando `processos` > 1"""
+    if processos and processos > 1:
+        return ler_entradas_em_paralelo(arquivo, processos, tamanho_lote, pular, ao_ler)
+    return ler_entradas_em_lotes(arquivo, tamanho_lote, pular, ao_ler)
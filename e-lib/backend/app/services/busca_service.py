@@ -0,0 +1,224 @@
+import re
+import base64
+import binascii
+from bson import ObjectId
+from bson.errors import InvalidId
+from app.services.database import mongo
+from app.models.autor import normalizar_nome
+
+# Índice de texto único da coleção de artigos (o MongoDB permite apenas um por coleção).
+# A definição completa está no registro de app/services/indices.py.
+INDICE_TEXTO_ARTIGOS = 'artigos_busca_texto'
+CAMPOS_INDICE_TEXTO = {
+    'titulo': 10,
+    'autores.nome': 5,
+    'keywords': 3,
+    'resumo': 1
+}
+
+# Paginação da busca
+LIMITE_PADRAO = 50
+LIMITE_MAXIMO = 200
+
+# Palavras normalizadas de título e autores, indexadas para a busca por prefixo.
+# O `$text` só casa palavras inteiras (após stemming): "Sil" não encontra "Silva".
+CAMPO_TERMOS = 'termos'
+# Prefixos mais curtos casariam com quase todos os artigos e não são usados
+TAMANHO_MINIMO_PREFIXO = 3
+
+# Campo que restringe a busca textual para cada tipo de busca
+CAMPO_POR_TIPO = {
+    'titulo': 'titulo',
+    'autor': 'autores.nome'
+}
+
+def regex_literal(query):
+    """Regex case-insensitive que trata a consulta como texto literal"""
+    return {'$regex': re.escape(query), '$options': 'i'}
+
+def palavras_normalizadas(texto):
+    """Palavras do texto sem acentos e em minúsculas"""
+    return re.findall(r'[a-z0-9]+', normalizar_nome(texto))
+
+def termos_busca(titulo, autores):
+    """Valor do campo `termos`: palavras distintas do título e dos nomes dos autores"""
+    nomes = [a.get('nome', '') if isinstance(a, dict) else str(a) for a in autores or []]
+    return sorted(set(palavras_normalizadas(' '.join([titulo or ''] + nomes))))
+
+def filtro_prefixos(query):
+    """Filtro em que cada palavra da consulta é prefixo de algum termo do artigo.
+
+    As regex são ancoradas e sensíveis a caixa (os termos já estão
+    normalizados), então o MongoDB as resolve como intervalos do índice
+    `termos_1`. Retorna None se nenhuma palavra tiver o tamanho mínimo.
+    """
+    prefixos = [p for p in dict.fromkeys(palavras_normalizadas(query)) if len(p) >= TAMANHO_MINIMO_PREFIXO]
+    if not prefixos:
+        return None
+    regexes = [re.compile('^' + re.escape(p)) for p in prefixos]
+    if len(regexes) == 1:
+        return {CAMPO_TERMOS: regexes[0]}
+    return {CAMPO_TERMOS: {'$all': regexes}}
+
+def clausulas_texto(query):
+    """Cláusulas alternativas da busca textual: índice de texto e, se couber, prefixos"""
+    clausulas = [{'$text': {'$search': query}}]
+    prefixos = filtro_prefixos(query)
+    if prefixos:
+        clausulas.append(prefixos)
+    return clausulas
+
+def filtro_texto(query, tipo='tudo'):
+    """Monta o filtro de busca textual de artigos para o tipo informado.
+
+    O `$text` (palavras inteiras) e a busca por prefixo em `termos` (palavras
+    parciais, como "Sil" para "Silva") selecionam os candidatos pelos índices;
+    para os tipos restritos a um campo, a regex literal só é avaliada sobre
+    esses candidatos. Trechos no meio de uma palavra não são encontrados.
+    """
+    clausulas = clausulas_texto(query)
+    filtro = {'$or': clausulas} if len(clausulas) > 1 else clausulas[0]
+    campo = CAMPO_POR_TIPO.get(tipo)
+    if campo:
+        filtro[campo] = regex_literal(query)
+    return filtro
+
+def filtro_eventos(query):
+    """Filtro de eventos por nome ou sigla"""
+    return {'$or': [{'nome': regex_literal(query)}, {'sigla': regex_literal(query)}]}
+
+def edicoes_ids_por_evento(query):
+    """Resolve antecipadamente os IDs das edições dos eventos cujo nome ou sigla casam com a consulta"""
+    eventos_collection = mongo.get_collection('eventos')
+    edicoes_collection = mongo.get_collection('edicoes')
+    
+    eventos_ids = [evento['_id'] for evento in eventos_collection.find(filtro_eventos(query), {'_id': 1})]
+    if not eventos_ids:
+        return []
+    edicoes = edicoes_collection.find({'evento_id': {'$in': eventos_ids}}, {'_id': 1})
+    return [edicao['_id'] for edicao in edicoes]
+
+def filtro_busca(query, tipo='tudo'):
+    """Compila a busca de artigos em um único filtro para qualquer tipo.
+
+    Na busca 'tudo', a união entre texto (título, autores, keywords, resumo),
+    prefixos e evento é feita pelo próprio MongoDB com um `$or`, em vez de
+    várias consultas. Todas as cláusulas usam índices, como o `$or` com
+    `$text` exige.
+    """
+    if tipo in CAMPO_POR_TIPO:
+        return filtro_texto(query, tipo)
+    
+    edicoes_ids = edicoes_ids_por_evento(query)
+    filtro_evento = {'edicao_id': {'$in': edicoes_ids}}
+    if tipo == 'evento':
+        return filtro_evento
+    if not edicoes_ids:
+        return filtro_texto(query)
+    return {'$or': clausulas_texto(query) + [filtro_evento]}
+
+def ler_limite(valor):
+    """Converte o parâmetro `limit` em um inteiro entre 1 e LIMITE_MAXIMO"""
+    if valor in (None, ''):
+        return LIMITE_PADRAO
+    limite = int(valor)
+    if limite < 1:
+        raise ValueError('limit deve ser maior que zero')
+    return min(limite, LIMITE_MAXIMO)
+
+def codificar_cursor(artigo_id):
+    """Gera o cursor opaco que aponta para depois do artigo informado"""
+    return base64.urlsafe_b64encode(ObjectId(artigo_id).binary).decode('ascii').rstrip('=')
+
+def decodificar_cursor(cursor):
+    """Recupera o ObjectId guardado no cursor; lança ValueError se o cursor for inválido"""
+    try:
+        binario = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        return ObjectId(binario)
+    except (binascii.Error, InvalidId, TypeError, ValueError):
+        raise ValueError('cursor inválido')
+
+def buscar_pagina(filtro, limite, cursor=None):
+    """Busca uma página de artigos por keyset em `_id` (mais recentes primeiro).
+
+    Retorna os artigos da página e o cursor da próxima (ou None na última).
+    Lê um documento a mais apenas para saber se há próxima página.
+    """
+    if cursor:
+        filtro = {'$and': [filtro, {'_id': {'$lt': decodificar_cursor(cursor)}}]}
+    
+    artigos_collection = mongo.get_collection('artigos')
+    artigos = list(artigos_collection.find(filtro).sort('_id', -1).limit(limite + 1))
+    
+    proximo_cursor = None
+    if len(artigos) > limite:
+        artigos = artigos[:limite]
+        proximo_cursor = codificar_cursor(artigos[-1]['_id'])
+    return artigos, proximo_cursor
+
+def contar_resultados(filtro, artigos, cursor=None, proximo_cursor=None):
+    """Retorna o total de artigos que atendem ao filtro (não apenas os da página).
+
+    O total só é calculado na primeira página; nas seguintes retorna None e o
+    cliente mantém o valor já recebido, para que percorrer as páginas não
+    repita a contagem sobre todos os resultados. Quando tudo coube na
+    primeira página o total já é conhecido e a contagem no banco é dispensada.
+    """
+    if cursor:
+        return None
+    if not proximo_cursor:
+        return len(artigos)
+    return mongo.get_collection('artigos').count_documents(filtro)
+
+def _object_ids(valores):
+    """Converte uma coleção de IDs (string ou ObjectId) em um conjunto de ObjectIds válidos"""
+    ids = set()
+    for valor in valores:
+        try:
+            ids.add(ObjectId(valor))
+        except (InvalidId, TypeError):
+            continue
+    return ids
+
+def carregar_edicoes_eventos(edicoes_ids, incluir_eventos=True):
+    """Busca em lote as edições informadas e seus eventos.
+
+    Faz no máximo duas consultas (`$in` em edições e em eventos), independente
+    da quantidade de IDs, e retorna dois dicionários indexados pelo ID em string.
+    """
+    ids = _object_ids(edicoes_ids)
+    if not ids:
+        return {}, {}
+    
+    edicoes_collection = mongo.get_collection('edicoes')
+    eventos_collection = mongo.get_collection('eventos')
+    
+    edicoes = {
+        str(edicao['_id']): edicao
+        for edicao in edicoes_collection.find({'_id': {'$in': list(ids)}}, {'ano': 1, 'evento_id': 1})
+    }
+    eventos_ids = _object_ids(edicao.get('evento_id') for edicao in edicoes.values())
+    eventos = {}
+    if incluir_eventos and eventos_ids:
+        eventos = {
+            str(evento['_id']): evento
+            for evento in eventos_collection.find({'_id': {'$in': list(eventos_ids)}}, {'nome': 1, 'sigla': 1})
+        }
+    return edicoes, eventos
+
+def enriquecer_artigos(artigos):
+    """Adiciona edicao_ano, evento_nome e evento_sigla aos artigos e serializa os IDs"""
+    edicoes, eventos = carregar_edicoes_eventos(artigo.get('edicao_id') for artigo in artigos)
+    
+    for artigo in artigos:
+        edicao = edicoes.get(str(artigo.get('edicao_id')))
+        if edicao:
+            artigo['edicao_ano'] = edicao.get('ano')
+            evento = eventos.get(str(edicao.get('evento_id')))
+            if evento:
+                artigo['evento_nome'] = evento.get('nome')
+                artigo['evento_sigla'] = evento.get('sigla')
+        
+        artigo['_id'] = str(artigo['_id'])
+        artigo['edicao_id'] = str(artigo['edicao_id'])
+    return artigos
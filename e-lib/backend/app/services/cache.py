@@ -0,0 +1,184 @@
+import os
+import time
+import threading
+from datetime import datetime, timezone
+from functools import wraps
+from collections import OrderedDict
+from flask import request, make_response
+from app.services.database import mongo
+
+class CacheRespostas:
+    """Cache em memória de respostas já serializadas, com expiração e invalidação por tags.
+
+    Cada entrada é associada a tags como 'edicao:<id>' ou 'evento:<id>'; os
+    pontos de escrita chamam `registrar_alteracao` para descartar as entradas
+    afetadas. O TTL limita por quanto tempo outro processo (ou o script de
+    seed) pode servir uma resposta desatualizada.
+    """
+
+    def __init__(self, ttl=300, max_itens=1000):
+        self.ttl = ttl
+        self.max_itens = max_itens
+        self._itens = OrderedDict()  # chave -> (expira_em, valor, tags)
+        self._por_tag = {}           # tag -> conjunto de chaves
+        self._lock = threading.Lock()
+
+    def obter(self, chave):
+        """Retorna o valor guardado ou None se ausente ou expirado"""
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                return None
+            expira_em, valor, _ = item
+            if expira_em < time.monotonic():
+                self._remover(chave)
+                return None
+            self._itens.move_to_end(chave)
+            return valor
+
+    def guardar(self, chave, valor, tags=()):
+        """Guarda um valor associado às tags informadas"""
+        with self._lock:
+            if chave in self._itens:
+                self._remover(chave)
+            self._itens[chave] = (time.monotonic() + self.ttl, valor, tuple(tags))
+            for tag in tags:
+                self._por_tag.setdefault(tag, set()).add(chave)
+            while len(self._itens) > self.max_itens:
+                self._remover(next(iter(self._itens)))
+
+    def invalidar(self, *tags):
+        """Descarta todas as entradas associadas a qualquer uma das tags"""
+        with self._lock:
+            for tag in tags:
+                for chave in list(self._por_tag.get(tag, ())):
+                    self._remover(chave)
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+            self._por_tag.clear()
+
+    def _remover(self, chave):
+        _, _, tags = self._itens.pop(chave)
+        for tag in tags:
+            chaves = self._por_tag.get(tag)
+            if chaves is not None:
+                chaves.discard(chave)
+                if not chaves:
+                    del self._por_tag[tag]
+
+class RegistroVersoes:
+    """Versão e data da última alteração de cada coleção, guardadas na coleção `versoes` do MongoDB.
+
+    As ETags das leituras públicas são derivadas dessas versões. Como ficam no
+    banco, escritas feitas por qualquer processo que passe por
+    `registrar_alteracao` (outros workers, seed_bibtex.py, migrações) invalidam
+    as ETags de todos. A leitura das versões é uma consulta pequena por _id,
+    reaproveitada por `intervalo_leitura` segundos, e evita a consulta da rota
+    quando nada mudou. Alterações que não passam pelo registro (ex.: edição
+    manual no banco) são cobertas pela `validade`: uma ETag só vale dentro de
+    uma janela de `validade` segundos.
+    """
+
+    def __init__(self, validade=300, intervalo_leitura=1):
+        self.validade = validade
+        self.intervalo_leitura = intervalo_leitura
+        self._lidas = {}  # coleções -> (lido_em, {coleção: documento de versão})
+        self._lock = threading.Lock()
+
+    def incrementar(self, colecao):
+        versoes_collection = mongo.get_collection('versoes')
+        versoes_collection.update_one(
+            {'_id': colecao},
+            {'$inc': {'versao': 1}, '$set': {'alterada_em': datetime.utcnow()}},
+            upsert=True
+        )
+        with self._lock:
+            self._lidas.clear()
+
+    def _ler(self, colecoes):
+        chave = tuple(sorted(colecoes))
+        with self._lock:
+            lida = self._lidas.get(chave)
+            if lida and time.monotonic() - lida[0] < self.intervalo_leitura:
+                return lida[1]
+        versoes_collection = mongo.get_collection('versoes')
+        documentos = {d['_id']: d for d in versoes_collection.find({'_id': {'$in': list(chave)}})}
+        with self._lock:
+            self._lidas[chave] = (time.monotonic(), documentos)
+        return documentos
+
+    def validadores(self, colecoes):
+        """ETag e Last-Modified que mudam quando qualquer uma das coleções muda ou a janela de validade vence"""
+        documentos = self._ler(colecoes)
+        janela = int(time.time() // self.validade)
+        partes = [f"{colecao}.{documentos.get(colecao, {}).get('versao', 0)}" for colecao in colecoes]
+        etag = '-'.join([f"j{janela}"] + partes)
+        inicio_janela = datetime.fromtimestamp(janela * self.validade, timezone.utc)
+        alteracoes = [
+            documentos[c]['alterada_em'].replace(tzinfo=timezone.utc, microsecond=0)
+            for c in colecoes if documentos.get(c, {}).get('alterada_em')
+        ]
+        return etag, max([inicio_janela] + alteracoes)
+
+# Instâncias globais
+cache_respostas = CacheRespostas(ttl=int(os.environ.get('CACHE_RESPOSTAS_TTL', 300)))
+versoes = RegistroVersoes(validade=int(os.environ.get('ETAG_VALIDADE', 300)))
+
+def tag(tipo, documento_id):
+    """Tag de cache de um documento, ex.: tag('edicao', id) -> 'edicao:<id>'"""
+    return f"{tipo}:{documento_id}"
+
+def registrar_alteracao(colecao, edicoes=(), eventos=()):
+    """Avisa que a coleção mudou, afetando as edições e eventos informados.
+
+    Atualiza a versão usada nas ETags e descarta as respostas em cache das
+    edições e eventos afetados.
+    """
+    try:
+        versoes.incrementar(colecao)
+    except Exception as e:
+        # A escrita já foi feita; as ETags antigas valem no máximo até o fim da janela de validade
+        print(f"Erro ao registrar versão de {colecao}: {e}")
+    tags = [tag('edicao', i) for i in edicoes if i] + [tag('evento', i) for i in eventos if i]
+    if tags:
+        cache_respostas.invalidar(*tags)
+
+def _nao_modificado(etag, ultima_alteracao):
+    """Verifica os cabeçalhos condicionais; If-None-Match tem precedência sobre If-Modified-Since"""
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since:
+        return ultima_alteracao <= request.if_modified_since
+    return False
+
+def condicional(*colecoes):
+    """Decorator para leituras GET: emite ETag/Last-Modified e responde 304 quando nada mudou.
+
+    A versão é lida antes de executar a rota, então uma escrita concorrente
+    apenas faz a próxima requisição baixar o conteúdo de novo. Se as versões
+    não puderem ser lidas, a rota responde normalmente, sem validadores.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            try:
+                etag, ultima_alteracao = versoes.validadores(colecoes)
+            except Exception as e:
+                print(f"Erro ao ler versões de {colecoes}: {e}")
+                return f(*args, **kwargs)
+            
+            if _nao_modificado(etag, ultima_alteracao):
+                resposta = make_response('', 304)
+            else:
+                resposta = make_response(f(*args, **kwargs))
+                if resposta.status_code != 200:
+                    return resposta
+            
+            resposta.set_etag(etag, weak=True)
+            resposta.last_modified = ultima_alteracao
+            resposta.headers['Cache-Control'] = 'no-cache'
+            return resposta
+        return decorated
+    return decorator
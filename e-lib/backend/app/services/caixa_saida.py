@@ -0,0 +1,282 @@
+import os
+import time
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from app.models.caixa_saida import CaixaSaida
+from app.services.inscricoes import indice_inscricoes
+from app.services.email_service import email_service
+
+# Tipos de item da caixa de saída
+NOVO_ARTIGO = 'novo_artigo'
+EMAIL_NOTIFICACAO = 'email_notificacao'
+RESUMO_EMAIL = 'resumo_email'
+
+# Tentativas por item antes de marcá-lo como falho, e espera (segundos) antes da 2ª tentativa;
+# a espera dobra a cada nova falha
+MAX_TENTATIVAS = int(os.environ.get('NOTIFICACOES_TENTATIVAS', 5))
+ATRASO_BASE = 30
+
+# Janela (segundos) em que as notificações de um inscrito são juntadas em um único email de resumo;
+# com 0, cada artigo gera seu próprio email
+JANELA_RESUMO = int(os.environ.get('NOTIFICACOES_JANELA_RESUMO', 0))
+
+# Prazo (segundos) para enviar um resumo de grupo (ex.: importação) que não foi liberado,
+# caso o processo que o acumulava tenha sido interrompido. Conta a partir do último acúmulo.
+PRAZO_RESUMO_GRUPO = 3600
+
+# Tempo (segundos) que um item fica reservado para um worker antes de poder ser retomado por outro
+DURACAO_RESERVA = 300
+
+# Emails reservados por um worker e enviados juntos, pela mesma conexão SMTP do pool
+LOTE_ENVIO = max(int(os.environ.get('NOTIFICACOES_LOTE_ENVIO', 20)), 1)
+
+# Workers que drenam a caixa de saída e intervalo (segundos) da verificação periódica
+WORKERS_NOTIFICACOES = int(os.environ.get('NOTIFICACOES_WORKERS', 2))
+INTERVALO_VERIFICACAO = int(os.environ.get('NOTIFICACOES_INTERVALO', 30))
+
+executor_notificacoes = ThreadPoolExecutor(
+    max_workers=max(WORKERS_NOTIFICACOES, 1),
+    thread_name_prefix='notificacoes'
+)
+
+# Limita as drenagens agendadas ao número de workers
+_vagas = threading.BoundedSemaphore(max(WORKERS_NOTIFICACOES, 1))
+
+def resumo_artigo(artigo):
+    """Campos do artigo copiados para a notificação, que não precisa relê-lo"""
+    return {
+        'artigo_id': str(artigo.get('_id')),
+        'titulo': artigo.get('titulo'),
+        'autores': artigo.get('autores', []),
+        'resumo': artigo.get('resumo')
+    }
+
+def registrar_novo_artigo(artigo):
+    """Grava na caixa de saída a intenção de notificar os inscritos sobre um novo artigo.
+
+    É a única escrita feita durante a requisição: a busca dos inscritos e o
+    envio dos emails ficam para os workers, então o custo para quem cria o
+    artigo não depende do número de inscritos.
+    """
+    item_id = CaixaSaida.adicionar(NOVO_ARTIGO, resumo_artigo(artigo))
+    despertar()
+    return item_id
+
+def _distribuir_novo_artigo(item):
+    """Cria um item de email para cada inscrição ativa de cada autor do artigo"""
+    artigo = item['dados']
+    inscritos = indice_inscricoes.correspondencias(autor.get('nome', '') for autor in artigo.get('autores', []))
+    if JANELA_RESUMO > 0:
+        acumular_resumos([
+            (notificacao['email'], nome_autor, artigo)
+            for nome_autor, notificacoes in inscritos.items() for notificacao in notificacoes
+        ])
+        return
+    emails = []
+    for nome_autor, notificacoes in inscritos.items():
+        for notificacao in notificacoes:
+            emails.append((
+                EMAIL_NOTIFICACAO,
+                {'email': notificacao['email'], 'nome_autor': nome_autor, 'artigo': artigo},
+                f"{item['_id']}:{notificacao['email']}:{nome_autor}"
+            ))
+    CaixaSaida.adicionar_em_lote(emails)
+    if emails:
+        despertar()
+
+def acumular_resumos(correspondencias, grupo=None):
+    """Junta correspondências (email, nome_autor, artigo) no resumo pendente de cada destinatário.
+
+    Sem `grupo`, usa o resumo da janela atual de JANELA_RESUMO segundos, que
+    fica pronto quando a janela termina. Com `grupo` (ex.: o ID de uma
+    importação), o resumo espera por `liberar_resumos(grupo)` ou por
+    PRAZO_RESUMO_GRUPO segundos sem novos acúmulos. Se o resumo de
+    um destinatário já estiver sendo enviado, as entradas vão para um novo.
+    Retorna o número de destinatários.
+    """
+    if grupo is None:
+        janela = max(JANELA_RESUMO, 1)
+        inicio = int(time.time()) // janela
+        grupo = f"janela{inicio}"
+        disponivel_em = datetime.utcfromtimestamp((inicio + 1) * janela)
+    else:
+        disponivel_em = datetime.utcnow() + timedelta(seconds=PRAZO_RESUMO_GRUPO)
+
+    por_email = {}
+    for email, nome_autor, artigo in correspondencias:
+        por_email.setdefault(email, []).append({
+            'artigo_id': artigo['artigo_id'],
+            'titulo': artigo.get('titulo'),
+            'nome_autor': nome_autor
+        })
+
+    itens = [(f"resumo:{grupo}:{email}:0", {'email': email}, entradas) for email, entradas in por_email.items()]
+    for tentativa in range(1, 11):
+        recusadas = set(CaixaSaida.acumular(RESUMO_EMAIL, itens, disponivel_em))
+        itens = [
+            (f"{chave.rsplit(':', 1)[0]}:{tentativa}", dados, entradas)
+            for chave, dados, entradas in itens if chave in recusadas
+        ]
+        if not itens:
+            return len(por_email)
+    raise RuntimeError(f"Não foi possível acumular o resumo de {len(itens)} destinatário(s)")
+
+def notificar_importacao(artigos, grupo):
+    """Agenda nos resumos do grupo as notificações de um lote de artigos importados.
+
+    O conjunto de autores do lote inteiro é casado com as inscrições em uma
+    única passada pelo índice em memória, e os resumos são gravados em uma
+    escrita em lote; o acesso ao banco cresce com o número de destinatários,
+    não com o de artigos. Retorna quantas correspondências foram agendadas.
+    """
+    nomes = {autor.get('nome', '') for artigo in artigos for autor in artigo.get('autores', [])}
+    inscritos = indice_inscricoes.correspondencias(nomes)
+    if not inscritos:
+        return 0
+    correspondencias = []
+    for artigo in artigos:
+        resumo = None
+        for autor in artigo.get('autores', []):
+            for notificacao in inscritos.get(autor.get('nome', ''), []):
+                resumo = resumo or resumo_artigo(artigo)
+                correspondencias.append((notificacao['email'], autor.get('nome', ''), resumo))
+    acumular_resumos(correspondencias, grupo)
+    return len(correspondencias)
+
+def liberar_resumos(grupo):
+    """Torna prontos para envio os resumos acumulados de um grupo; retorna quantos"""
+    liberados = CaixaSaida.liberar(f"resumo:{grupo}:")
+    if liberados:
+        despertar()
+    return liberados
+
+def _mensagem_resumo(item):
+    email = item['dados']['email']
+    entradas = item.get('entradas', [])
+    print(f"Enviando resumo com {len(entradas)} notificação(ões) para {email}")
+    return email_service.mensagem_resumo(email, entradas)
+
+def _mensagem_notificacao(item):
+    dados = item['dados']
+    print(f"Notificando {dados['email']} sobre novo artigo de {dados['nome_autor']}")
+    return email_service.mensagem_notificacao(dados['email'], dados['nome_autor'], dados['artigo'])
+
+# Tipos de item que são emails: a função monta a mensagem, e o envio é feito em lote por enviar_lote
+MENSAGENS = {
+    EMAIL_NOTIFICACAO: _mensagem_notificacao,
+    RESUMO_EMAIL: _mensagem_resumo,
+}
+
+# Função que processa cada um dos demais tipos de item; uma exceção provoca nova tentativa
+PROCESSADORES = {
+    NOVO_ARTIGO: _distribuir_novo_artigo,
+}
+
+def _registrar_falha(item, erro):
+    """Reagenda o item com espera exponencial, ou o marca como falho se esgotou as tentativas"""
+    print(f"Erro ao processar item {item['_id']} da caixa de saída: {erro}")
+    if item['tentativas'] >= MAX_TENTATIVAS:
+        CaixaSaida.falhar(item['_id'], str(erro))
+    else:
+        CaixaSaida.reagendar(item['_id'], str(erro), ATRASO_BASE * 2 ** (item['tentativas'] - 1))
+
+def enviar_lote(itens):
+    """Envia os emails de vários itens reservados por uma única conexão do pool.
+
+    Cada item é concluído ou reagendado conforme o resultado da própria
+    mensagem: um destinatário recusado não derruba os demais. Retorna
+    quantos foram enviados.
+    """
+    montados, mensagens = [], []
+    for item in itens:
+        try:
+            mensagens.append(MENSAGENS[item['tipo']](item))
+            montados.append(item)
+        except Exception as e:
+            _registrar_falha(item, e)
+    if not mensagens:
+        return 0
+
+    try:
+        resultados = email_service.enviar_mensagens(mensagens)
+    except Exception as e:
+        for item in montados:
+            _registrar_falha(item, e)
+        return 0
+
+    enviados = 0
+    for item, enviado in zip(montados, resultados):
+        if enviado:
+            CaixaSaida.concluir(item['_id'])
+            enviados += 1
+        else:
+            _registrar_falha(item, f"Falha ao enviar email para {item['dados']['email']}")
+    return enviados
+
+def processar_item(item):
+    """Processa um item reservado, reagendando-o com espera exponencial em caso de erro"""
+    if item['tipo'] in MENSAGENS:
+        return enviar_lote([item]) == 1
+    try:
+        processador = PROCESSADORES.get(item['tipo'])
+        if processador is None:
+            raise ValueError(f"Tipo de item desconhecido: {item['tipo']}")
+        processador(item)
+        CaixaSaida.concluir(item['_id'])
+        return True
+    except Exception as e:
+        _registrar_falha(item, e)
+        return False
+
+def drenar(limite=None):
+    """Processa itens prontos até a caixa de saída esvaziar (ou `limite` itens); retorna quantos processou.
+
+    Emails são juntados em lotes de até LOTE_ENVIO itens, enviados por uma
+    conexão do pool sem refazer EHLO/STARTTLS/login a cada mensagem.
+    """
+    processados = 0
+    lote = []
+    try:
+        while limite is None or processados < limite:
+            item = CaixaSaida.reservar(DURACAO_RESERVA)
+            if item is None:
+                break
+            processados += 1
+            if item['tipo'] not in MENSAGENS:
+                processar_item(item)
+                continue
+            lote.append(item)
+            if len(lote) >= LOTE_ENVIO:
+                enviar_lote(lote)
+                lote = []
+    finally:
+        # Itens já reservados são enviados mesmo se a reserva do próximo falhar
+        if lote:
+            enviar_lote(lote)
+    return processados
+
+def _drenar_e_liberar():
+    try:
+        drenar()
+    except Exception as e:
+        print(f"Erro ao drenar a caixa de saída: {e}")
+    finally:
+        _vagas.release()
+
+def despertar():
+    """Agenda uma drenagem no pool, se ainda houver worker livre"""
+    if WORKERS_NOTIFICACOES > 0 and _vagas.acquire(blocking=False):
+        executor_notificacoes.submit(_drenar_e_liberar)
+
+def iniciar_verificacao_periodica(intervalo=INTERVALO_VERIFICACAO):
+    """Inicia a thread que desperta os workers periodicamente (novas tentativas e itens de outros processos)"""
+    def verificar():
+        while True:
+            despertar()
+            time.sleep(intervalo)
+    if WORKERS_NOTIFICACOES <= 0:
+        return None
+    thread = threading.Thread(target=verificar, name='notificacoes-verificacao', daemon=True)
+    thread.start()
+    return thread
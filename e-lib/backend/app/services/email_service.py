@@ -1,7 +1,8 @@
-import smtplib
+import atexit
+import threading
 from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 import os
+from app.services.smtp_pool import PoolSMTP
 
 class EmailService:
     def __init__(self):
@@ -9,13 +10,37 @@ class EmailService:
         self.smtp_port = int(os.environ.get('SMTP_PORT', 587))
         self.email_user = os.environ.get('EMAIL_USER', '')
         self.email_password = os.environ.get('EMAIL_PASSWORD', '')
-    
-    def enviar_notificacao(self, destinatario, nome_autor, artigo):
-        """Envia notificação por email sobre novo artigo"""
-        try:
-            # Configurar mensagem
-            subject = f"Novo artigo publicado de {nome_autor}"
-            body = f"""
+        # Envio real desligado por padrão: sem SMTP_ENVIAR=true os emails são apenas simulados
+        self.envio_real = os.environ.get('SMTP_ENVIAR', 'false').lower() == 'true'
+        self.smtp_tls = os.environ.get('SMTP_TLS', 'true').lower() != 'false'
+        self.smtp_conexoes = int(os.environ.get('SMTP_CONEXOES', 4))
+        self._pool = None
+        self._trava_pool = threading.Lock()
+
+    @property
+    def pool(self):
+        """Pool de conexões SMTP, criado no primeiro envio real"""
+        with self._trava_pool:
+            if self._pool is None:
+                self._pool = PoolSMTP(
+                    self.smtp_server, self.smtp_port,
+                    usuario=self.email_user, senha=self.email_password,
+                    tamanho=self.smtp_conexoes, usar_tls=self.smtp_tls
+                )
+                atexit.register(self._pool.fechar)
+            return self._pool
+
+    def criar_mensagem(self, destinatario, subject, body):
+        msg = MIMEText(body, 'plain', 'utf-8')
+        msg['From'] = self.email_user
+        msg['To'] = destinatario
+        msg['Subject'] = subject
+        return msg
+
+    def mensagem_notificacao(self, destinatario, nome_autor, artigo):
+        """Monta o email de notificação sobre novo artigo"""
+        subject = f"Novo artigo publicado de {nome_autor}"
+        body = f"""
             Olá!
 
             Um novo artigo foi publicado com o nome do autor {nome_autor}:
@@ -29,30 +54,70 @@ class EmailService:
             Atenciosamente,
             Equipe SimpleLib
             """
-            
-            msg = MIMEMultipart()
-            msg['From'] = self.email_user
-            msg['To'] = destinatario
-            msg['Subject'] = subject
-            msg.attach(MIMEText(body, 'plain'))
-            
-            # Enviar email (em produção, configurar credenciais reais)
-            print(f"Simulando envio de email para: {destinatario}")
-            print(f"Assunto: {subject}")
-            print(f"Conteúdo: {body}")
-            
-            # Em ambiente real, descomente:
-            # with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-            #     server.starttls()
-            #     server.login(self.email_user, self.email_password)
-            #     server.send_message(msg)
-            
-            return True
-            
+        return self.criar_mensagem(destinatario, subject, body)
+
+    def mensagem_resumo(self, destinatario, entradas):
+        """Monta um único email com todos os novos artigos acumulados para o destinatário.
+
+        Cada entrada tem artigo_id, titulo e nome_autor; um artigo com vários
+        autores acompanhados aparece uma vez só.
+        """
+        artigos = {}
+        for entrada in entradas:
+            titulo, nomes = artigos.setdefault(entrada['artigo_id'], (entrada['titulo'], []))
+            if entrada['nome_autor'] not in nomes:
+                nomes.append(entrada['nome_autor'])
+        subject = f"{len(artigos)} novo(s) artigo(s) de autores que você acompanha"
+        lista = "\n".join(
+            f"            - {titulo} ({', '.join(nomes)})" for titulo, nomes in artigos.values()
+        )
+        body = f"""
+            Olá!
+
+            Novos artigos foram publicados por autores que você acompanha:
+
+{lista}
+
+            Acesse nossa plataforma para ver os artigos completos.
+
+            Atenciosamente,
+            Equipe SimpleLib
+            """
+        return self.criar_mensagem(destinatario, subject, body)
+
+    def _simular(self, msg, prefixo="Simulando envio de email para"):
+        print(f"{prefixo}: {msg['To']}")
+        print(f"Assunto: {msg['Subject']}")
+        print(f"Conteúdo: {msg.get_payload(decode=True).decode('utf-8')}")
+
+    def enviar_mensagens(self, mensagens):
+        """Envia várias mensagens reaproveitando uma conexão do pool; retorna um booleano por mensagem"""
+        if not self.envio_real:
+            for msg in mensagens:
+                self._simular(msg)
+            return [True] * len(mensagens)
+        return self.pool.enviar_varios(mensagens)
+
+    def enviar_notificacao(self, destinatario, nome_autor, artigo):
+        """Envia notificação por email sobre novo artigo"""
+        try:
+            msg = self.mensagem_notificacao(destinatario, nome_autor, artigo)
+            return self.enviar_mensagens([msg])[0]
+
         except Exception as e:
             print(f"❌ Erro ao enviar email: {e}")
             return False
 
+    def enviar_resumo(self, destinatario, entradas):
+        """Envia o email de resumo com vários novos artigos"""
+        try:
+            msg = self.mensagem_resumo(destinatario, entradas)
+            return self.enviar_mensagens([msg])[0]
+
+        except Exception as e:
+            print(f"❌ Erro ao enviar resumo: {e}")
+            return False
+
 # Instância global
 email_service = EmailService()
 
@@ -72,25 +137,14 @@ def enviar_email_confirmacao_inscricao(email):
         Atenciosamente,
         Equipe SimpleLib
         """
-        
-        print(f"📧 Simulando envio de email de confirmação para: {email}")
-        print(f"Assunto: {subject}")
-        print(f"Conteúdo: {body}")
-        
-        # Em ambiente real, enviar email de verdade:
-        # msg = MIMEMultipart()
-        # msg['From'] = email_service.email_user
-        # msg['To'] = email
-        # msg['Subject'] = subject
-        # msg.attach(MIMEText(body, 'plain'))
-        # 
-        # with smtplib.SMTP(email_service.smtp_server, email_service.smtp_port) as server:
-        #     server.starttls()
-        #     server.login(email_service.email_user, email_service.email_password)
-        #     server.send_message(msg)
-        
+        msg = email_service.criar_mensagem(email, subject, body)
+
+        if email_service.envio_real:
+            return email_service.pool.enviar(msg)
+
+        email_service._simular(msg, prefixo="📧 Simulando envio de email de confirmação para")
         return True
-        
+
     except Exception as e:
         print(f"❌ Erro ao enviar email de confirmação: {e}")
         return False
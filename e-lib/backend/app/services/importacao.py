@@ -0,0 +1,599 @@
+import os
+import json
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from app.services.database import mongo
+from app.services.cache import registrar_alteracao
+from app.services.bibtex import ler_entradas
+from app.services.similaridade import campos_similaridade, procurar_semelhantes
+from app.services.busca_service import termos_busca
+from app.services.caixa_saida import notificar_importacao, liberar_resumos
+from app.models.autor import Autor
+from app.models.artigo import hash_titulo
+from app.models.importacao import Importacao, FALHOU
+
+# Quantidade de valores por consulta `$in` e de documentos por insert_many
+TAMANHO_LOTE_IMPORTACAO = 1000
+
+# Pool de threads que executa as importações enviadas pelo endpoint de upload
+executor_importacoes = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('IMPORTACAO_WORKERS', 2)),
+    thread_name_prefix='importacao'
+)
+
+# Tempo (segundos) sem progresso após o qual uma importação pendente ou em andamento
+# é dada como interrompida (o worker atualiza o progresso a cada lote)
+EXPIRACAO_IMPORTACAO = int(os.environ.get('IMPORTACAO_EXPIRACAO', 1800))
+
+# Processos usados no parse do BibTeX (1 = parse no próprio worker)
+PROCESSOS_PARSE = int(os.environ.get('IMPORTACAO_PROCESSOS', 1))
+
+# Itens guardados nas listas de erros e prováveis duplicatas das estatísticas;
+# o restante só é contado, para o documento da importação não crescer sem limite
+LIMITE_AMOSTRA_STATS = 100
+
+def parse_authors(author_string):
+    """Converte string de autores do BibTeX em lista de objetos"""
+    if not author_string:
+        return []
+    
+    authors = author_string.split(' and ')
+    author_list = []
+    for author in authors:
+        author = author.strip()
+        if author:
+            author_list.append({
+                "nome": author,
+                "email": f"{author.split()[-1].lower()}@email.com"
+            })
+    return author_list
+
+def parse_keywords(keywords_string):
+    """Converte string de keywords em lista"""
+    if not keywords_string:
+        return []
+    
+    keywords = keywords_string.replace(';', ',').split(',')
+    return [k.strip() for k in keywords if k.strip()]
+
+def extract_event_info(booktitle):
+    """Extrai informações de evento do booktitle"""
+    booktitle_lower = booktitle.lower()
+    
+    if 'simpósio brasileiro' in booktitle_lower or 'sbes' in booktitle_lower:
+        return {
+            'sigla': 'SBES',
+            'nome': 'Simpósio Brasileiro de Engenharia de Software',
+            'descricao': 'Principal evento brasileiro dedicado à engenharia de software'
+        }
+    elif 'icse' in booktitle_lower or 'international conference on software engineering' in booktitle_lower:
+        return {
+            'sigla': 'ICSE',
+            'nome': 'International Conference on Software Engineering',
+            'descricao': 'Premier international conference on software engineering'
+        }
+    else:
+        words = booktitle.split()
+        sigla = ''.join([w[0].upper() for w in words[:3] if w[0].isupper()])
+        return {
+            'sigla': sigla or 'CONF',
+            'nome': booktitle,
+            'descricao': f'Conferência: {booktitle}'
+        }
+
+def em_lotes(itens, tamanho=TAMANHO_LOTE_IMPORTACAO):
+    """Divide uma lista em fatias de no máximo `tamanho` itens"""
+    itens = list(itens)
+    for inicio in range(0, len(itens), tamanho):
+        yield itens[inicio:inicio + tamanho]
+
+def artigos_existentes(hashes, citekeys):
+    """Retorna (hashes, citekeys) que já existem na coleção de artigos.
+
+    Usa uma consulta `$in` por lote, apoiada nos índices titulo_hash_unico e
+    citekey_unico, em vez de um find_one por entrada.
+    """
+    artigos_collection = mongo.get_collection('artigos')
+    hashes_existentes = set()
+    citekeys_existentes = set()
+    for lote in em_lotes(set(hashes)):
+        for artigo in artigos_collection.find({'titulo_hash': {'$in': lote}}, {'titulo_hash': 1}):
+            hashes_existentes.add(artigo['titulo_hash'])
+    for lote in em_lotes(set(citekeys)):
+        for artigo in artigos_collection.find({'citekey': {'$in': lote}}, {'citekey': 1}):
+            citekeys_existentes.add(artigo['citekey'])
+    return hashes_existentes, citekeys_existentes
+
+def gravar_artigos(documentos):
+    """Grava artigos com upsert pelo hash do título, em lotes não ordenados.
+
+    Um artigo cujo titulo_hash (ou citekey) já exista não é alterado e conta
+    como duplicata, o que torna a reimportação de um arquivo idempotente mesmo
+    com importações concorrentes. Retorna (ids_inseridos, duplicados, erros).
+    """
+    artigos_collection = mongo.get_collection('artigos')
+    for documento in documentos:
+        documento.setdefault('_id', ObjectId())
+
+    inseridos = []
+    duplicados = 0
+    erros = []
+    deslocamento = 0
+    for lote in em_lotes(documentos):
+        operacoes = [
+            UpdateOne(
+                {'titulo_hash': documento['titulo_hash']},
+                {'$setOnInsert': {k: v for k, v in documento.items() if k != 'titulo_hash'}},
+                upsert=True
+            )
+            for documento in lote
+        ]
+        falhas = {}
+        try:
+            upserts = artigos_collection.bulk_write(operacoes, ordered=False).upserted_ids
+        except BulkWriteError as e:
+            upserts = {u['index']: u['_id'] for u in e.details.get('upserted', [])}
+            falhas = {erro['index']: erro for erro in e.details.get('writeErrors', [])}
+        for indice, documento in enumerate(lote):
+            if indice in upserts:
+                inseridos.append(documento['_id'])
+            elif indice not in falhas or falhas[indice].get('code') == 11000:
+                duplicados += 1
+            else:
+                erros.append({'indice': deslocamento + indice, 'codigo': falhas[indice].get('code'),
+                              'error': falhas[indice].get('errmsg')})
+        deslocamento += len(lote)
+    return inseridos, duplicados, erros
+
+def upsert_em_lote(nome_colecao, filtros, documentos):
+    """Cria, com upserts atômicos não ordenados, os documentos que ainda não existem.
+
+    Cada documento é gravado com `$setOnInsert` sob o filtro de mesma posição,
+    então um documento já existente não é alterado. Retorna {indice: _id} dos
+    documentos criados; os demais já existiam (ou foram criados ao mesmo tempo
+    por outra importação, o que o índice único transforma em erro 11000).
+    """
+    collection = mongo.get_collection(nome_colecao)
+    criados = {}
+    deslocamento = 0
+    for lote in em_lotes(list(zip(filtros, documentos))):
+        operacoes = [UpdateOne(filtro, {'$setOnInsert': documento}, upsert=True) for filtro, documento in lote]
+        try:
+            upserts = collection.bulk_write(operacoes, ordered=False).upserted_ids
+        except BulkWriteError as e:
+            falhas = [erro for erro in e.details.get('writeErrors', []) if erro.get('code') != 11000]
+            if falhas:
+                raise
+            upserts = {u['index']: u['_id'] for u in e.details.get('upserted', [])}
+        criados.update({deslocamento + indice: _id for indice, _id in upserts.items()})
+        deslocamento += len(lote)
+    return criados
+
+def resolver_eventos(eventos_info):
+    """Resolve os eventos por sigla, criando os que não existem.
+
+    Recebe {sigla: dados do evento} e retorna ({sigla: evento_id}, criados).
+    Os ausentes são criados por upsert; os IDs dos que já existiam são lidos
+    em uma única consulta `$in`.
+    """
+    if not eventos_info:
+        return {}, 0
+    eventos_collection = mongo.get_collection('eventos')
+    siglas = list(eventos_info)
+    criados = upsert_em_lote(
+        'eventos',
+        [{'sigla': sigla} for sigla in siglas],
+        [
+            {
+                'nome': eventos_info[sigla]['nome'],
+                'descricao': eventos_info[sigla]['descricao'],
+                'criado_em': datetime.utcnow()
+            }
+            for sigla in siglas
+        ]
+    )
+    ids = {siglas[indice]: _id for indice, _id in criados.items()}
+    existentes = [sigla for sigla in siglas if sigla not in ids]
+    if existentes:
+        ids.update({e['sigla']: e['_id'] for e in eventos_collection.find({'sigla': {'$in': existentes}}, {'sigla': 1})})
+    return ids, len(criados)
+
+def resolver_edicoes(edicoes_info):
+    """Resolve as edições por (evento_id, ano), criando as que não existem.
+
+    Recebe {(evento_id, ano): dados da edição} e retorna
+    ({(evento_id, ano): edicao_id}, criadas). Como em resolver_eventos, as
+    ausentes são criadas por upsert e as existentes lidas em uma consulta.
+    """
+    if not edicoes_info:
+        return {}, 0
+    edicoes_collection = mongo.get_collection('edicoes')
+    chaves = list(edicoes_info)
+    criadas = upsert_em_lote(
+        'edicoes',
+        [{'evento_id': evento_id, 'ano': ano} for evento_id, ano in chaves],
+        [
+            {
+                'local': edicoes_info[(evento_id, ano)].get('local', ''),
+                'data_inicio': f"{ano}-01-01",
+                'data_fim': f"{ano}-12-31",
+                'criado_em': datetime.utcnow()
+            }
+            for evento_id, ano in chaves
+        ]
+    )
+    ids = {chaves[indice]: _id for indice, _id in criadas.items()}
+    existentes = {chave for chave in chaves if chave not in ids}
+    if existentes:
+        encontradas = edicoes_collection.find(
+            {'evento_id': {'$in': list({evento_id for evento_id, _ in existentes})},
+             'ano': {'$in': list({ano for _, ano in existentes})}},
+            {'evento_id': 1, 'ano': 1}
+        )
+        ids.update({(e['evento_id'], e['ano']): e['_id'] for e in encontradas if (e['evento_id'], e['ano']) in existentes})
+    return ids, len(criadas)
+
+class CacheResolucao:
+    """IDs de eventos e edições já resolvidos em uma importação.
+
+    Um arquivo de anais tem milhares de entradas e poucos pares
+    booktitle/ano; com o cache, cada evento e cada edição custa uma ida ao
+    banco por importação, e não uma por lote.
+    """
+
+    def __init__(self):
+        self.eventos = {}
+        self.edicoes = {}
+
+    def resolver_eventos(self, eventos_info):
+        """Como resolver_eventos, consultando o banco apenas para siglas ainda não vistas"""
+        ids, criados = resolver_eventos({s: info for s, info in eventos_info.items() if s not in self.eventos})
+        self.eventos.update(ids)
+        return {sigla: self.eventos[sigla] for sigla in eventos_info}, criados
+
+    def resolver_edicoes(self, edicoes_info):
+        """Como resolver_edicoes, consultando o banco apenas para (evento_id, ano) ainda não vistos"""
+        ids, criadas = resolver_edicoes({c: info for c, info in edicoes_info.items() if c not in self.edicoes})
+        self.edicoes.update(ids)
+        return {chave: self.edicoes[chave] for chave in edicoes_info}, criadas
+
+def estatisticas_vazias():
+    """Estrutura de estatísticas devolvida pelas importações"""
+    return {
+        'total_entries': 0,
+        'blocos_lidos': 0,
+        'eventos_criados': 0,
+        'edicoes_criadas': 0,
+        'artigos_criados': 0,
+        'artigos_duplicados': 0,
+        'total_provaveis_duplicatas': 0,
+        'provaveis_duplicatas': [],
+        'pdfs_anexados': 0,
+        'notificacoes_agendadas': 0,
+        'total_erros': 0,
+        'erros': []
+    }
+
+def _registrar(stats, campo, item):
+    """Conta o item em total_<campo> e o guarda em stats[campo] até LIMITE_AMOSTRA_STATS"""
+    stats[f'total_{campo}'] += 1
+    if len(stats[campo]) < LIMITE_AMOSTRA_STATS:
+        stats[campo].append(item)
+
+def importar_lote(entries, stats, vistos, resolucao=None, anexar_pdf=None, grupo_notificacao=None):
+    """Importa um lote de entradas BibTeX já parseadas, acumulando em `stats`.
+
+    `vistos` guarda os hashes de título e citekeys já tratados nesta
+    importação, para que uma entrada repetida em outro lote do mesmo arquivo
+    conte como duplicata. Erros e prováveis duplicatas são contados em
+    total_erros e total_provaveis_duplicatas, e só os LIMITE_AMOSTRA_STATS
+    primeiros de cada são listados. `resolucao` (CacheResolucao) guarda os eventos e
+    edições já resolvidos nos lotes anteriores. `anexar_pdf(citekey,
+    artigo_id)`, quando informado, grava o PDF do artigo e retorna seu caminho
+    (ou None se não houver PDF para a citekey). Com `grupo_notificacao`, os
+    inscritos dos autores dos artigos criados são notificados nos resumos
+    desse grupo (ver app/services/caixa_saida.py).
+    """
+    resolucao = resolucao or CacheResolucao()
+    stats['total_entries'] += len(entries)
+
+    # Normalizar as entradas sem acessar o banco
+    registros = []
+    for entry in entries:
+        try:
+            titulo = entry.get('title', '')
+            titulo_hash = hash_titulo(titulo)
+            if not titulo_hash:
+                _registrar(stats, 'erros', {'entry': entry.get('ID', 'unknown'), 'error': 'Título vazio'})
+                continue
+
+            booktitle = entry.get('booktitle', 'Conferência Desconhecida')
+            registros.append({
+                'entry': entry,
+                'titulo': titulo,
+                'titulo_hash': titulo_hash,
+                'citekey': entry.get('ID') or None,
+                'ano': int(entry.get('year', datetime.now().year)),
+                'evento': extract_event_info(booktitle)
+            })
+        except Exception as e:
+            _registrar(stats, 'erros', {
+                'entry': entry.get('ID', 'unknown'),
+                'error': str(e)
+            })
+
+    # Descartar duplicatas (no banco ou repetidas no próprio arquivo) com consultas em lote
+    hashes, citekeys = artigos_existentes(
+        (r['titulo_hash'] for r in registros if ('hash', r['titulo_hash']) not in vistos),
+        (r['citekey'] for r in registros if r['citekey'] and ('citekey', r['citekey']) not in vistos)
+    )
+    vistos.update(('hash', h) for h in hashes)
+    vistos.update(('citekey', c) for c in citekeys)
+    novos = []
+    for registro in registros:
+        chaves = {('hash', registro['titulo_hash'])}
+        if registro['citekey']:
+            chaves.add(('citekey', registro['citekey']))
+        if chaves & vistos:
+            stats['artigos_duplicados'] += 1
+            continue
+        vistos.update(chaves)
+        novos.append(registro)
+    if not novos:
+        return
+
+    # Resolver eventos e edições de todas as entradas do lote de uma vez
+    eventos_info = {}
+    for registro in novos:
+        eventos_info.setdefault(registro['evento']['sigla'], registro['evento'])
+    eventos_ids, eventos_criados = resolucao.resolver_eventos(eventos_info)
+
+    edicoes_info = {}
+    for registro in novos:
+        chave = (eventos_ids[registro['evento']['sigla']], registro['ano'])
+        registro['chave_edicao'] = chave
+        edicoes_info.setdefault(chave, {'local': registro['entry'].get('address', '')})
+    edicoes_ids, edicoes_criadas = resolucao.resolver_edicoes(edicoes_info)
+    stats['eventos_criados'] += eventos_criados
+    stats['edicoes_criadas'] += edicoes_criadas
+
+    # Gravar os artigos com upsert pelo hash do título
+    artigos = [
+        {
+            "titulo": registro['titulo'],
+            "titulo_hash": registro['titulo_hash'],
+            "citekey": registro['citekey'],
+            "autores": parse_authors(registro['entry'].get('author', '')),
+            "edicao_id": edicoes_ids[registro['chave_edicao']],
+            "resumo": registro['entry'].get('abstract', ''),
+            "keywords": parse_keywords(registro['entry'].get('keywords', '')),
+            "pdf_path": "",
+            "criado_em": datetime.utcnow(),
+            "_id": ObjectId(),
+            **campos_similaridade(registro['titulo'], registro['entry'].get('abstract', ''))
+        }
+        for registro in novos
+    ]
+    for artigo in artigos:
+        artigo['termos'] = termos_busca(artigo['titulo'], artigo['autores'])
+    if anexar_pdf:
+        for registro, artigo in zip(novos, artigos):
+            if registro['citekey']:
+                artigo['pdf_path'] = anexar_pdf(registro['citekey'], artigo['_id']) or ''
+
+    # Quase-duplicatas (títulos e resumos parecidos, mas não iguais) são gravadas e apenas reportadas
+    semelhantes = procurar_semelhantes(artigos)
+
+    inseridos, duplicados, erros = gravar_artigos(artigos)
+    stats['artigos_duplicados'] += duplicados
+    for erro in erros:
+        _registrar(stats, 'erros', {'entry': novos[erro['indice']]['entry'].get('ID', 'unknown'), 'error': erro['error']})
+    inseridos = set(inseridos)
+    for artigo in artigos:
+        # PDF de um artigo que outra importação gravou primeiro não fica órfão em disco
+        if artigo['pdf_path'] and artigo['_id'] not in inseridos and os.path.exists(artigo['pdf_path']):
+            os.remove(artigo['pdf_path'])
+    for indice, artigo_id, titulo, valor in semelhantes:
+        if artigos[indice]['_id'] in inseridos:
+            _registrar(stats, 'provaveis_duplicatas', {
+                'entry': novos[indice]['entry'].get('ID', 'unknown'),
+                'artigo_id': str(artigos[indice]['_id']),
+                'semelhante_a': artigo_id,
+                'titulo_semelhante': titulo,
+                'similaridade': valor
+            })
+    artigos = [a for a in artigos if a['_id'] in inseridos]
+    stats['artigos_criados'] += len(artigos)
+    stats['pdfs_anexados'] += sum(1 for a in artigos if a['pdf_path'])
+
+    # Atualizar os autores dos artigos do lote em uma única escrita em lote
+    Autor.registrar_artigos([(a['_id'], a['autores']) for a in artigos])
+    if eventos_criados:
+        registrar_alteracao('eventos')
+    if edicoes_criadas:
+        registrar_alteracao('edicoes')
+    registrar_alteracao('artigos', edicoes={str(a['edicao_id']) for a in artigos})
+
+    if grupo_notificacao and artigos:
+        try:
+            stats['notificacoes_agendadas'] += notificar_importacao(artigos, grupo_notificacao)
+        except Exception as e:
+            print(f"Erro ao agendar notificações da importação: {e}")
+
+def importar_lotes(lotes, progresso=None, stats=None, anexar_pdf=None):
+    """Importa uma sequência de lotes de entradas e retorna as estatísticas.
+
+    Os lotes podem vir de um gerador (ver app/services/bibtex.py), então a
+    gravação começa antes de o arquivo inteiro ser lido. `progresso(etapa,
+    processadas, total)`, quando informado, é chamado após cada lote; o total
+    só é conhecido ao final. `stats` permite continuar uma importação anterior.
+    `anexar_pdf` é repassado a importar_lote.
+
+    Os inscritos recebem um único resumo por importação, liberado para envio
+    ao final (também se a importação for interrompida por um erro).
+    """
+    stats = stats if stats is not None else estatisticas_vazias()
+    vistos = set()
+    resolucao = CacheResolucao()
+    grupo_notificacao = f"importacao{ObjectId()}"
+    agendadas = stats['notificacoes_agendadas']
+    try:
+        for entries in lotes:
+            importar_lote(entries, stats, vistos, resolucao, anexar_pdf, grupo_notificacao)
+            if progresso:
+                progresso('gravacao', stats['total_entries'], None)
+    finally:
+        if stats['notificacoes_agendadas'] > agendadas:
+            try:
+                liberar_resumos(grupo_notificacao)
+            except Exception as e:
+                print(f"Erro ao liberar notificações da importação: {e}")
+    return stats
+
+def importar_entradas(entries, progresso=None):
+    """Importa uma lista de entradas BibTeX já parseadas"""
+    return importar_lotes(em_lotes(entries), progresso)
+
+def _identificacao_arquivo(caminho):
+    """Tamanho e data de modificação, usados para validar um checkpoint"""
+    info = os.stat(caminho)
+    return {'arquivo': os.path.abspath(caminho), 'tamanho': info.st_size, 'modificado_em': info.st_mtime}
+
+def carregar_checkpoint(checkpoint, caminho):
+    """Retorna as estatísticas salvas no checkpoint, ou None se ele não existir ou for de outro arquivo"""
+    if not os.path.exists(checkpoint):
+        return None
+    with open(checkpoint, 'r', encoding='utf-8') as f:
+        dados = json.load(f)
+    if dados.get('origem') != _identificacao_arquivo(caminho):
+        print(f"Checkpoint {checkpoint} ignorado: o arquivo foi alterado desde a última execução")
+        return None
+    # Campos novos das estatísticas ausentes em checkpoints antigos começam vazios
+    stats = {**estatisticas_vazias(), **dados['stats']}
+    if 'blocos_lidos' not in dados['stats']:
+        stats['blocos_lidos'] = stats['total_entries']
+    for campo in ('erros', 'provaveis_duplicatas'):
+        stats[f'total_{campo}'] = max(stats[f'total_{campo}'], len(stats[campo]))
+    return stats
+
+def salvar_checkpoint(checkpoint, caminho, stats):
+    """Grava o checkpoint de forma atômica (arquivo temporário + rename)"""
+    temporario = f"{checkpoint}.tmp"
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump({'origem': _identificacao_arquivo(caminho), 'stats': stats}, f)
+    os.replace(temporario, checkpoint)
+
+def importar_texto(arquivo, progresso=None, processos=None, stats=None, anexar_pdf=None):
+    """Importa as entradas de um arquivo BibTeX já aberto em modo texto.
+
+    Aceita qualquer objeto com read(), como o stream de um upload envolvido
+    em io.TextIOWrapper, que é decodificado aos poucos. Com `stats` de uma
+    importação anterior, as entradas do arquivo contadas em blocos_lidos são
+    puladas. blocos_lidos difere de total_entries quando o bibtexparser
+    descarta entradas (ex.: @online, @software).
+    """
+    stats = stats if stats is not None else estatisticas_vazias()
+
+    def ao_ler(blocos):
+        # Atualizado antes da gravação do lote; o checkpoint só é salvo depois dela
+        stats['blocos_lidos'] += blocos
+
+    lotes = ler_entradas(arquivo, processos or PROCESSOS_PARSE, pular=stats['blocos_lidos'], ao_ler=ao_ler)
+    return importar_lotes(lotes, progresso, stats, anexar_pdf)
+
+def importar_arquivo(caminho, progresso=None, processos=None, checkpoint=None):
+    """Importa um arquivo BibTeX em UTF-8 lendo e gravando em lotes.
+
+    Com `processos` > 1 (padrão: IMPORTACAO_PROCESSOS), o parse dos lotes é
+    feito em paralelo enquanto os anteriores são gravados. Com `checkpoint`,
+    o número de entradas do arquivo já gravadas é salvo nesse arquivo após
+    cada lote; uma nova execução pula essas entradas sem parseá-las e
+    continua as estatísticas. O checkpoint é removido ao final da importação.
+    """
+    stats = carregar_checkpoint(checkpoint, caminho) if checkpoint else None
+    if stats is None:
+        stats = estatisticas_vazias()
+    elif stats['blocos_lidos']:
+        print(f"Retomando a importação após {stats['blocos_lidos']} entradas")
+
+    def ao_gravar(etapa, processadas, total):
+        if checkpoint:
+            salvar_checkpoint(checkpoint, caminho, stats)
+        if progresso:
+            progresso(etapa, processadas, total)
+
+    with open(caminho, 'r', encoding='utf-8') as bibfile:
+        importar_texto(bibfile, ao_gravar, processos, stats)
+    if checkpoint and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    return stats
+
+def executar_importacao(importacao_id, caminho, importar=None):
+    """Executa uma importação registrada, atualizando seu progresso e removendo o arquivo ao final.
+
+    `importar(caminho, progresso=...)` faz a importação propriamente dita:
+    importar_arquivo (padrão) para arquivos .bib, ou importar_pacote
+    (app/services/pacotes.py) para pacotes zip com PDFs.
+    """
+    importar = importar or importar_arquivo
+    try:
+        if not Importacao.iniciar(importacao_id):
+            print(f"Importação {importacao_id} expirou antes de começar e foi descartada")
+            return None
+        stats = importar(
+            caminho,
+            progresso=lambda etapa, processadas, total: Importacao.atualizar_progresso(importacao_id, etapa, processadas, total)
+        )
+        if not stats['total_entries']:
+            Importacao.falhar(importacao_id, 'Nenhum artigo encontrado no arquivo BibTeX')
+            return None
+        Importacao.atualizar_progresso(importacao_id, 'concluida', stats['total_entries'], stats['total_entries'])
+        Importacao.concluir(importacao_id, stats)
+        return stats
+    except Exception as e:
+        print(f"Erro na importação {importacao_id}: {e}")
+        Importacao.falhar(importacao_id, f'Erro ao processar arquivo: {str(e)}')
+        return None
+    finally:
+        if os.path.exists(caminho):
+            os.remove(caminho)
+
+# Mensagem das importações interrompidas antes de terminar
+ERRO_IMPORTACAO_INTERROMPIDA = 'Importação interrompida antes de terminar (ex.: reinício do servidor); envie o arquivo novamente'
+
+def expirar_importacoes_abandonadas(incluir_pendentes=False):
+    """Marca como falhas as importações interrompidas (ex.: servidor reiniciado durante o processamento).
+
+    Os jobs vivem no pool de threads do processo que os recebeu e não são
+    retomados; sem isso ficariam "processando" para sempre. Pendentes só são
+    expiradas com `incluir_pendentes`, na inicialização do servidor.
+    """
+    return Importacao.expirar_abandonadas(
+        EXPIRACAO_IMPORTACAO, ERRO_IMPORTACAO_INTERROMPIDA, incluir_pendentes=incluir_pendentes
+    )
+
+def situacao_importacao(importacao_id):
+    """Importação com a situação a exibir, ou None se não existir.
+
+    Uma importação em andamento sem progresso há EXPIRACAO_IMPORTACAO
+    segundos é apresentada como falha, sem gravar nada: a consulta é feita a
+    cada segundo por quem acompanha o job.
+    """
+    importacao = Importacao.find_by_id(importacao_id)
+    if importacao and Importacao.abandonada(importacao, EXPIRACAO_IMPORTACAO):
+        importacao['status'] = FALHOU
+        importacao['error'] = ERRO_IMPORTACAO_INTERROMPIDA
+    return importacao
+
+def enfileirar_importacao(caminho, arquivo, importar=None):
+    """Registra a importação e a envia ao pool de threads; retorna o ID da importação"""
+    try:
+        expirar_importacoes_abandonadas()
+    except Exception as e:
+        print(f"Erro ao expirar importações interrompidas: {e}")
+    importacao_id = Importacao.create(arquivo)
+    executor_importacoes.submit(executar_importacao, importacao_id, caminho, importar)
+    return importacao_id
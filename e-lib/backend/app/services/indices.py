@@ -0,0 +1,401 @@
+import os
+from datetime import datetime, timedelta
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import IndexModel, ASCENDING, TEXT, UpdateOne, ReturnDocument
+from pymongo.errors import PyMongoError, BulkWriteError, DuplicateKeyError
+from app.services.database import mongo
+from app.services.cache import registrar_alteracao
+from app.services.busca_service import INDICE_TEXTO_ARTIGOS, CAMPOS_INDICE_TEXTO, CAMPO_TERMOS
+
+# Registro declarativo dos índices de cada coleção.
+# Aplicado de forma idempotente pelo script migrar_banco.py.
+INDICES = {
+    'artigos': [
+        IndexModel([('edicao_id', ASCENDING)], name='edicao_id_1'),
+        IndexModel([('titulo', ASCENDING)], name='titulo_1'),
+        # Deduplicação de importações: hash do título normalizado e chave BibTeX
+        IndexModel(
+            [('titulo_hash', ASCENDING)], name='titulo_hash_unico', unique=True,
+            partialFilterExpression={'titulo_hash': {'$type': 'string'}}
+        ),
+        IndexModel(
+            [('citekey', ASCENDING)], name='citekey_unico', unique=True,
+            partialFilterExpression={'citekey': {'$type': 'string'}}
+        ),
+        # Baldes LSH (multikey) usados na busca de quase-duplicatas
+        IndexModel([('lsh_baldes', ASCENDING)], name='lsh_baldes_1'),
+        # Palavras normalizadas (multikey) da busca por prefixo
+        IndexModel([(CAMPO_TERMOS, ASCENDING)], name='termos_1'),
+        IndexModel(
+            [(campo, TEXT) for campo in CAMPOS_INDICE_TEXTO],
+            name=INDICE_TEXTO_ARTIGOS,
+            weights=CAMPOS_INDICE_TEXTO,
+            default_language='portuguese',
+            language_override='idioma_indice'
+        ),
+    ],
+    'eventos': [
+        IndexModel([('sigla', ASCENDING)], name='sigla_unica', unique=True),
+    ],
+    'edicoes': [
+        IndexModel([('evento_id', ASCENDING), ('ano', ASCENDING)], name='evento_id_ano_unico', unique=True),
+    ],
+    'inscricoes': [
+        IndexModel([('email', ASCENDING)], name='email_unico', unique=True),
+    ],
+    'notificacoes': [
+        IndexModel([('nome_autor', ASCENDING), ('ativo', ASCENDING)], name='nome_autor_ativo'),
+    ],
+    'usuarios': [
+        IndexModel([('email', ASCENDING)], name='email_1'),
+    ],
+    'autores': [
+        IndexModel([('nome_normalizado', ASCENDING)], name='nome_normalizado_unico', unique=True),
+    ],
+    'importacoes': [
+        # Expiração das importações interrompidas
+        IndexModel([('status', ASCENDING), ('atualizado_em', ASCENDING)], name='status_atualizado_em'),
+    ],
+    'migracoes': [
+        IndexModel([('versao', ASCENDING)], name='versao_unica', unique=True),
+    ],
+    'caixa_saida': [
+        # Reserva do próximo item pendente pelos workers de notificação
+        IndexModel([('status', ASCENDING), ('proxima_tentativa', ASCENDING)], name='status_proxima_tentativa'),
+        # Torna idempotente a distribuição de uma notificação entre os destinatários
+        IndexModel(
+            [('chave', ASCENDING)], name='chave_unica', unique=True,
+            partialFilterExpression={'chave': {'$type': 'string'}}
+        ),
+    ],
+}
+
+# Coleção que guarda as migrações já aplicadas
+COLECAO_MIGRACOES = 'migracoes'
+
+# Migrações versionadas, aplicadas em ordem e uma única vez por banco
+MIGRACOES = []
+
+# Documentos por lote nas migrações de dados
+TAMANHO_LOTE_MIGRACAO = 1000
+
+# Segundos após os quais a reserva de uma migração 'em_andamento' é considerada
+# abandonada (processo encerrado no meio da migração) e pode ser retomada
+MIGRACAO_EXPIRACAO = int(os.environ.get('MIGRACAO_EXPIRACAO', 3600))
+
+def migracao(versao, descricao):
+    """Registra uma função como migração versionada"""
+    def registrar(funcao):
+        MIGRACOES.append({'versao': versao, 'descricao': descricao, 'funcao': funcao})
+        MIGRACOES.sort(key=lambda m: m['versao'])
+        return funcao
+    return registrar
+
+@migracao(1, 'Remove inscrições com email duplicado antes do índice único')
+def _remover_inscricoes_duplicadas():
+    inscricoes_collection = mongo.get_collection('inscricoes')
+    duplicadas = inscricoes_collection.aggregate([
+        {'$sort': {'_id': 1}},
+        {'$group': {'_id': '$email', 'ids': {'$push': '$_id'}, 'total': {'$sum': 1}}},
+        {'$match': {'total': {'$gt': 1}}}
+    ])
+    removidas = 0
+    for grupo in duplicadas:
+        # Mantém a inscrição mais antiga de cada email
+        result = inscricoes_collection.delete_many({'_id': {'$in': grupo['ids'][1:]}})
+        removidas += result.deleted_count
+    return removidas
+
+def normalizar_referencias(nome_colecao, campo, lote=TAMANHO_LOTE_MIGRACAO, ao_duplicar=None):
+    """Converte para ObjectId as referências gravadas como string, em lotes.
+
+    Só seleciona documentos cujo campo ainda é string, então a migração pode
+    ser interrompida e retomada sem refazer o que já foi convertido. Cada
+    atualização confere o valor antigo, o que a torna segura com a aplicação
+    no ar. Quando a conversão viola um índice único, `ao_duplicar(_id)` é
+    chamado para resolver o conflito.
+    """
+    collection = mongo.get_collection(nome_colecao)
+    stats = {'convertidos': 0, 'invalidos': 0, 'duplicados': 0}
+    ultimo_id = None
+    while True:
+        filtro = {campo: {'$type': 'string'}}
+        if ultimo_id is not None:
+            filtro['_id'] = {'$gt': ultimo_id}
+        documentos = list(collection.find(filtro, {campo: 1}).sort('_id', 1).limit(lote))
+        if not documentos:
+            break
+        ultimo_id = documentos[-1]['_id']
+        
+        operacoes = []
+        ids_operacoes = []
+        for documento in documentos:
+            try:
+                novo_valor = ObjectId(documento[campo])
+            except InvalidId:
+                stats['invalidos'] += 1
+                continue
+            operacoes.append(UpdateOne(
+                {'_id': documento['_id'], campo: documento[campo]},
+                {'$set': {campo: novo_valor}}
+            ))
+            ids_operacoes.append(documento['_id'])
+        if not operacoes:
+            continue
+        
+        try:
+            result = collection.bulk_write(operacoes, ordered=False)
+            stats['convertidos'] += result.modified_count
+        except BulkWriteError as e:
+            stats['convertidos'] += e.details.get('nModified', 0)
+            for erro in e.details.get('writeErrors', []):
+                if erro.get('code') != 11000 or ao_duplicar is None:
+                    raise
+                stats['duplicados'] += 1
+                ao_duplicar(ids_operacoes[erro['index']])
+        print(f"  {nome_colecao}.{campo}: {stats['convertidos']} convertidos até {ultimo_id}")
+    return stats
+
+def _mesclar_edicao_duplicada(edicao_id):
+    """Move os artigos de uma edição legada para a edição equivalente já normalizada e a remove"""
+    edicoes_collection = mongo.get_collection('edicoes')
+    artigos_collection = mongo.get_collection('artigos')
+    
+    edicao = edicoes_collection.find_one({'_id': edicao_id})
+    if not edicao:
+        return
+    existente = edicoes_collection.find_one({'evento_id': ObjectId(edicao['evento_id']), 'ano': edicao.get('ano')})
+    if not existente:
+        return
+    artigos_collection.update_many(
+        {'edicao_id': {'$in': [edicao_id, str(edicao_id)]}},
+        {'$set': {'edicao_id': existente['_id']}}
+    )
+    edicoes_collection.delete_one({'_id': edicao_id})
+    print(f"  Edição duplicada {edicao_id} mesclada em {existente['_id']}")
+
+@migracao(2, 'Normaliza edicoes.evento_id e artigos.edicao_id para ObjectId')
+def _normalizar_ids_referencias():
+    # O índice único de edições precisa existir para que conversões duplicadas sejam detectadas
+    garantir_indices(['edicoes'])
+    normalizar_referencias('edicoes', 'evento_id', ao_duplicar=_mesclar_edicao_duplicada)
+    normalizar_referencias('artigos', 'edicao_id')
+
+@migracao(3, 'Popula a coleção de autores a partir dos artigos existentes')
+def _popular_autores():
+    from app.models.autor import Autor
+    # O upsert por nome_normalizado depende do índice único para não duplicar autores
+    garantir_indices(['autores'])
+    total = Autor.reconstruir()
+    print(f"  {total} artigos registrados na coleção de autores")
+
+@migracao(4, 'Calcula titulo_hash dos artigos existentes')
+def _calcular_hash_titulos(lote=TAMANHO_LOTE_MIGRACAO):
+    from app.models.artigo import hash_titulo
+    # O índice único precisa existir para que títulos equivalentes já gravados sejam detectados
+    garantir_indices(['artigos'])
+    artigos_collection = mongo.get_collection('artigos')
+    stats = {'calculados': 0, 'duplicados': 0}
+    ultimo_id = None
+    while True:
+        filtro = {'titulo_hash': {'$exists': False}}
+        if ultimo_id is not None:
+            filtro['_id'] = {'$gt': ultimo_id}
+        artigos = list(artigos_collection.find(filtro, {'titulo': 1}).sort('_id', 1).limit(lote))
+        if not artigos:
+            break
+        ultimo_id = artigos[-1]['_id']
+        operacoes = [
+            UpdateOne({'_id': a['_id'], 'titulo_hash': {'$exists': False}}, {'$set': {'titulo_hash': hash_titulo(a.get('titulo'))}})
+            for a in artigos
+        ]
+        try:
+            result = artigos_collection.bulk_write(operacoes, ordered=False)
+            stats['calculados'] += result.modified_count
+        except BulkWriteError as e:
+            stats['calculados'] += e.details.get('nModified', 0)
+            for erro in e.details.get('writeErrors', []):
+                if erro.get('code') != 11000:
+                    raise
+                # Duplicata já existente: o artigo mais novo fica sem hash e não participa da deduplicação
+                stats['duplicados'] += 1
+    print(f"  {stats['calculados']} artigos com hash, {stats['duplicados']} duplicatas existentes mantidas sem hash")
+    return stats
+
+@migracao(5, 'Calcula assinaturas MinHash e baldes LSH dos artigos existentes')
+def _calcular_assinaturas(lote=TAMANHO_LOTE_MIGRACAO):
+    from app.services.similaridade import campos_similaridade
+    artigos_collection = mongo.get_collection('artigos')
+    calculadas = 0
+    ultimo_id = None
+    while True:
+        filtro = {'lsh_baldes': {'$exists': False}}
+        if ultimo_id is not None:
+            filtro['_id'] = {'$gt': ultimo_id}
+        artigos = list(artigos_collection.find(filtro, {'titulo': 1, 'resumo': 1}).sort('_id', 1).limit(lote))
+        if not artigos:
+            break
+        ultimo_id = artigos[-1]['_id']
+        operacoes = [
+            UpdateOne({'_id': a['_id']}, {'$set': campos_similaridade(a.get('titulo'), a.get('resumo'))})
+            for a in artigos
+        ]
+        calculadas += artigos_collection.bulk_write(operacoes, ordered=False).modified_count
+    print(f"  {calculadas} artigos com assinatura MinHash")
+    return calculadas
+
+@migracao(6, 'Calcula os termos da busca por prefixo dos artigos existentes')
+def _calcular_termos_busca(lote=TAMANHO_LOTE_MIGRACAO):
+    from app.services.busca_service import termos_busca
+    artigos_collection = mongo.get_collection('artigos')
+    calculados = 0
+    ultimo_id = None
+    while True:
+        filtro = {CAMPO_TERMOS: {'$exists': False}}
+        if ultimo_id is not None:
+            filtro['_id'] = {'$gt': ultimo_id}
+        artigos = list(artigos_collection.find(filtro, {'titulo': 1, 'autores': 1}).sort('_id', 1).limit(lote))
+        if not artigos:
+            break
+        ultimo_id = artigos[-1]['_id']
+        operacoes = [
+            UpdateOne({'_id': a['_id']}, {'$set': {CAMPO_TERMOS: termos_busca(a.get('titulo'), a.get('autores'))}})
+            for a in artigos
+        ]
+        calculados += artigos_collection.bulk_write(operacoes, ordered=False).modified_count
+    print(f"  {calculados} artigos com termos de busca")
+    return calculados
+
+def garantir_indices(colecoes=None):
+    """Cria os índices declarados em INDICES que ainda não existem.
+
+    Cada índice é criado separadamente para que uma falha (por exemplo, dados
+    duplicados impedindo um índice único) não impeça a criação dos demais.
+    """
+    resultado = {'criados': [], 'erros': []}
+    for nome_colecao, indices in INDICES.items():
+        if colecoes and nome_colecao not in colecoes:
+            continue
+        collection = mongo.get_collection(nome_colecao)
+        for indice in indices:
+            nome_indice = indice.document['name']
+            try:
+                collection.create_indexes([indice])
+                resultado['criados'].append(f"{nome_colecao}.{nome_indice}")
+            except PyMongoError as e:
+                print(f"Erro ao criar índice {nome_colecao}.{nome_indice}: {e}")
+                resultado['erros'].append({'indice': f"{nome_colecao}.{nome_indice}", 'error': str(e)})
+    return resultado
+
+def versoes_aplicadas():
+    """Retorna o conjunto de versões de migração já concluídas"""
+    migracoes_collection = mongo.get_collection(COLECAO_MIGRACOES)
+    return {m['versao'] for m in migracoes_collection.find({'status': 'concluida'}, {'versao': 1})}
+
+def registros_migracoes():
+    """Retorna os registros de migração (concluídas e em andamento) por versão"""
+    migracoes_collection = mongo.get_collection(COLECAO_MIGRACOES)
+    return {m['versao']: m for m in migracoes_collection.find()}
+
+def migracoes_pendentes():
+    """Retorna as versões declaradas em MIGRACOES que ainda não foram concluídas"""
+    aplicadas = versoes_aplicadas()
+    return [m['versao'] for m in MIGRACOES if m['versao'] not in aplicadas]
+
+def reserva_expirada(registro, agora=None):
+    """Indica se a reserva de uma migração em andamento passou do prazo"""
+    if registro.get('status') != 'em_andamento' or not registro.get('iniciada_em'):
+        return False
+    agora = agora or datetime.utcnow()
+    return registro['iniciada_em'] < agora - timedelta(seconds=MIGRACAO_EXPIRACAO)
+
+def _reservar_migracao(migracoes_collection, m):
+    """Reserva a migração para este processo; retorna o _id da reserva ou None.
+
+    A reserva é criada com um upsert. Se já existir uma reserva 'em_andamento'
+    cujo `iniciada_em` passou de MIGRACAO_EXPIRACAO, o processo que a fez foi
+    interrompido: ela é retomada com uma atualização condicional, de modo que
+    só um processo a assuma.
+    """
+    agora = datetime.utcnow()
+    try:
+        reserva = migracoes_collection.update_one(
+            {'versao': m['versao']},
+            {'$setOnInsert': {
+                'versao': m['versao'],
+                'descricao': m['descricao'],
+                'status': 'em_andamento',
+                'iniciada_em': agora
+            }},
+            upsert=True
+        )
+        if reserva.upserted_id is not None:
+            return reserva.upserted_id
+    except DuplicateKeyError:
+        # Outro processo inseriu a reserva ao mesmo tempo (índice versao_unica)
+        pass
+
+    retomada = migracoes_collection.find_one_and_update(
+        {
+            'versao': m['versao'],
+            'status': 'em_andamento',
+            'iniciada_em': {'$lt': agora - timedelta(seconds=MIGRACAO_EXPIRACAO)}
+        },
+        {'$set': {'iniciada_em': agora}, '$inc': {'tentativas': 1}},
+        return_document=ReturnDocument.AFTER
+    )
+    if retomada is None:
+        return None  # Já aplicada ou em execução em outro processo
+    print(f"Retomando migração {m['versao']} abandonada por outro processo")
+    return retomada['_id']
+
+def aplicar_migracoes():
+    """Aplica, em ordem, as migrações pendentes.
+
+    Cada versão é reservada antes de executar, para que dois processos
+    iniciando ao mesmo tempo não apliquem a mesma migração; reservas
+    abandonadas são retomadas após MIGRACAO_EXPIRACAO segundos. Se uma
+    versão estiver em execução em outro processo, as seguintes não são
+    aplicadas, pois dependem do resultado dela.
+    """
+    garantir_indices([COLECAO_MIGRACOES])
+    migracoes_collection = mongo.get_collection(COLECAO_MIGRACOES)
+    aplicadas = []
+    for m in MIGRACOES:
+        reserva_id = _reservar_migracao(migracoes_collection, m)
+        if reserva_id is None:
+            registro = migracoes_collection.find_one({'versao': m['versao']}, {'status': 1}) or {}
+            if registro.get('status') == 'concluida':
+                continue
+            print(f"Migração {m['versao']} em execução em outro processo; as seguintes ficam para a próxima execução")
+            break
+
+        print(f"Aplicando migração {m['versao']}: {m['descricao']}")
+        try:
+            m['funcao']()
+        except Exception as e:
+            print(f"Erro na migração {m['versao']}: {e}")
+            # Libera a reserva para que a migração seja tentada novamente
+            migracoes_collection.delete_one({'_id': reserva_id})
+            raise
+        migracoes_collection.update_one(
+            {'_id': reserva_id},
+            {'$set': {'status': 'concluida', 'concluida_em': datetime.utcnow()}}
+        )
+        aplicadas.append(m['versao'])
+    return aplicadas
+
+def inicializar_banco():
+    """Aplica migrações pendentes e garante os índices do registro"""
+    try:
+        migracoes = aplicar_migracoes()
+        if migracoes:
+            # Migrações reescrevem documentos sem passar pelas rotas: invalida as ETags emitidas
+            for colecao in ('artigos', 'edicoes', 'eventos'):
+                registrar_alteracao(colecao)
+        indices = garantir_indices()
+        return {'migracoes_aplicadas': migracoes, **indices}
+    except Exception as e:
+        print(f"Erro ao inicializar índices e migrações: {e}")
+        return None
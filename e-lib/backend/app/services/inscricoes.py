@@ -0,0 +1,81 @@
+import time
+import threading
+from app.models.autor import normalizar_nome
+from app.models.notificacao import Notificacao
+
+class IndiceInscricoes:
+    """Índice em memória das inscrições ativas, por nome de autor normalizado.
+
+    Permite casar os autores de um artigo (ou de um lote inteiro da
+    importação) com todos os inscritos em uma única passada, sem consultas
+    ao banco. As rotas de inscrição atualizam o índice incrementalmente; o
+    TTL faz com que alterações feitas por outros processos sejam recarregadas
+    periodicamente.
+    """
+
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self._por_nome = {}     # nome normalizado -> {id da inscrição: inscrição}
+        self._nome_por_id = {}  # id da inscrição -> nome normalizado
+        self._carregado_em = None
+        self._lock = threading.Lock()
+
+    def _carregar(self):
+        por_nome, nome_por_id = {}, {}
+        for inscricao in Notificacao.listar_ativas():
+            chave = normalizar_nome(inscricao['nome_autor'])
+            inscricao_id = str(inscricao['_id'])
+            por_nome.setdefault(chave, {})[inscricao_id] = inscricao
+            nome_por_id[inscricao_id] = chave
+        self._por_nome, self._nome_por_id = por_nome, nome_por_id
+        self._carregado_em = time.monotonic()
+
+    def _garantir_carregado(self):
+        if self._carregado_em is None or time.monotonic() - self._carregado_em > self.ttl:
+            self._carregar()
+
+    def adicionar(self, inscricao):
+        """Registra uma inscrição recém-criada (precisa de _id, email e nome_autor)"""
+        with self._lock:
+            if self._carregado_em is None:
+                return  # entra na primeira carga
+            chave = normalizar_nome(inscricao['nome_autor'])
+            inscricao_id = str(inscricao['_id'])
+            self._por_nome.setdefault(chave, {})[inscricao_id] = inscricao
+            self._nome_por_id[inscricao_id] = chave
+
+    def remover(self, inscricao_id):
+        """Retira uma inscrição desativada"""
+        with self._lock:
+            chave = self._nome_por_id.pop(str(inscricao_id), None)
+            if chave is None:
+                return
+            inscricoes = self._por_nome.get(chave, {})
+            inscricoes.pop(str(inscricao_id), None)
+            if not inscricoes:
+                self._por_nome.pop(chave, None)
+
+    def inscritos(self, nome_autor):
+        """Inscrições ativas para um nome de autor (comparação sem acentos e sem maiúsculas)"""
+        with self._lock:
+            self._garantir_carregado()
+            return list(self._por_nome.get(normalizar_nome(nome_autor), {}).values())
+
+    def correspondencias(self, nomes):
+        """Casa vários nomes de autor de uma vez: {nome: [inscrições]}, só para nomes com inscritos"""
+        with self._lock:
+            self._garantir_carregado()
+            resultado = {}
+            for nome in nomes:
+                inscricoes = self._por_nome.get(normalizar_nome(nome))
+                if inscricoes:
+                    resultado[nome] = list(inscricoes.values())
+            return resultado
+
+    def invalidar(self):
+        """Força a recarga completa na próxima consulta"""
+        with self._lock:
+            self._carregado_em = None
+
+# Instância global
+indice_inscricoes = IndiceInscricoes()
@@ -0,0 +1,60 @@
+import io
+import os
+import shutil
+import zipfile
+from werkzeug.utils import secure_filename
+from app.services.importacao import importar_texto
+
+def membros_do_pacote(pacote):
+    """Retorna (nome do .bib, {citekey: nome do PDF}) de um zipfile.ZipFile aberto.
+
+    Só o diretório central do zip é lido. Os PDFs são associados às entradas
+    pelo nome do arquivo sem extensão, em qualquer pasta do pacote. Levanta
+    ValueError se o pacote não tiver exatamente um arquivo .bib.
+    """
+    bibs = []
+    pdfs = {}
+    for info in pacote.infolist():
+        if info.is_dir():
+            continue
+        nome, extensao = os.path.splitext(os.path.basename(info.filename))
+        if nome.startswith('.'):
+            continue  # metadados de sistemas operacionais (ex.: __MACOSX/._arquivo)
+        extensao = extensao.lower()
+        if extensao == '.bib':
+            bibs.append(info.filename)
+        elif extensao == '.pdf':
+            pdfs[nome] = info.filename
+    if len(bibs) != 1:
+        raise ValueError(f'O pacote deve conter exatamente um arquivo .bib (encontrados: {len(bibs)})')
+    return bibs[0], pdfs
+
+def importar_pacote(caminho, pasta_pdfs, progresso=None, processos=None):
+    """Importa um pacote zip (caminho ou arquivo binário aberto) com um .bib e os PDFs nomeados pela citekey.
+
+    O .bib é lido e decodificado direto do zip, sem extração, e cada PDF é
+    extraído em blocos para `pasta_pdfs` no momento em que seu artigo é
+    gravado; o pacote nunca fica inteiro em memória. PDFs de entradas
+    duplicadas ou sem entrada correspondente não são extraídos e aparecem em
+    stats['pdfs_ignorados'].
+    """
+    with zipfile.ZipFile(caminho) as pacote:
+        bib, pdfs = membros_do_pacote(pacote)
+        usados = set()
+
+        def anexar_pdf(citekey, artigo_id):
+            membro = pdfs.get(citekey)
+            if not membro:
+                return None
+            os.makedirs(pasta_pdfs, exist_ok=True)
+            destino = os.path.join(pasta_pdfs, f"{artigo_id}_{secure_filename(citekey)}.pdf")
+            with pacote.open(membro) as origem, open(destino, 'wb') as arquivo:
+                shutil.copyfileobj(origem, arquivo)
+            usados.add(citekey)
+            return destino
+
+        with pacote.open(bib) as membro_bib:
+            stats = importar_texto(io.TextIOWrapper(membro_bib, encoding='utf-8'), progresso, processos,
+                                   anexar_pdf=anexar_pdf)
+    stats['pdfs_ignorados'] = sorted(pdfs[c] for c in set(pdfs) - usados)
+    return stats
@@ -0,0 +1,157 @@
+import re
+import random
+import zlib
+from itertools import combinations
+from app.services.database import mongo
+from app.models.autor import normalizar_nome
+
+# Assinatura MinHash: NUM_PERMUTACOES mínimos divididos em BANDAS de LINHAS_POR_BANDA.
+# Com 16 bandas de 4 linhas, pares com similaridade de Jaccard acima de ~0,5
+# tendem a cair em pelo menos um balde em comum.
+NUM_PERMUTACOES = 64
+BANDAS = 16
+LINHAS_POR_BANDA = NUM_PERMUTACOES // BANDAS
+
+# Similaridade estimada a partir da qual um par é reportado como provável duplicata
+# (com 64 permutações a estimativa tem erro padrão de ~0,05)
+LIMIAR_SIMILARIDADE = 0.75
+
+# Palavras por shingle
+TAMANHO_SHINGLE = 2
+
+# Baldes por consulta `$in`
+TAMANHO_LOTE_BALDES = 5000
+
+_PRIMO = (1 << 61) - 1
+_gerador = random.Random(20240601)  # semente fixa: assinaturas comparáveis entre processos
+_PERMUTACOES = [(_gerador.randrange(1, _PRIMO), _gerador.randrange(0, _PRIMO)) for _ in range(NUM_PERMUTACOES)]
+
+def _palavras(texto):
+    """Palavras do texto sem comandos LaTeX, acentos e caixa"""
+    texto = re.sub(r'\\[a-zA-Z]+', ' ', texto or '')
+    texto = re.sub(r'\\[^a-zA-Z\s]|[{}]', '', texto)  # acentos como \'e e chaves
+    return re.findall(r'[a-z0-9]+', normalizar_nome(texto))
+
+def shingles(titulo, resumo=''):
+    """Conjunto de sequências de TAMANHO_SHINGLE palavras do título e do resumo"""
+    palavras = _palavras(f"{titulo or ''} {resumo or ''}")
+    if len(palavras) < TAMANHO_SHINGLE:
+        return set(palavras)
+    return {' '.join(palavras[i:i + TAMANHO_SHINGLE]) for i in range(len(palavras) - TAMANHO_SHINGLE + 1)}
+
+def assinatura(titulo, resumo=''):
+    """Assinatura MinHash do artigo, ou None se não houver texto"""
+    valores = [zlib.crc32(s.encode('utf-8')) for s in shingles(titulo, resumo)]
+    if not valores:
+        return None
+    return [min((a * v + b) % _PRIMO for v in valores) for a, b in _PERMUTACOES]
+
+def baldes(minhash):
+    """Chaves LSH ('banda:hash') da assinatura; artigos parecidos compartilham ao menos uma"""
+    chaves = []
+    for banda in range(BANDAS):
+        linhas = minhash[banda * LINHAS_POR_BANDA:(banda + 1) * LINHAS_POR_BANDA]
+        chaves.append(f"{banda}:{zlib.crc32(repr(linhas).encode('ascii')):08x}")
+    return chaves
+
+def similaridade(minhash_a, minhash_b):
+    """Estimativa da similaridade de Jaccard entre duas assinaturas"""
+    if not minhash_a or not minhash_b:
+        return 0.0
+    iguais = sum(1 for a, b in zip(minhash_a, minhash_b) if a == b)
+    return iguais / len(minhash_a)
+
+def campos_similaridade(titulo, resumo=''):
+    """Campos `minhash` e `lsh_baldes` gravados em cada artigo"""
+    minhash = assinatura(titulo, resumo)
+    return {'minhash': minhash, 'lsh_baldes': baldes(minhash) if minhash else []}
+
+def pares_candidatos(grupos):
+    """Pares distintos de IDs que compartilham algum balde, dado um iterável de listas de IDs por balde"""
+    pares = set()
+    for ids in grupos:
+        for a, b in combinations(sorted(set(ids), key=str), 2):
+            pares.add((a, b))
+    return pares
+
+def procurar_semelhantes(artigos, limiar=LIMIAR_SIMILARIDADE):
+    """Procura, para cada artigo novo, o artigo mais parecido já gravado ou anterior na lista.
+
+    `artigos` são documentos com `_id`, `titulo`, `minhash` e `lsh_baldes`.
+    Só os artigos que compartilham algum balde LSH são comparados, então o
+    custo depende do número de candidatos e não do tamanho da coleção.
+    Retorna [(indice, artigo_id, titulo, similaridade)] para os pares acima
+    de `limiar`.
+    """
+    artigos_collection = mongo.get_collection('artigos')
+    todos_baldes = sorted({b for a in artigos for b in a.get('lsh_baldes') or []})
+    existentes = {}
+    for inicio in range(0, len(todos_baldes), TAMANHO_LOTE_BALDES):
+        lote = todos_baldes[inicio:inicio + TAMANHO_LOTE_BALDES]
+        for artigo in artigos_collection.find({'lsh_baldes': {'$in': lote}}, {'titulo': 1, 'minhash': 1, 'lsh_baldes': 1}):
+            existentes[artigo['_id']] = artigo
+
+    por_balde = {}
+    for artigo in existentes.values():
+        for balde in artigo.get('lsh_baldes') or []:
+            por_balde.setdefault(balde, []).append(artigo)
+
+    semelhantes = []
+    for indice, artigo in enumerate(artigos):
+        candidatos = {}
+        for balde in artigo.get('lsh_baldes') or []:
+            for candidato in por_balde.get(balde, []):
+                candidatos[candidato['_id']] = candidato
+        candidatos.pop(artigo.get('_id'), None)
+        melhor = None
+        for candidato in candidatos.values():
+            valor = similaridade(artigo['minhash'], candidato.get('minhash'))
+            if valor >= limiar and (melhor is None or valor > melhor[1]):
+                melhor = (candidato, valor)
+        if melhor:
+            semelhantes.append((indice, str(melhor[0]['_id']), melhor[0].get('titulo'), round(melhor[1], 3)))
+        # Artigos do próprio lote também são candidatos para os seguintes
+        for balde in artigo.get('lsh_baldes') or []:
+            por_balde.setdefault(balde, []).append(artigo)
+    return semelhantes
+
+def pares_duplicados(limiar=LIMIAR_SIMILARIDADE, limite=100):
+    """Pares de artigos de toda a coleção com similaridade estimada acima de `limiar`.
+
+    O agrupamento por balde é feito no banco; apenas os pares que dividem
+    algum balde têm as assinaturas comparadas. Ordenado da maior para a menor
+    similaridade.
+    """
+    artigos_collection = mongo.get_collection('artigos')
+    grupos = artigos_collection.aggregate([
+        {'$match': {'lsh_baldes.0': {'$exists': True}}},
+        {'$unwind': '$lsh_baldes'},
+        {'$group': {'_id': '$lsh_baldes', 'ids': {'$push': '$_id'}}},
+        {'$match': {'ids.1': {'$exists': True}}}
+    ], allowDiskUse=True)
+    pares = pares_candidatos(grupo['ids'] for grupo in grupos)
+    if not pares:
+        return []
+
+    ids = list({i for par in pares for i in par})
+    artigos = {}
+    for inicio in range(0, len(ids), TAMANHO_LOTE_BALDES):
+        filtro = {'_id': {'$in': ids[inicio:inicio + TAMANHO_LOTE_BALDES]}}
+        for artigo in artigos_collection.find(filtro, {'titulo': 1, 'minhash': 1, 'edicao_id': 1}):
+            artigos[artigo['_id']] = artigo
+
+    resultado = []
+    for a, b in pares:
+        if a not in artigos or b not in artigos:
+            continue
+        valor = similaridade(artigos[a].get('minhash'), artigos[b].get('minhash'))
+        if valor >= limiar:
+            resultado.append({
+                'similaridade': round(valor, 3),
+                'artigos': [
+                    {'_id': str(i), 'titulo': artigos[i].get('titulo'), 'edicao_id': str(artigos[i].get('edicao_id'))}
+                    for i in (a, b)
+                ]
+            })
+    resultado.sort(key=lambda par: par['similaridade'], reverse=True)
+    return resultado[:limite]
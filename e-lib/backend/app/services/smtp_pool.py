@@ -0,0 +1,128 @@
+import queue
+import smtplib
+import threading
+
+# Erros de uma mensagem específica: a conexão continua utilizável
+ERROS_MENSAGEM = (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError)
+
+class PoolSMTP:
+    """Pool de conexões SMTP autenticadas, reaproveitadas entre envios.
+
+    Abrir a conexão, fazer STARTTLS e login custa várias idas e voltas ao
+    servidor; com o pool isso acontece uma vez por conexão, e cada conexão
+    envia muitas mensagens em sequência. Conexões derrubadas pelo servidor
+    (ex.: por inatividade) são refeitas e a mensagem é reenviada uma vez.
+    Depois de `mensagens_por_conexao` envios a conexão é renovada, já que
+    muitos servidores limitam as mensagens por sessão.
+    """
+
+    def __init__(self, servidor, porta, usuario='', senha='', tamanho=4, usar_tls=True,
+                 timeout=30, mensagens_por_conexao=100, fabrica=smtplib.SMTP):
+        self.servidor = servidor
+        self.porta = porta
+        self.usuario = usuario
+        self.senha = senha
+        self.usar_tls = usar_tls
+        self.timeout = timeout
+        self.mensagens_por_conexao = mensagens_por_conexao
+        self.fabrica = fabrica
+        # Conexões ociosas como (conexao, mensagens já enviadas); LIFO reaproveita a mais recente
+        self._livres = queue.LifoQueue()
+        self._vagas = threading.BoundedSemaphore(tamanho)
+
+    def _conectar(self):
+        conexao = self.fabrica(self.servidor, self.porta, timeout=self.timeout)
+        try:
+            conexao.ehlo()
+            if self.usar_tls:
+                conexao.starttls()
+                conexao.ehlo()
+            if self.usuario:
+                conexao.login(self.usuario, self.senha)
+        except Exception:
+            self._fechar(conexao)
+            raise
+        return conexao
+
+    @staticmethod
+    def _fechar(conexao):
+        if conexao is None:
+            return
+        try:
+            conexao.quit()
+        except Exception:
+            conexao.close()
+
+    def enviar_varios(self, mensagens):
+        """Envia as mensagens por uma única conexão do pool; retorna um booleano por mensagem.
+
+        Bloqueia enquanto todas as conexões do pool estiverem em uso. Se não
+        for possível reconectar, as mensagens restantes são dadas como não
+        enviadas.
+        """
+        resultados = []
+        with self._vagas:
+            try:
+                conexao, enviadas = self._livres.get_nowait()
+            except queue.Empty:
+                conexao, enviadas = None, 0
+            try:
+                for mensagem in mensagens:
+                    try:
+                        if conexao is None or enviadas >= self.mensagens_por_conexao:
+                            self._fechar(conexao)
+                            conexao, enviadas = None, 0
+                            conexao = self._conectar()
+                        conexao, enviadas, erro = self._enviar(conexao, enviadas, mensagem)
+                        if erro:
+                            print(f"❌ Email para {mensagem['To']} recusado: {erro}")
+                        resultados.append(erro is None)
+                    except OSError as e:
+                        # Sem conexão com o servidor: não adianta tentar as demais agora
+                        print(f"❌ Erro de conexão SMTP: {e}")
+                        self._fechar(conexao)
+                        conexao = None
+                        resultados.extend([False] * (len(mensagens) - len(resultados)))
+                        break
+            finally:
+                if conexao is not None:
+                    self._livres.put((conexao, enviadas))
+        return resultados
+
+    def _enviar(self, conexao, enviadas, mensagem):
+        """Envia uma mensagem, refazendo a conexão uma vez se o servidor a tiver derrubado.
+
+        Retorna (conexao, enviadas, erro): a conexão a usar daqui em diante
+        (a nova, se houve reconexão) e o erro de ERROS_MENSAGEM se a mensagem
+        foi recusada, ou None. Se o reenvio falhar por outro motivo, a nova
+        conexão é fechada antes de o erro ser propagado.
+        """
+        try:
+            conexao.send_message(mensagem)
+            return conexao, enviadas + 1, None
+        except ERROS_MENSAGEM as e:
+            return conexao, enviadas, e
+        except OSError:
+            self._fechar(conexao)
+        conexao, enviadas = self._conectar(), 0
+        try:
+            conexao.send_message(mensagem)
+        except ERROS_MENSAGEM as e:
+            return conexao, enviadas, e
+        except Exception:
+            self._fechar(conexao)
+            raise
+        return conexao, enviadas + 1, None
+
+    def enviar(self, mensagem):
+        """Envia uma mensagem; retorna True se o servidor a aceitou"""
+        return self.enviar_varios([mensagem])[0]
+
+    def fechar(self):
+        """Encerra as conexões ociosas"""
+        while True:
+            try:
+                conexao, _ = self._livres.get_nowait()
+            except queue.Empty:
+                return
+            self._fechar(conexao)
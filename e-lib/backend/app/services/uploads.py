@@ -0,0 +1,67 @@
+import os
+import shutil
+import tempfile
+from flask import Request
+
+# Acima deste tamanho o corpo da requisição é gravado em disco, como no Werkzeug
+TAMANHO_MAXIMO_EM_MEMORIA = 500 * 1024
+
+class ArquivoTemporario:
+    """Arquivo temporário com nome único, removido ao ser fechado a menos que `manter()` seja chamado.
+
+    Usado como destino dos uploads grandes: o Werkzeug grava o arquivo
+    enviado aqui uma única vez e uma rota pode assumir o arquivo (ex.: para
+    importá-lo em segundo plano) em vez de copiá-lo para outro lugar.
+    """
+
+    def __init__(self, sufixo=''):
+        fd, self.name = tempfile.mkstemp(suffix=sufixo)
+        self._arquivo = os.fdopen(fd, 'w+b')
+        self.mantido = False
+
+    def __getattr__(self, nome):
+        return getattr(self._arquivo, nome)
+
+    def __iter__(self):
+        return iter(self._arquivo)
+
+    def manter(self):
+        """Impede a remoção no close() e retorna o caminho do arquivo"""
+        self._arquivo.flush()
+        self.mantido = True
+        return self.name
+
+    def close(self):
+        self._arquivo.close()
+        if not self.mantido and os.path.exists(self.name):
+            os.remove(self.name)
+
+class RequisicaoUpload(Request):
+    """Request do Flask que grava uploads grandes em ArquivoTemporario"""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if total_content_length is None or total_content_length > TAMANHO_MAXIMO_EM_MEMORIA:
+            return ArquivoTemporario(os.path.splitext(filename or '')[1])
+        return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+
+def tamanho_upload(arquivo):
+    """Tamanho em bytes de um FileStorage, sem consumir o stream"""
+    arquivo.stream.seek(0, os.SEEK_END)
+    tamanho = arquivo.stream.tell()
+    arquivo.stream.seek(0)
+    return tamanho
+
+def assumir_upload(arquivo, sufixo=''):
+    """Retorna o caminho de um arquivo em disco com o conteúdo do upload, que passa a ser de quem chamou.
+
+    Se o Werkzeug já gravou o upload em um ArquivoTemporario, ele é mantido
+    e nenhuma cópia é feita; uploads pequenos, que ficam em memória, são
+    gravados em um arquivo temporário novo. Cabe a quem chamou remover o arquivo.
+    """
+    if isinstance(arquivo.stream, ArquivoTemporario):
+        return arquivo.stream.manter()
+    fd, caminho = tempfile.mkstemp(suffix=sufixo)
+    with os.fdopen(fd, 'wb') as destino:
+        arquivo.stream.seek(0)
+        shutil.copyfileobj(arquivo.stream, destino)
+    return caminho
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Script para medir a vazão do envio de emails com e sem o pool de conexões SMTP
+Uso: python benchmark_smtp.py [--mensagens N] [--conexoes N] [--lote N] [--latencia SEGUNDOS]
+
+Sobe um servidor SMTP local (aiosmtpd) que só conta as mensagens recebidas e
+compara uma conexão nova por email (como o envio comentado antigo) com o
+PoolSMTP, enviando em lotes de --lote mensagens como fazem os workers da
+caixa de saída (NOTIFICACOES_LOTE_ENVIO). A latência simula a ida e volta
+até um servidor remoto em cada comando SMTP. O aiosmtpd não é dependência da aplicação:
+    pip install aiosmtpd
+"""
+
+import argparse
+import asyncio
+import smtplib
+import socket
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.mime.text import MIMEText
+from app.services.smtp_pool import PoolSMTP
+
+try:
+    from aiosmtpd.controller import Controller
+    from aiosmtpd.smtp import SMTP as ServidorSMTP
+except ImportError:
+    print("❌ aiosmtpd não instalado. Execute: pip install aiosmtpd")
+    sys.exit(1)
+
+class ContadorMensagens:
+    def __init__(self):
+        self.recebidas = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        self.recebidas += 1
+        return '250 OK'
+
+class ServidorComLatencia(ServidorSMTP):
+    """Servidor que atrasa a resposta a cada comando, como um servidor remoto"""
+    latencia = 0
+
+    async def push(self, status):
+        if self.latencia:
+            await asyncio.sleep(self.latencia)
+        return await super().push(status)
+
+class ControladorComLatencia(Controller):
+    def factory(self):
+        return ServidorComLatencia(self.handler, **self.SMTP_kwargs)
+
+def porta_livre():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def criar_mensagens(quantidade):
+    mensagens = []
+    for i in range(quantidade):
+        msg = MIMEText(f"Notificação {i}", 'plain', 'utf-8')
+        msg['From'] = 'simplelib@localhost'
+        msg['To'] = f"inscrito{i}@localhost"
+        msg['Subject'] = "Novo artigo publicado"
+        mensagens.append(msg)
+    return mensagens
+
+def enviar_sem_pool(host, porta, msg):
+    """Uma conexão (EHLO, envio, QUIT) por email"""
+    with smtplib.SMTP(host, porta) as servidor:
+        servidor.send_message(msg)
+
+def medir(nome, enviar, mensagens, threads):
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(enviar, mensagens))
+    duracao = time.perf_counter() - inicio
+    print(f"{nome:<28} {len(mensagens):>6} msgs  {duracao:>7.2f}s  {len(mensagens) / duracao:>8.1f} msgs/s")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark do envio de emails')
+    parser.add_argument('--mensagens', type=int, default=500)
+    parser.add_argument('--conexoes', type=int, default=4)
+    parser.add_argument('--lote', type=int, default=20)
+    parser.add_argument('--latencia', type=float, default=0.005)
+    args = parser.parse_args()
+
+    ServidorComLatencia.latencia = args.latencia
+    contador = ContadorMensagens()
+    host, porta = '127.0.0.1', porta_livre()
+    controlador = ControladorComLatencia(contador, hostname=host, port=porta)
+    controlador.start()
+    print(f"📧 Servidor SMTP local em {host}:{porta} (latência {args.latencia * 1000:.0f} ms por comando)")
+
+    try:
+        mensagens = criar_mensagens(args.mensagens)
+        medir("Conexão por email", lambda msg: enviar_sem_pool(host, porta, msg),
+              mensagens, args.conexoes)
+
+        pool = PoolSMTP(host, porta, tamanho=args.conexoes, usar_tls=False)
+        medir("Pool (uma mensagem/chamada)", pool.enviar, mensagens, args.conexoes)
+
+        # Lotes como os da drenagem da caixa de saída: cada chamada envia várias mensagens pela mesma conexão
+        lotes = [mensagens[i:i + args.lote] for i in range(0, len(mensagens), args.lote)]
+        inicio = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.conexoes) as executor:
+            list(executor.map(pool.enviar_varios, lotes))
+        duracao = time.perf_counter() - inicio
+        nome = f"Pool (lotes de {args.lote})"
+        print(f"{nome:<28} {len(mensagens):>6} msgs  {duracao:>7.2f}s  {len(mensagens) / duracao:>8.1f} msgs/s")
+        pool.fechar()
+
+        print(f"✅ Mensagens recebidas pelo servidor: {contador.recebidas}")
+    finally:
+        controlador.stop()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Script para aplicar migrações versionadas e criar os índices do banco de dados
+Uso: python migrar_banco.py [--status]
+"""
+
+import sys
+from app.services.connection import mongo
+from app.services.indices import (
+    MIGRACOES, INDICES, registros_migracoes, reserva_expirada, inicializar_banco
+)
+
+def mostrar_status():
+    """Lista as migrações registradas e os índices declarados"""
+    registros = registros_migracoes()
+    print('📋 Migrações:')
+    for m in MIGRACOES:
+        registro = registros.get(m['versao'], {})
+        detalhe = ''
+        if registro.get('status') == 'concluida':
+            marca = '✅'
+        elif reserva_expirada(registro):
+            marca = '⚠️ '
+            detalhe = f" (abandonada desde {registro['iniciada_em']:%Y-%m-%d %H:%M}; será retomada)"
+        elif registro.get('status') == 'em_andamento':
+            marca = '🔄'
+            detalhe = f" (em andamento desde {registro['iniciada_em']:%Y-%m-%d %H:%M})"
+        else:
+            marca = '⏳'
+        print(f"  {marca} {m['versao']:>3} - {m['descricao']}{detalhe}")
+    
+    print('\n📋 Índices declarados:')
+    for nome_colecao, indices in INDICES.items():
+        existentes = mongo.get_collection(nome_colecao).index_information()
+        for indice in indices:
+            nome_indice = indice.document['name']
+            marca = '✅' if nome_indice in existentes else '⏳'
+            print(f"  {marca} {nome_colecao}.{nome_indice}")
+
+def migrar():
+    """Aplica migrações pendentes e garante os índices"""
+    resultado = inicializar_banco()
+    if resultado is None:
+        return False
+    
+    print(f"✅ Migrações aplicadas: {resultado['migracoes_aplicadas'] or 'nenhuma pendente'}")
+    print(f"✅ Índices garantidos: {len(resultado['criados'])}")
+    for erro in resultado['erros']:
+        print(f"❌ {erro['indice']}: {erro['error']}")
+    return not resultado['erros']
+
+if __name__ == '__main__':
+    print('='*60)
+    print('🔧 Migrações e índices do banco de dados')
+    print('='*60)
+    print()
+    
+    try:
+        if '--status' in sys.argv:
+            mostrar_status()
+            sys.exit(0)
+        sys.exit(0 if migrar() else 1)
+    except Exception as e:
+        print(f'❌ Erro: {e}')
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
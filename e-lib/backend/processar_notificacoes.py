@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Script para processar a caixa de saída de notificações fora do servidor web
+Uso: python processar_notificacoes.py [--uma-vez]
+
+Útil quando o servidor roda com NOTIFICACOES_WORKERS=0: a API só grava as
+notificações na coleção caixa_saida e este processo faz a distribuição e o
+envio dos emails, com as mesmas regras de novas tentativas.
+"""
+
+import sys
+import time
+from app.services.caixa_saida import drenar, INTERVALO_VERIFICACAO
+
+def processar(uma_vez=False):
+    """Drena a caixa de saída; sem --uma-vez, verifica de novo a cada INTERVALO_VERIFICACAO segundos"""
+    while True:
+        processados = drenar()
+        if processados:
+            print(f"📧 {processados} item(ns) da caixa de saída processado(s)")
+        if uma_vez:
+            return processados
+        time.sleep(INTERVALO_VERIFICACAO)
+
+if __name__ == '__main__':
+    try:
+        processar(uma_vez='--uma-vez' in sys.argv)
+    except KeyboardInterrupt:
+        print("\nEncerrado")
@@ -4,9 +4,12 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from app import create_app
 
-app = create_app()
-
+# A aplicação só é criada ao executar este arquivo: os processos do parse paralelo
+# de BibTeX (iniciados com 'spawn') reimportam este módulo como __mp_main__ e não
+# devem conectar ao banco, aplicar migrações nem iniciar os workers de notificação.
+# O `flask run` (FLASK_APP=run.py) encontra a fábrica create_app sozinho.
 if __name__ == '__main__':
+    app = create_app()
     host = os.environ.get('HOST', '127.0.0.1')
     port = int(os.environ.get('PORT', 5000))
     app.run(host=host, port=port, debug=True)
@@ -70,7 +70,7 @@ def sample_edicao():
     
     # Criar edição
     edicao_result = edicoes_collection.insert_one({
-        'evento_id': str(evento_result.inserted_id),
+        'evento_id': evento_result.inserted_id,
         'ano': 2024,
         'local': 'Brasília',
         'data_inicio': '2024-09-01',
@@ -94,7 +94,7 @@ def sample_artigo(sample_edicao):
             {'nome': 'João Silva', 'email': 'joao@exemplo.com'},
             {'nome': 'Maria Santos', 'email': 'maria@exemplo.com'}
         ],
-        'edicao_id': sample_edicao,
+        'edicao_id': ObjectId(sample_edicao),
         'resumo': 'Este é um resumo de teste',
         'keywords': ['teste', 'integração', 'software']
     })
@@ -123,7 +123,7 @@ class TestArtigosRoutes:
             {
                 'titulo': 'Artigo 1',
                 'autores': [{'nome': 'Autor 1', 'email': 'autor1@exemplo.com'}],
-                'edicao_id': sample_edicao,
+                'edicao_id': ObjectId(sample_edicao),
                 'resumo': 'Resumo 1',
                 'keywords': ['keyword1']
             },
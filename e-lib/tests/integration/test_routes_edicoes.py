@@ -71,7 +71,7 @@ def sample_edicao(sample_evento):
     """Cria uma edição de exemplo no banco"""
     edicoes_collection = mongo.get_collection('edicoes')
     result = edicoes_collection.insert_one({
-        'evento_id': sample_evento,
+        'evento_id': ObjectId(sample_evento),
         'ano': 2024,
         'local': 'Brasília',
         'data_inicio': '2024-09-01',
@@ -100,7 +100,7 @@ class TestEdicoesRoutes:
         edicoes_collection = mongo.get_collection('edicoes')
         edicoes_collection.insert_many([
             {
-                'evento_id': sample_evento,
+                'evento_id': ObjectId(sample_evento),
                 'ano': 2023,
                 'local': 'São Paulo',
                 'data_inicio': '2023-09-01',
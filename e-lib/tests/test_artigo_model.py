@@ -13,7 +13,9 @@ from bson import ObjectId
 # Adiciona o caminho do backend ao sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
 
-from app.models.artigo import Artigo
+from pymongo.errors import DuplicateKeyError
+from app.models.artigo import Artigo, normalizar_titulo, hash_titulo
+from app.services.similaridade import assinatura, BANDAS
 
 
 class TestArtigoModel(unittest.TestCase):
@@ -611,6 +613,66 @@ class TestArtigoModel(unittest.TestCase):
         self.assertTrue(any("Erro ao salvar artigo no MongoDB" in str(call) 
                            for call in mock_print.call_args_list))
     
+    @patch('app.models.artigo.mongo.get_collection')
+    def test_save_grava_hash_do_titulo(self, mock_get_collection):
+        """Testa se save() grava o hash do título normalizado"""
+        # Arrange
+        artigo = Artigo(titulo=self.test_titulo, autores=self.test_autores, edicao_id=self.test_edicao_id)
+        mock_collection = MagicMock()
+        mock_get_collection.return_value = mock_collection
+        
+        # Act
+        artigo.save()
+        
+        # Assert
+        call_args = mock_collection.insert_one.call_args[0][0]
+        self.assertEqual(call_args['titulo_hash'], hash_titulo(self.test_titulo))
+    
+    @patch('app.models.artigo.mongo.get_collection')
+    def test_save_propaga_duplicate_key_error(self, mock_get_collection):
+        """Testa se save() propaga a violação do índice único de título"""
+        # Arrange
+        artigo = Artigo(titulo=self.test_titulo, autores=self.test_autores, edicao_id=self.test_edicao_id)
+        mock_collection = MagicMock()
+        mock_collection.insert_one.side_effect = DuplicateKeyError('duplicate key', 11000)
+        mock_get_collection.return_value = mock_collection
+        
+        # Act & Assert
+        with self.assertRaises(DuplicateKeyError):
+            artigo.save()
+    
+    @patch('app.models.artigo.mongo.get_collection')
+    def test_save_grava_assinatura_minhash(self, mock_get_collection):
+        """Testa se save() grava a assinatura MinHash e os baldes LSH do título e resumo"""
+        # Arrange
+        artigo = Artigo(titulo=self.test_titulo, autores=self.test_autores,
+                        edicao_id=self.test_edicao_id, resumo=self.test_resumo)
+        mock_collection = MagicMock()
+        mock_get_collection.return_value = mock_collection
+        
+        # Act
+        artigo.save()
+        
+        # Assert
+        call_args = mock_collection.insert_one.call_args[0][0]
+        self.assertEqual(call_args['minhash'], assinatura(self.test_titulo, self.test_resumo))
+        self.assertEqual(len(call_args['lsh_baldes']), BANDAS)
+    
+    # ==================== TESTES DE normalizar_titulo() ====================
+    
+    def test_normalizar_titulo_ignora_caixa_espacos_e_latex(self):
+        """Testa se variações triviais do título têm a mesma forma normalizada"""
+        # Arrange, Act & Assert
+        self.assertEqual(normalizar_titulo('Deep {L}earning  for \\textit{Code}.'), 'deep learning for code')
+        self.assertEqual(normalizar_titulo("An\\'{a}lise de Requisitos"), 'analise de requisitos')
+        self.assertEqual(hash_titulo('DEEP LEARNING FOR CODE'), hash_titulo('Deep {L}earning  for \\textit{Code}.'))
+    
+    def test_hash_titulo_vazio_retorna_none(self):
+        """Testa se títulos vazios (ou só com chaves) não têm hash"""
+        # Arrange, Act & Assert
+        self.assertIsNone(hash_titulo(''))
+        self.assertIsNone(hash_titulo('{}'))
+    
     # ==================== TESTES COM MOCKS - find_by_edicao() ====================
     
     @patch('app.models.artigo.mongo.get_collection')
@@ -832,6 +894,21 @@ class TestArtigoModel(unittest.TestCase):
         self.assertIsInstance(call_args[0]['_id'], ObjectId)
         self.assertEqual(call_args[1], {'$set': update_data})
     
+    @patch('app.models.artigo.mongo.get_collection')
+    def test_update_recalcula_termos_com_titulo_atual(self, mock_get_collection):
+        """Testa se alterar só os autores recalcula os termos de busca com o título gravado"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_collection.find_one.return_value = {'titulo': 'Redes Neurais', 'autores': []}
+        mock_get_collection.return_value = mock_collection
+        
+        # Act
+        Artigo.update(str(ObjectId()), {'autores': [{'nome': 'Ana Silva'}]})
+        
+        # Assert
+        atualizacao = mock_collection.update_one.call_args[0][1]['$set']
+        self.assertEqual(atualizacao['termos'], ['ana', 'neurais', 'redes', 'silva'])
+    
     @patch('app.models.artigo.mongo.get_collection')
     def test_update_returns_none_on_exception(self, mock_get_collection):
         """Testa se update() retorna None quando ocorre exceção"""
@@ -862,6 +939,37 @@ class TestArtigoModel(unittest.TestCase):
         self.assertTrue(any("Erro ao atualizar artigo" in str(call) 
                            for call in mock_print.call_args_list))
     
+    @patch('app.models.artigo.mongo.get_collection')
+    def test_update_recalcula_hash_do_titulo(self, mock_get_collection):
+        """Testa se update() atualiza o hash quando o título muda"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_get_collection.return_value = mock_collection
+        
+        # Act
+        Artigo.update(str(ObjectId()), {'titulo': 'Novo Título'})
+        
+        # Assert
+        alteracao = mock_collection.update_one.call_args[0][1]['$set']
+        self.assertEqual(alteracao['titulo_hash'], hash_titulo('Novo Título'))
+    
+    @patch('app.models.artigo.mongo.get_collection')
+    def test_atualizar_similaridade_recalcula_a_partir_do_banco(self, mock_get_collection):
+        """Testa se atualizar_similaridade() usa o título e o resumo gravados"""
+        # Arrange
+        artigo_id = ObjectId()
+        mock_collection = MagicMock()
+        mock_collection.find_one.return_value = {'_id': artigo_id, 'titulo': self.test_titulo, 'resumo': self.test_resumo}
+        mock_get_collection.return_value = mock_collection
+        
+        # Act
+        Artigo.atualizar_similaridade(str(artigo_id))
+        
+        # Assert
+        filtro, alteracao = mock_collection.update_one.call_args[0]
+        self.assertEqual(filtro, {'_id': artigo_id})
+        self.assertEqual(alteracao['$set']['minhash'], assinatura(self.test_titulo, self.test_resumo))
+    
     # ==================== TESTES COM MOCKS - delete() ====================
     
     @patch('app.models.artigo.mongo.get_collection')
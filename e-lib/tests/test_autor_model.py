@@ -7,11 +7,13 @@ import unittest
 import sys
 import os
 from datetime import datetime
+from unittest.mock import patch, MagicMock
+from bson import ObjectId
 
 # Adiciona o caminho do backend ao sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
 
-from app.models.autor import Autor
+from app.models.autor import Autor, normalizar_nome
 
 
 class TestAutorModel(unittest.TestCase):
@@ -310,6 +312,87 @@ class TestAutorModel(unittest.TestCase):
             # Assert
             self.assertEqual(autor.email, email)
             self.assertEqual(autor.to_dict()['email'], email)
+    
+    # ==================== TESTES DE normalizar_nome() ====================
+    
+    def test_normalizar_nome_remove_acentos_caixa_e_espacos(self):
+        """Testa se nomes equivalentes geram a mesma chave"""
+        # Arrange & Act & Assert
+        self.assertEqual(normalizar_nome("  João   SILVA "), "joao silva")
+        self.assertEqual(normalizar_nome("Joao Silva"), normalizar_nome("JOÃO silva"))
+    
+    def test_normalizar_nome_aceita_none(self):
+        """Testa se normalizar_nome lida com nome ausente"""
+        # Arrange & Act & Assert
+        self.assertEqual(normalizar_nome(None), "")
+    
+    # ==================== TESTES COM MOCKS - coleção de autores ====================
+    
+    @patch('app.models.autor.mongo.get_collection')
+    def test_registrar_artigos_faz_um_upsert_por_autor_distinto(self, mock_get_collection):
+        """Testa se artigos do mesmo autor são agrupados em um único upsert"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_get_collection.return_value = mock_collection
+        artigo1, artigo2 = ObjectId(), ObjectId()
+        artigos = [
+            (artigo1, [{'nome': 'João Silva'}, {'nome': 'Maria Santos'}]),
+            (artigo2, [{'nome': 'JOÃO SILVA'}])
+        ]
+        
+        # Act
+        Autor.registrar_artigos(artigos)
+        
+        # Assert
+        mock_get_collection.assert_called_once_with('autores')
+        operacoes = mock_collection.bulk_write.call_args[0][0]
+        self.assertEqual(len(operacoes), 2)
+        joao = next(op for op in operacoes if op._filter == {'nome_normalizado': 'joao silva'})
+        self.assertEqual(joao._doc['$addToSet']['artigos']['$each'], [artigo1, artigo2])
+        self.assertTrue(joao._upsert)
+    
+    @patch('app.models.autor.mongo.get_collection')
+    def test_registrar_artigos_sem_autores_nao_escreve(self, mock_get_collection):
+        """Testa se nenhuma escrita é feita quando não há autores"""
+        # Arrange & Act
+        result = Autor.registrar_artigos([(ObjectId(), [])])
+        
+        # Assert
+        self.assertIsNone(result)
+        mock_get_collection.assert_not_called()
+    
+    @patch('app.models.autor.mongo.get_collection')
+    def test_remover_artigos_apaga_autores_sem_artigos(self, mock_get_collection):
+        """Testa se a remoção retira o artigo e apaga autores que ficaram vazios"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_get_collection.return_value = mock_collection
+        artigo_id = ObjectId()
+        
+        # Act
+        Autor.remover_artigos([(artigo_id, [{'nome': 'Maria Santos'}])])
+        
+        # Assert
+        operacao = mock_collection.bulk_write.call_args[0][0][0]
+        self.assertEqual(operacao._doc, {'$pullAll': {'artigos': [artigo_id]}})
+        mock_collection.delete_many.assert_called_once_with(
+            {'nome_normalizado': {'$in': ['maria santos']}, 'artigos': {'$size': 0}}
+        )
+    
+    @patch('app.models.autor.mongo.get_collection')
+    def test_find_by_nome_usa_chave_normalizada(self, mock_get_collection):
+        """Testa se find_by_nome consulta pelo nome normalizado"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_collection.find_one.return_value = {'_id': ObjectId(), 'nome': 'João Silva'}
+        mock_get_collection.return_value = mock_collection
+        
+        # Act
+        autor = Autor.find_by_nome('JOÃO  Silva')
+        
+        # Assert
+        mock_collection.find_one.assert_called_once_with({'nome_normalizado': 'joao silva'})
+        self.assertIsInstance(autor['_id'], str)
 
 
 if __name__ == '__main__':
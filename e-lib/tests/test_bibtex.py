@@ -0,0 +1,144 @@
+"""
+Testes unitários para o parser BibTeX incremental
+Testa a divisão do arquivo em entradas e o parse em lotes sem carregar o arquivo inteiro
+"""
+
+import unittest
+import sys
+import os
+import io
+from unittest.mock import MagicMock
+
+# Adiciona o caminho do backend ao sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+import bibtexparser
+from app.services.bibtex import dividir_entradas, ler_entradas_em_lotes, ler_entradas
+
+
+BIBTEX_EXEMPLO = """
+% Comentário com @ fora das entradas
+@string{sbes = "Simpósio Brasileiro de Engenharia de Software"}
+
+@inproceedings{silva2024,
+  title={Testes {Automatizados} em Python},
+  author={Silva, João and Santos, Maria},
+  booktitle=sbes,
+  year={2024}
+}
+
+@article(costa2023,
+  title={Arquiteturas (e padrões)},
+  author={Costa, Pedro},
+  year={2023}
+)
+"""
+
+
+class TestBibtex(unittest.TestCase):
+    """Suite de testes unitários para o parser BibTeX incremental"""
+    
+    # ==================== TESTES DE dividir_entradas() ====================
+    
+    def test_dividir_entradas_reconhece_chaves_e_parenteses(self):
+        """Testa se blocos @tipo{...} e @tipo(...) são separados corretamente"""
+        # Arrange & Act
+        blocos = list(dividir_entradas(io.StringIO(BIBTEX_EXEMPLO)))
+        
+        # Assert
+        self.assertEqual([tipo for tipo, _ in blocos], ['string', 'inproceedings', 'article'])
+        self.assertTrue(blocos[1][1].startswith('@inproceedings{silva2024'))
+        self.assertTrue(blocos[2][1].endswith(')'))
+    
+    def test_dividir_entradas_independe_do_tamanho_do_bloco(self):
+        """Testa se entradas que atravessam blocos de leitura são montadas inteiras"""
+        # Arrange
+        esperado = list(dividir_entradas(io.StringIO(BIBTEX_EXEMPLO)))
+        
+        # Act
+        blocos = list(dividir_entradas(io.StringIO(BIBTEX_EXEMPLO), tamanho_bloco=5))
+        
+        # Assert
+        self.assertEqual(blocos, esperado)
+    
+    def test_dividir_entradas_ignora_entrada_incompleta(self):
+        """Testa se uma entrada sem fechamento no fim do arquivo não é gerada"""
+        # Arrange & Act
+        blocos = list(dividir_entradas(io.StringIO('@article{a, title={X}}\n@article{b, title={Y}')))
+        
+        # Assert
+        self.assertEqual(len(blocos), 1)
+    
+    # ==================== TESTES DE ler_entradas_em_lotes() ====================
+    
+    def test_ler_entradas_em_lotes_equivale_ao_parse_completo(self):
+        """Testa se o parse em lotes produz as mesmas entradas do bibtexparser.loads"""
+        # Arrange
+        esperado = bibtexparser.loads(BIBTEX_EXEMPLO).entries
+        
+        # Act
+        lotes = list(ler_entradas_em_lotes(io.StringIO(BIBTEX_EXEMPLO), tamanho_lote=1))
+        
+        # Assert
+        self.assertEqual(len(lotes), 2)
+        self.assertEqual([e for lote in lotes for e in lote], esperado)
+    
+    def test_ler_entradas_em_lotes_expande_macros(self):
+        """Testa se macros @string definidas antes continuam valendo nos lotes seguintes"""
+        # Arrange & Act
+        entradas = [e for lote in ler_entradas_em_lotes(io.StringIO(BIBTEX_EXEMPLO), tamanho_lote=1) for e in lote]
+        
+        # Assert
+        self.assertEqual(entradas[0]['booktitle'], 'Simpósio Brasileiro de Engenharia de Software')
+    
+    def test_ler_entradas_em_lotes_pula_entradas_mantendo_macros(self):
+        """Testa se as entradas puladas não são parseadas e as macros anteriores continuam valendo"""
+        # Arrange
+        texto = BIBTEX_EXEMPLO + BIBTEX_EXEMPLO.replace('silva2024', 'silva2025')
+        
+        # Act
+        entradas = [e for lote in ler_entradas_em_lotes(io.StringIO(texto), pular=2) for e in lote]
+        
+        # Assert
+        self.assertEqual([e['ID'] for e in entradas], ['silva2025', 'costa2023'])
+        self.assertEqual(entradas[0]['booktitle'], 'Simpósio Brasileiro de Engenharia de Software')
+    
+    def test_ler_entradas_em_lotes_informa_entradas_consumidas(self):
+        """Testa se ao_ler recebe as entradas do arquivo de cada lote, incluindo as descartadas pelo parser"""
+        # Arrange
+        texto = '@online{a, title={A}}\n@article{b, title={B}}\n@article{c, title={C}}'
+        ao_ler = MagicMock()
+
+        # Act
+        lotes = list(ler_entradas_em_lotes(io.StringIO(texto), tamanho_lote=2, ao_ler=ao_ler))
+
+        # Assert
+        self.assertEqual([[e['ID'] for e in lote] for lote in lotes], [['b'], ['c']])
+        self.assertEqual([c.args for c in ao_ler.call_args_list], [(2,), (1,)])
+
+    def test_ler_entradas_em_lotes_arquivo_vazio(self):
+        """Testa se um arquivo sem entradas não gera lotes"""
+        # Arrange & Act
+        lotes = list(ler_entradas_em_lotes(io.StringIO('apenas texto')))
+        
+        # Assert
+        self.assertEqual(lotes, [])
+
+    
+    # ==================== TESTES DE ler_entradas() ====================
+    
+    def test_ler_entradas_em_paralelo_preserva_a_ordem(self):
+        """Testa se o parse em processos devolve os mesmos lotes, na ordem do arquivo"""
+        # Arrange
+        texto = BIBTEX_EXEMPLO * 3
+        esperado = list(ler_entradas_em_lotes(io.StringIO(texto), tamanho_lote=1))
+        
+        # Act
+        lotes = list(ler_entradas(io.StringIO(texto), processos=2, tamanho_lote=1))
+        
+        # Assert
+        self.assertEqual(lotes, esperado)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
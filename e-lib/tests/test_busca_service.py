@@ -0,0 +1,301 @@
+"""
+Testes unitários para o serviço de busca de artigos
+Testa a montagem dos filtros, a paginação e o enriquecimento com mocks do MongoDB
+"""
+
+import unittest
+import sys
+import os
+from unittest.mock import patch, MagicMock
+
+# Adiciona o caminho do backend ao sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+from bson import ObjectId
+from app.services.busca_service import (
+    filtro_texto, filtro_eventos, filtro_busca, regex_literal, enriquecer_artigos,
+    filtro_prefixos, termos_busca,
+    ler_limite, codificar_cursor, decodificar_cursor, buscar_pagina, contar_resultados,
+    LIMITE_PADRAO, LIMITE_MAXIMO
+)
+
+
+class TestBuscaService(unittest.TestCase):
+    """Suite de testes unitários para o serviço de busca"""
+
+    # ==================== TESTES DE filtro_texto() ====================
+
+    def test_filtro_texto_tudo_une_text_e_prefixos(self):
+        """Testa se a busca 'tudo' une o índice de texto e a busca por prefixo"""
+        # Arrange & Act
+        filtro = filtro_texto('sistemas', 'tudo')
+
+        # Assert
+        self.assertEqual(filtro['$or'][0], {'$text': {'$search': 'sistemas'}})
+        self.assertEqual(filtro['$or'][1]['termos'].pattern, '^sistemas')
+
+    def test_filtro_texto_termos_curtos_usam_apenas_text(self):
+        """Testa se consultas só com palavras curtas não geram busca por prefixo"""
+        # Arrange & Act
+        filtro = filtro_texto('de', 'tudo')
+
+        # Assert
+        self.assertEqual(filtro, {'$text': {'$search': 'de'}})
+
+    def test_filtro_texto_titulo_restringe_ao_campo(self):
+        """Testa se a busca por título restringe os candidatos ao campo titulo"""
+        # Arrange & Act
+        filtro = filtro_texto('Sistemas', 'titulo')
+
+        # Assert
+        self.assertIn('$or', filtro)
+        self.assertEqual(filtro['titulo'], {'$regex': 'Sistemas', '$options': 'i'})
+
+    def test_filtro_texto_autor_restringe_ao_campo(self):
+        """Testa se a busca por autor restringe os candidatos a autores.nome"""
+        # Arrange & Act
+        filtro = filtro_texto('Silva', 'autor')
+
+        # Assert
+        self.assertIn('$or', filtro)
+        self.assertIn('autores.nome', filtro)
+
+    # ==================== TESTES DE busca por prefixo ====================
+
+    def test_filtro_prefixos_encontra_palavra_parcial(self):
+        """Testa se "Sil" vira uma regex ancorada sobre os termos normalizados"""
+        # Arrange & Act
+        filtro = filtro_prefixos('Sil')
+
+        # Assert
+        self.assertEqual(filtro['termos'].pattern, '^sil')
+        self.assertTrue(filtro['termos'].match('silva'))
+
+    def test_filtro_prefixos_exige_todas_as_palavras(self):
+        """Testa se cada palavra da consulta precisa prefixar algum termo"""
+        # Arrange & Act
+        filtro = filtro_prefixos('Análi de Sist.*')
+
+        # Assert
+        padroes = [r.pattern for r in filtro['termos']['$all']]
+        self.assertEqual(padroes, ['^anali', '^sist'])
+
+    def test_termos_busca_normaliza_titulo_e_autores(self):
+        """Testa se os termos juntam palavras distintas do título e dos autores, sem acentos"""
+        # Arrange & Act
+        termos = termos_busca('Computação em Nuvem', [{'nome': 'João Silva'}, 'Maria Souza'])
+
+        # Assert
+        self.assertEqual(termos, ['computacao', 'em', 'joao', 'maria', 'nuvem', 'silva', 'souza'])
+
+    def test_regex_literal_escapa_caracteres_especiais(self):
+        """Testa se a consulta é tratada como texto literal na regex"""
+        # Arrange & Act
+        regex = regex_literal('C++ (2024)')
+
+        # Assert
+        self.assertEqual(regex['$regex'], r'C\+\+\ \(2024\)')
+
+    def test_filtro_eventos_busca_nome_e_sigla(self):
+        """Testa se o filtro de eventos considera nome e sigla"""
+        # Arrange & Act
+        filtro = filtro_eventos('SBES')
+
+        # Assert
+        campos = [list(clausula.keys())[0] for clausula in filtro['$or']]
+        self.assertEqual(campos, ['nome', 'sigla'])
+
+    # ==================== TESTES DE filtro_busca() ====================
+
+    def _mock_colecoes(self, mock_get_collection, eventos, edicoes):
+        mock_eventos = MagicMock()
+        mock_eventos.find.return_value = eventos
+        mock_edicoes = MagicMock()
+        mock_edicoes.find.return_value = edicoes
+        mock_get_collection.side_effect = lambda nome: {'eventos': mock_eventos, 'edicoes': mock_edicoes}[nome]
+        return mock_eventos, mock_edicoes
+
+    @patch('app.services.busca_service.mongo.get_collection')
+    def test_filtro_busca_tudo_compila_um_unico_or(self, mock_get_collection):
+        """Testa se a busca 'tudo' vira um único $or entre texto e edições do evento"""
+        # Arrange
+        edicao_id = ObjectId()
+        self._mock_colecoes(mock_get_collection, [{'_id': ObjectId()}], [{'_id': edicao_id}])
+
+        # Act
+        filtro = filtro_busca('SBES', 'tudo')
+
+        # Assert
+        self.assertEqual(len(filtro['$or']), 3)
+        self.assertIn('$text', filtro['$or'][0])
+        self.assertIn('termos', filtro['$or'][1])
+        self.assertIn(edicao_id, filtro['$or'][2]['edicao_id']['$in'])
+
+    @patch('app.services.busca_service.mongo.get_collection')
+    def test_filtro_busca_tudo_sem_evento_usa_apenas_texto(self, mock_get_collection):
+        """Testa se, sem eventos correspondentes, a busca 'tudo' usa só o índice de texto"""
+        # Arrange
+        _, mock_edicoes = self._mock_colecoes(mock_get_collection, [], [])
+
+        # Act
+        filtro = filtro_busca('distribuídos', 'tudo')
+
+        # Assert
+        self.assertEqual(filtro['$or'][0], {'$text': {'$search': 'distribuídos'}})
+        self.assertEqual(filtro['$or'][1]['termos'].pattern, '^distribuidos')
+        mock_edicoes.find.assert_not_called()
+
+    @patch('app.services.busca_service.mongo.get_collection')
+    def test_filtro_busca_titulo_nao_consulta_eventos(self, mock_get_collection):
+        """Testa se buscas por título não resolvem eventos"""
+        # Arrange & Act
+        filtro = filtro_busca('Sistemas', 'titulo')
+
+        # Assert
+        self.assertIn('titulo', filtro)
+        mock_get_collection.assert_not_called()
+
+    # ==================== TESTES DE paginação ====================
+
+    def test_ler_limite_usa_padrao_e_maximo(self):
+        """Testa se o limite tem valor padrão e é truncado no máximo"""
+        # Arrange, Act & Assert
+        self.assertEqual(ler_limite(None), LIMITE_PADRAO)
+        self.assertEqual(ler_limite('10'), 10)
+        self.assertEqual(ler_limite('100000'), LIMITE_MAXIMO)
+
+    def test_ler_limite_rejeita_valores_invalidos(self):
+        """Testa se limites não positivos ou não numéricos são rejeitados"""
+        # Arrange, Act & Assert
+        with self.assertRaises(ValueError):
+            ler_limite('0')
+        with self.assertRaises(ValueError):
+            ler_limite('abc')
+
+    def test_cursor_ida_e_volta(self):
+        """Testa se o cursor codificado devolve o mesmo ObjectId"""
+        # Arrange
+        artigo_id = ObjectId()
+
+        # Act
+        cursor = codificar_cursor(artigo_id)
+
+        # Assert
+        self.assertEqual(decodificar_cursor(cursor), artigo_id)
+
+    def test_decodificar_cursor_invalido_lanca_value_error(self):
+        """Testa se cursores adulterados geram ValueError"""
+        # Arrange, Act & Assert
+        with self.assertRaises(ValueError):
+            decodificar_cursor('nao-e-um-cursor')
+
+    @patch('app.services.busca_service.mongo.get_collection')
+    def test_buscar_pagina_retorna_proximo_cursor(self, mock_get_collection):
+        """Testa se a página cheia devolve o cursor do último artigo"""
+        # Arrange
+        ids = sorted([ObjectId() for _ in range(3)], reverse=True)
+        mock_collection = MagicMock()
+        mock_collection.find.return_value.sort.return_value.limit.return_value = [{'_id': i} for i in ids]
+        mock_get_collection.return_value = mock_collection
+
+        # Act
+        artigos, proximo = buscar_pagina({'$text': {'$search': 'x'}}, 2)
+
+        # Assert
+        self.assertEqual(len(artigos), 2)
+        self.assertEqual(decodificar_cursor(proximo), ids[1])
+        mock_collection.find.return_value.sort.return_value.limit.assert_called_once_with(3)
+
+    @patch('app.services.busca_service.mongo.get_collection')
+    def test_buscar_pagina_aplica_keyset_do_cursor(self, mock_get_collection):
+        """Testa se o cursor vira uma condição _id < último visto"""
+        # Arrange
+        ultimo = ObjectId()
+        mock_collection = MagicMock()
+        mock_collection.find.return_value.sort.return_value.limit.return_value = []
+        mock_get_collection.return_value = mock_collection
+
+        # Act
+        artigos, proximo = buscar_pagina({'titulo': 'x'}, 10, codificar_cursor(ultimo))
+
+        # Assert
+        filtro = mock_collection.find.call_args[0][0]
+        self.assertEqual(filtro['$and'][1], {'_id': {'$lt': ultimo}})
+        self.assertIsNone(proximo)
+
+    @patch('app.services.busca_service.mongo.get_collection')
+    def test_contar_resultados_dispensa_contagem_em_pagina_unica(self, mock_get_collection):
+        """Testa se o total vem da própria página quando não há outras páginas"""
+        # Act
+        total = contar_resultados({'titulo': 'x'}, [{'_id': 1}, {'_id': 2}])
+
+        # Assert
+        self.assertEqual(total, 2)
+        mock_get_collection.assert_not_called()
+
+    @patch('app.services.busca_service.mongo.get_collection')
+    def test_contar_resultados_conta_no_banco_quando_ha_mais_paginas(self, mock_get_collection):
+        """Testa se o total é o número de artigos encontrados, não o tamanho da página"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_collection.count_documents.return_value = 120
+        mock_get_collection.return_value = mock_collection
+        filtro = {'$text': {'$search': 'x'}}
+
+        # Act
+        total = contar_resultados(filtro, [{'_id': 1}], proximo_cursor='abc')
+
+        # Assert
+        self.assertEqual(total, 120)
+        mock_collection.count_documents.assert_called_once_with(filtro)
+
+    @patch('app.services.busca_service.mongo.get_collection')
+    def test_contar_resultados_nao_conta_nas_paginas_seguintes(self, mock_get_collection):
+        """Testa se páginas pedidas com cursor não repetem a contagem"""
+        # Act
+        total = contar_resultados({'titulo': 'x'}, [{'_id': 1}], cursor='abc', proximo_cursor='def')
+
+        # Assert
+        self.assertIsNone(total)
+        mock_get_collection.assert_not_called()
+
+    # ==================== TESTES DE enriquecer_artigos() ====================
+
+    @patch('app.services.busca_service.mongo.get_collection')
+    def test_enriquecer_artigos_usa_duas_consultas_em_lote(self, mock_get_collection):
+        """Testa se o enriquecimento faz uma consulta por coleção, e não uma por artigo"""
+        # Arrange
+        evento_id = ObjectId()
+        edicao_id = ObjectId()
+        mock_edicoes = MagicMock()
+        mock_edicoes.find.return_value = [{'_id': edicao_id, 'ano': 2024, 'evento_id': str(evento_id)}]
+        mock_eventos = MagicMock()
+        mock_eventos.find.return_value = [{'_id': evento_id, 'nome': 'Simpósio', 'sigla': 'SBES'}]
+        mock_get_collection.side_effect = lambda nome: {'edicoes': mock_edicoes, 'eventos': mock_eventos}[nome]
+        artigos = [
+            {'_id': ObjectId(), 'titulo': f'Artigo {i}', 'edicao_id': str(edicao_id) if i % 2 else edicao_id}
+            for i in range(10)
+        ]
+
+        # Act
+        result = enriquecer_artigos(artigos)
+
+        # Assert
+        self.assertEqual(mock_edicoes.find.call_count, 1)
+        self.assertEqual(mock_eventos.find.call_count, 1)
+        self.assertTrue(all(a['edicao_ano'] == 2024 and a['evento_sigla'] == 'SBES' for a in result))
+        self.assertTrue(all(isinstance(a['_id'], str) and isinstance(a['edicao_id'], str) for a in result))
+
+    @patch('app.services.busca_service.mongo.get_collection')
+    def test_enriquecer_artigos_vazio_nao_consulta_banco(self, mock_get_collection):
+        """Testa se nenhuma consulta é feita quando não há artigos"""
+        # Arrange & Act
+        result = enriquecer_artigos([])
+
+        # Assert
+        self.assertEqual(result, [])
+        mock_get_collection.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
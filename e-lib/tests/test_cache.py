@@ -0,0 +1,256 @@
+"""
+Testes unitários para o cache de respostas e as requisições condicionais
+Testa expiração, invalidação por tags, versões de coleções e respostas 304
+"""
+
+import unittest
+import sys
+import os
+from unittest.mock import patch
+from flask import Flask, jsonify
+
+# Adiciona o caminho do backend ao sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+from app.services.cache import (
+    CacheRespostas, RegistroVersoes, cache_respostas, registrar_alteracao, tag, condicional
+)
+
+
+class ColecaoVersoes:
+    """Coleção `versoes` em memória, com as duas operações usadas pelo RegistroVersoes"""
+
+    def __init__(self):
+        self.documentos = {}
+
+    def update_one(self, filtro, alteracao, upsert=False):
+        documento = self.documentos.setdefault(filtro['_id'], {'_id': filtro['_id'], 'versao': 0})
+        documento['versao'] += alteracao['$inc']['versao']
+        documento.update(alteracao['$set'])
+
+    def find(self, filtro):
+        return [d for chave, d in self.documentos.items() if chave in filtro['_id']['$in']]
+
+
+class TestCacheRespostas(unittest.TestCase):
+    """Suite de testes unitários para o CacheRespostas"""
+    
+    def setUp(self):
+        """Configuração inicial para cada teste"""
+        self.cache = CacheRespostas(ttl=60, max_itens=3)
+    
+    # ==================== TESTES DE obter() / guardar() ====================
+    
+    def test_obter_retorna_valor_guardado(self):
+        """Testa se um valor guardado é retornado"""
+        # Arrange
+        self.cache.guardar('chave', b'{}')
+        
+        # Act & Assert
+        self.assertEqual(self.cache.obter('chave'), b'{}')
+    
+    def test_obter_retorna_none_para_chave_ausente(self):
+        """Testa se chaves ausentes retornam None"""
+        # Act & Assert
+        self.assertIsNone(self.cache.obter('inexistente'))
+    
+    @patch('app.services.cache.time.monotonic')
+    def test_obter_descarta_valor_expirado(self, mock_monotonic):
+        """Testa se valores expirados não são retornados"""
+        # Arrange
+        mock_monotonic.return_value = 1000
+        self.cache.guardar('chave', b'{}')
+        mock_monotonic.return_value = 1061
+        
+        # Act & Assert
+        self.assertIsNone(self.cache.obter('chave'))
+    
+    def test_guardar_respeita_max_itens(self):
+        """Testa se o item menos usado é descartado ao exceder o limite"""
+        # Arrange
+        for i in range(3):
+            self.cache.guardar(i, i)
+        self.cache.obter(0)
+        
+        # Act
+        self.cache.guardar(3, 3)
+        
+        # Assert
+        self.assertEqual(self.cache.obter(0), 0)
+        self.assertIsNone(self.cache.obter(1))
+    
+    # ==================== TESTES DE invalidar() ====================
+    
+    def test_invalidar_remove_apenas_entradas_da_tag(self):
+        """Testa se a invalidação descarta só as entradas associadas à tag"""
+        # Arrange
+        self.cache.guardar('a', 1, tags=['edicao:1', 'evento:9'])
+        self.cache.guardar('b', 2, tags=['edicao:2', 'evento:9'])
+        
+        # Act
+        self.cache.invalidar('edicao:1')
+        
+        # Assert
+        self.assertIsNone(self.cache.obter('a'))
+        self.assertEqual(self.cache.obter('b'), 2)
+    
+    def test_registrar_alteracao_invalida_cache_global(self):
+        """Testa se registrar_alteracao descarta entradas do cache global e incrementa a versão gravada"""
+        # Arrange
+        colecao_versoes = ColecaoVersoes()
+        cache_respostas.guardar('homepage', b'{}', tags=[tag('evento', 'abc')])
+        
+        # Act
+        with patch('app.services.cache.mongo.get_collection', return_value=colecao_versoes):
+            registrar_alteracao('eventos', eventos=['abc', None])
+        
+        # Assert
+        self.assertIsNone(cache_respostas.obter('homepage'))
+        self.assertEqual(colecao_versoes.documentos['eventos']['versao'], 1)
+
+
+
+class TestRequisicoesCondicionais(unittest.TestCase):
+    """Suite de testes unitários para ETags e respostas 304"""
+    
+    def setUp(self):
+        """Cria uma aplicação mínima com uma rota condicional"""
+        self.chamadas = 0
+        app = Flask(__name__)
+        
+        @app.route('/recurso')
+        @condicional('colecao_teste')
+        def recurso():
+            self.chamadas += 1
+            return jsonify({'ok': True})
+        
+        @app.route('/ausente')
+        @condicional('colecao_teste')
+        def ausente():
+            return jsonify({'error': 'não encontrado'}), 404
+        
+        self.client = app.test_client()
+        
+        # Versões gravadas "no banco", compartilhadas por todos os RegistroVersoes
+        self.colecao_versoes = ColecaoVersoes()
+        patcher = patch('app.services.cache.mongo.get_collection', return_value=self.colecao_versoes)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    # ==================== TESTES DE RegistroVersoes ====================
+    
+    def test_etag_muda_apos_incrementar(self):
+        """Testa se a ETag muda quando a coleção é alterada"""
+        # Arrange
+        registro = RegistroVersoes()
+        antes_artigos, _ = registro.validadores(['artigos'])
+        antes_eventos, _ = registro.validadores(['eventos'])
+        
+        # Act
+        registro.incrementar('artigos')
+        
+        # Assert
+        self.assertNotEqual(antes_artigos, registro.validadores(['artigos'])[0])
+        self.assertEqual(antes_eventos, registro.validadores(['eventos'])[0])
+    
+    def test_alteracao_em_outro_processo_muda_etag(self):
+        """Testa se uma versão incrementada por outro processo (outro registro) invalida a ETag"""
+        # Arrange
+        servidor = RegistroVersoes(intervalo_leitura=0)
+        seed = RegistroVersoes()
+        antes, _ = servidor.validadores(['artigos'])
+        
+        # Act
+        seed.incrementar('artigos')
+        
+        # Assert
+        self.assertNotEqual(antes, servidor.validadores(['artigos'])[0])
+    
+    @patch('app.services.cache.time.time')
+    def test_etag_expira_ao_fim_da_janela_de_validade(self, mock_time):
+        """Testa se a ETag muda após `validade` segundos mesmo sem alterações registradas"""
+        # Arrange
+        registro = RegistroVersoes(validade=300)
+        mock_time.return_value = 1000
+        antes, ultima_antes = registro.validadores(['artigos'])
+        
+        # Act
+        mock_time.return_value = 1300
+        depois, ultima_depois = registro.validadores(['artigos'])
+        
+        # Assert
+        self.assertNotEqual(antes, depois)
+        self.assertGreater(ultima_depois, ultima_antes)
+    
+    # ==================== TESTES DE condicional() ====================
+    
+    def test_resposta_inclui_validadores(self):
+        """Testa se a resposta 200 traz ETag e Last-Modified"""
+        # Act
+        response = self.client.get('/recurso')
+        
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNotNone(response.headers.get('ETag'))
+        self.assertIsNotNone(response.headers.get('Last-Modified'))
+    
+    def test_if_none_match_retorna_304_sem_executar_rota(self):
+        """Testa se a ETag atual gera 304 sem executar a rota"""
+        # Arrange
+        etag = self.client.get('/recurso').headers['ETag']
+        
+        # Act
+        response = self.client.get('/recurso', headers={'If-None-Match': etag})
+        
+        # Assert
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.chamadas, 1)
+    
+    def test_if_modified_since_retorna_304(self):
+        """Testa se If-Modified-Since sem alterações gera 304"""
+        # Arrange
+        ultima = self.client.get('/recurso').headers['Last-Modified']
+        
+        # Act
+        response = self.client.get('/recurso', headers={'If-Modified-Since': ultima})
+        
+        # Assert
+        self.assertEqual(response.status_code, 304)
+    
+    def test_alteracao_invalida_etag(self):
+        """Testa se, após uma escrita, a ETag antiga não gera 304"""
+        # Arrange
+        etag = self.client.get('/recurso').headers['ETag']
+        registrar_alteracao('colecao_teste')
+        
+        # Act
+        response = self.client.get('/recurso', headers={'If-None-Match': etag})
+        
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.chamadas, 2)
+    
+    def test_falha_ao_ler_versoes_responde_sem_validadores(self):
+        """Testa se, sem acesso às versões, a rota responde normalmente e sem ETag"""
+        # Arrange
+        with patch('app.services.cache.versoes.validadores', side_effect=Exception('banco indisponível')), \
+             patch('builtins.print'):
+            # Act
+            response = self.client.get('/recurso', headers={'If-None-Match': 'W/"qualquer"'})
+        
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.headers.get('ETag'))
+    
+    def test_erros_nao_recebem_validadores(self):
+        """Testa se respostas de erro não recebem ETag"""
+        # Act
+        response = self.client.get('/ausente')
+        
+        # Assert
+        self.assertEqual(response.status_code, 404)
+        self.assertIsNone(response.headers.get('ETag'))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
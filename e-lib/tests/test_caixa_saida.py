@@ -0,0 +1,294 @@
+"""
+Testes unitários para os workers da caixa de saída de notificações
+Testa a distribuição por inscrito, o envio dos emails e as novas tentativas com mocks
+"""
+
+import unittest
+import sys
+import os
+from datetime import datetime
+from unittest.mock import patch, MagicMock
+from bson import ObjectId
+
+# Adiciona o caminho do backend ao sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+from app.services import caixa_saida
+from app.services.caixa_saida import (
+    NOVO_ARTIGO, EMAIL_NOTIFICACAO, RESUMO_EMAIL, MAX_TENTATIVAS, ATRASO_BASE,
+    registrar_novo_artigo, processar_item, drenar, acumular_resumos, liberar_resumos,
+    notificar_importacao, enviar_lote
+)
+
+
+class TestCaixaSaida(unittest.TestCase):
+    """Suite de testes unitários para o serviço da caixa de saída"""
+
+    def setUp(self):
+        self.artigo = {
+            '_id': ObjectId(),
+            'titulo': 'Artigo',
+            'autores': [{'nome': 'Ana Silva'}, {'nome': 'Bruno Souza'}],
+            'resumo': 'Resumo'
+        }
+
+    # ==================== TESTES DE registrar_novo_artigo() ====================
+
+    @patch('app.services.caixa_saida.despertar')
+    @patch('app.services.caixa_saida.indice_inscricoes.correspondencias')
+    @patch('app.services.caixa_saida.CaixaSaida.adicionar')
+    def test_registrar_novo_artigo_so_grava_a_intencao(self, mock_adicionar, mock_correspondencias, mock_despertar):
+        """Testa se a requisição grava um único item e não consulta inscrições nem envia emails"""
+        # Act
+        registrar_novo_artigo(self.artigo)
+
+        # Assert
+        tipo, dados = mock_adicionar.call_args[0]
+        self.assertEqual(tipo, NOVO_ARTIGO)
+        self.assertEqual(dados['artigo_id'], str(self.artigo['_id']))
+        self.assertEqual(dados['autores'], self.artigo['autores'])
+        mock_correspondencias.assert_not_called()
+        mock_despertar.assert_called_once()
+
+    # ==================== TESTES DE processar_item() ====================
+
+    @patch('app.services.caixa_saida.despertar')
+    @patch('app.services.caixa_saida.CaixaSaida')
+    @patch('app.services.caixa_saida.indice_inscricoes.correspondencias')
+    def test_distribuicao_cria_um_email_por_inscricao(self, mock_correspondencias, mock_caixa, mock_despertar):
+        """Testa se o item do artigo vira um item de email por inscrito de cada autor, com chave idempotente"""
+        # Arrange
+        mock_correspondencias.return_value = {'Ana Silva': [{'email': 'x@ex.com'}]}
+        item = {'_id': ObjectId(), 'tipo': NOVO_ARTIGO, 'tentativas': 1, 'dados': caixa_saida.resumo_artigo(self.artigo)}
+
+        # Act
+        sucesso = processar_item(item)
+
+        # Assert
+        self.assertTrue(sucesso)
+        emails = mock_caixa.adicionar_em_lote.call_args[0][0]
+        self.assertEqual(len(emails), 1)
+        tipo, dados, chave = emails[0]
+        self.assertEqual(tipo, EMAIL_NOTIFICACAO)
+        self.assertEqual((dados['email'], dados['nome_autor']), ('x@ex.com', 'Ana Silva'))
+        self.assertEqual(chave, f"{item['_id']}:x@ex.com:Ana Silva")
+        self.assertEqual(list(mock_correspondencias.call_args[0][0]), ['Ana Silva', 'Bruno Souza'])
+        mock_caixa.concluir.assert_called_once_with(item['_id'])
+
+    @patch('builtins.print')
+    @patch('app.services.caixa_saida.CaixaSaida')
+    @patch('app.services.caixa_saida.email_service.enviar_mensagens', return_value=[False])
+    def test_falha_no_envio_reagenda_com_espera_exponencial(self, mock_enviar, mock_caixa, mock_print):
+        """Testa se um envio que falha volta para a fila com espera dobrada a cada tentativa"""
+        # Arrange
+        item = {'_id': ObjectId(), 'tipo': EMAIL_NOTIFICACAO, 'tentativas': 3,
+                'dados': {'email': 'x@ex.com', 'nome_autor': 'Ana Silva', 'artigo': self.artigo}}
+
+        # Act
+        sucesso = processar_item(item)
+
+        # Assert
+        self.assertFalse(sucesso)
+        item_id, erro, atraso = mock_caixa.reagendar.call_args[0]
+        self.assertEqual(atraso, ATRASO_BASE * 4)
+        mock_enviar.assert_called_once()
+        mock_caixa.concluir.assert_not_called()
+
+    @patch('builtins.print')
+    @patch('app.services.caixa_saida.CaixaSaida')
+    @patch('app.services.caixa_saida.email_service.enviar_mensagens', side_effect=RuntimeError('smtp'))
+    def test_ultima_tentativa_marca_item_como_falho(self, mock_enviar, mock_caixa, mock_print):
+        """Testa se o item é marcado como falho ao esgotar as tentativas"""
+        # Arrange
+        item = {'_id': ObjectId(), 'tipo': EMAIL_NOTIFICACAO, 'tentativas': MAX_TENTATIVAS,
+                'dados': {'email': 'x@ex.com', 'nome_autor': 'Ana Silva', 'artigo': self.artigo}}
+
+        # Act
+        processar_item(item)
+
+        # Assert
+        mock_caixa.falhar.assert_called_once_with(item['_id'], 'smtp')
+        mock_caixa.reagendar.assert_not_called()
+
+    @patch('app.services.caixa_saida.acumular_resumos')
+    @patch('app.services.caixa_saida.CaixaSaida')
+    @patch('app.services.caixa_saida.indice_inscricoes.correspondencias')
+    def test_distribuicao_com_janela_acumula_resumos(self, mock_correspondencias, mock_caixa, mock_acumular):
+        """Testa se, com janela de resumo, as correspondências vão para os resumos em vez de emails individuais"""
+        # Arrange
+        mock_correspondencias.return_value = {'Ana Silva': [{'email': 'x@ex.com'}, {'email': 'y@ex.com'}]}
+        dados = caixa_saida.resumo_artigo(self.artigo)
+        item = {'_id': ObjectId(), 'tipo': NOVO_ARTIGO, 'tentativas': 1, 'dados': dados}
+
+        # Act
+        with patch.object(caixa_saida, 'JANELA_RESUMO', 600):
+            processar_item(item)
+
+        # Assert
+        self.assertEqual(mock_acumular.call_args[0][0],
+                         [('x@ex.com', 'Ana Silva', dados), ('y@ex.com', 'Ana Silva', dados)])
+        mock_caixa.adicionar_em_lote.assert_not_called()
+
+    @patch('builtins.print')
+    @patch('app.services.caixa_saida.CaixaSaida')
+    @patch('app.services.caixa_saida.email_service.enviar_mensagens', return_value=[True])
+    def test_resumo_envia_um_email_com_todas_as_entradas(self, mock_enviar, mock_caixa, mock_print):
+        """Testa se o item de resumo gera um único envio com as entradas acumuladas"""
+        # Arrange
+        entradas = [{'artigo_id': 'a', 'titulo': 'A', 'nome_autor': 'Ana Silva'},
+                    {'artigo_id': 'b', 'titulo': 'B', 'nome_autor': 'Ana Silva'}]
+        item = {'_id': ObjectId(), 'tipo': RESUMO_EMAIL, 'tentativas': 1,
+                'dados': {'email': 'x@ex.com'}, 'entradas': entradas}
+
+        # Act
+        sucesso = processar_item(item)
+
+        # Assert
+        self.assertTrue(sucesso)
+        mensagens = mock_enviar.call_args[0][0]
+        self.assertEqual(len(mensagens), 1)
+        self.assertEqual(mensagens[0]['To'], 'x@ex.com')
+        corpo = mensagens[0].get_payload(decode=True).decode('utf-8')
+        self.assertIn('- A (Ana Silva)', corpo)
+        self.assertIn('- B (Ana Silva)', corpo)
+
+    # ==================== TESTES DE acumular_resumos() ====================
+
+    @patch('app.services.caixa_saida.CaixaSaida.acumular', return_value=[])
+    def test_acumular_resumos_agrupa_por_destinatario_na_janela(self, mock_acumular):
+        """Testa se as correspondências viram um resumo por email, pronto ao fim da janela atual"""
+        # Arrange
+        artigo_a = {'artigo_id': 'a', 'titulo': 'A'}
+        artigo_b = {'artigo_id': 'b', 'titulo': 'B'}
+
+        # Act
+        with patch.object(caixa_saida, 'JANELA_RESUMO', 600), patch('app.services.caixa_saida.time.time', return_value=1200.5):
+            destinatarios = acumular_resumos([
+                ('x@ex.com', 'Ana Silva', artigo_a),
+                ('x@ex.com', 'Ana Silva', artigo_b),
+                ('y@ex.com', 'Ana Silva', artigo_a),
+            ])
+
+        # Assert
+        tipo, itens, disponivel_em = mock_acumular.call_args[0]
+        self.assertEqual(tipo, RESUMO_EMAIL)
+        self.assertEqual(destinatarios, 2)
+        self.assertEqual([chave for chave, _, _ in itens], ['resumo:janela2:x@ex.com:0', 'resumo:janela2:y@ex.com:0'])
+        self.assertEqual([e['artigo_id'] for e in itens[0][2]], ['a', 'b'])
+        self.assertEqual(disponivel_em, datetime.utcfromtimestamp(1800))
+
+    @patch('app.services.caixa_saida.CaixaSaida.acumular')
+    def test_acumular_resumos_usa_nova_chave_se_resumo_ja_reservado(self, mock_acumular):
+        """Testa se entradas recusadas (resumo já em envio) vão para um resumo novo do mesmo grupo"""
+        # Arrange
+        mock_acumular.side_effect = lambda tipo, itens, disponivel_em: [
+            chave for chave, _, _ in itens if chave.endswith(':0')
+        ]
+
+        # Act
+        acumular_resumos([('x@ex.com', 'Ana Silva', {'artigo_id': 'a'})], grupo='imp1')
+
+        # Assert
+        segunda_chamada = mock_acumular.call_args_list[1][0][1]
+        self.assertEqual([chave for chave, _, _ in segunda_chamada], ['resumo:imp1:x@ex.com:1'])
+
+    # ==================== TESTES DE notificar_importacao() ====================
+
+    @patch('app.services.caixa_saida.acumular_resumos')
+    @patch('app.services.caixa_saida.indice_inscricoes.correspondencias')
+    def test_notificar_importacao_casa_autores_do_lote_de_uma_vez(self, mock_correspondencias, mock_acumular):
+        """Testa se o conjunto de autores do lote é casado em uma consulta e só as correspondências são agendadas"""
+        # Arrange
+        mock_correspondencias.return_value = {'Ana Silva': [{'email': 'x@ex.com'}, {'email': 'y@ex.com'}]}
+        artigos = [dict(self.artigo, _id=ObjectId()) for _ in range(3)]
+        artigos.append({'_id': ObjectId(), 'titulo': 'Outro', 'autores': [{'nome': 'Carla Dias'}]})
+
+        # Act
+        agendadas = notificar_importacao(artigos, 'imp1')
+
+        # Assert
+        mock_correspondencias.assert_called_once_with({'Ana Silva', 'Bruno Souza', 'Carla Dias'})
+        correspondencias, grupo = mock_acumular.call_args[0]
+        self.assertEqual(grupo, 'imp1')
+        self.assertEqual(agendadas, 6)
+        self.assertEqual({c[0] for c in correspondencias}, {'x@ex.com', 'y@ex.com'})
+        self.assertEqual({c[2]['artigo_id'] for c in correspondencias}, {str(a['_id']) for a in artigos[:3]})
+
+    @patch('app.services.caixa_saida.acumular_resumos')
+    @patch('app.services.caixa_saida.indice_inscricoes.correspondencias', return_value={})
+    def test_notificar_importacao_sem_inscritos_nao_grava(self, mock_correspondencias, mock_acumular):
+        """Testa se um lote sem autores acompanhados não gera escrita na caixa de saída"""
+        # Act & Assert
+        self.assertEqual(notificar_importacao([self.artigo], 'imp1'), 0)
+        mock_acumular.assert_not_called()
+
+    @patch('app.services.caixa_saida.despertar')
+    @patch('app.services.caixa_saida.CaixaSaida.liberar', return_value=3)
+    def test_liberar_resumos_do_grupo(self, mock_liberar, mock_despertar):
+        """Testa se liberar_resumos antecipa os resumos do grupo e acorda os workers"""
+        # Act
+        liberados = liberar_resumos('imp1')
+
+        # Assert
+        self.assertEqual(liberados, 3)
+        mock_liberar.assert_called_once_with('resumo:imp1:')
+        mock_despertar.assert_called_once()
+
+    # ==================== TESTES DE drenar() ====================
+
+    @patch('app.services.caixa_saida.processar_item')
+    @patch('app.services.caixa_saida.CaixaSaida.reservar')
+    def test_drenar_processa_ate_esvaziar(self, mock_reservar, mock_processar):
+        """Testa se os itens são reservados e processados até não haver mais nenhum pronto"""
+        # Arrange
+        mock_reservar.side_effect = [{'_id': 1, 'tipo': NOVO_ARTIGO}, {'_id': 2, 'tipo': NOVO_ARTIGO}, None]
+
+        # Act
+        processados = drenar()
+
+        # Assert
+        self.assertEqual(processados, 2)
+        self.assertEqual(mock_processar.call_count, 2)
+
+    @patch('builtins.print')
+    @patch('app.services.caixa_saida.CaixaSaida')
+    @patch('app.services.caixa_saida.email_service.enviar_mensagens')
+    def test_drenar_envia_emails_em_lotes(self, mock_enviar, mock_caixa, mock_print):
+        """Testa se os emails reservados são enviados em lotes de até LOTE_ENVIO mensagens"""
+        # Arrange
+        itens = [{'_id': i, 'tipo': EMAIL_NOTIFICACAO, 'tentativas': 1,
+                  'dados': {'email': f'{i}@ex.com', 'nome_autor': 'Ana Silva', 'artigo': self.artigo}}
+                 for i in range(5)]
+        mock_caixa.reservar.side_effect = itens + [None]
+        mock_enviar.side_effect = lambda mensagens: [True] * len(mensagens)
+
+        # Act
+        with patch.object(caixa_saida, 'LOTE_ENVIO', 2):
+            processados = drenar()
+
+        # Assert
+        self.assertEqual(processados, 5)
+        self.assertEqual([len(c[0][0]) for c in mock_enviar.call_args_list], [2, 2, 1])
+        self.assertEqual(mock_caixa.concluir.call_count, 5)
+
+    @patch('builtins.print')
+    @patch('app.services.caixa_saida.CaixaSaida')
+    @patch('app.services.caixa_saida.email_service.enviar_mensagens', return_value=[True, False])
+    def test_enviar_lote_reagenda_apenas_mensagens_recusadas(self, mock_enviar, mock_caixa, mock_print):
+        """Testa se, no lote, só o item cuja mensagem falhou volta para a fila"""
+        # Arrange
+        itens = [{'_id': i, 'tipo': RESUMO_EMAIL, 'tentativas': 1, 'dados': {'email': f'{i}@ex.com'},
+                  'entradas': [{'artigo_id': 'a', 'titulo': 'A', 'nome_autor': 'Ana Silva'}]}
+                 for i in range(2)]
+
+        # Act
+        enviados = enviar_lote(itens)
+
+        # Assert
+        self.assertEqual(enviados, 1)
+        mock_caixa.concluir.assert_called_once_with(0)
+        self.assertEqual(mock_caixa.reagendar.call_args[0][0], 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
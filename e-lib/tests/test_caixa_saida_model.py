@@ -0,0 +1,180 @@
+"""
+Testes unitários para o modelo CaixaSaida
+Testa a gravação, a reserva atômica e as transições de estado dos itens com mocks do banco de dados
+"""
+
+import unittest
+import sys
+import os
+from datetime import datetime
+from unittest.mock import patch, MagicMock
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+
+# Adiciona o caminho do backend ao sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+from app.models.caixa_saida import CaixaSaida, PENDENTE, PROCESSANDO, FALHOU
+
+
+class TestCaixaSaidaModel(unittest.TestCase):
+    """Suite de testes unitários para o modelo CaixaSaida"""
+
+    # ==================== TESTES DE adicionar() ====================
+
+    @patch('app.models.caixa_saida.mongo.get_collection')
+    def test_adicionar_grava_item_pendente(self, mock_get_collection):
+        """Testa se o item é gravado pendente, sem tentativas e pronto para processamento"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_get_collection.return_value = mock_collection
+
+        # Act
+        item_id = CaixaSaida.adicionar('novo_artigo', {'titulo': 'A'})
+
+        # Assert
+        documento = mock_collection.insert_one.call_args[0][0]
+        self.assertEqual(item_id, mock_collection.insert_one.return_value.inserted_id)
+        self.assertEqual(documento['status'], PENDENTE)
+        self.assertEqual(documento['tentativas'], 0)
+        self.assertLessEqual(documento['proxima_tentativa'], datetime.utcnow())
+        self.assertNotIn('chave', documento)
+
+    # ==================== TESTES DE adicionar_em_lote() ====================
+
+    @patch('app.models.caixa_saida.mongo.get_collection')
+    def test_adicionar_em_lote_ignora_chaves_repetidas(self, mock_get_collection):
+        """Testa se itens com chave já existente são ignorados sem erro"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_collection.insert_many.side_effect = BulkWriteError({
+            'nInserted': 1, 'writeErrors': [{'index': 1, 'code': 11000}]
+        })
+        mock_get_collection.return_value = mock_collection
+
+        # Act
+        criados = CaixaSaida.adicionar_em_lote([('email', {}, 'k1'), ('email', {}, 'k2')])
+
+        # Assert
+        documentos = mock_collection.insert_many.call_args[0][0]
+        self.assertEqual([d['chave'] for d in documentos], ['k1', 'k2'])
+        self.assertFalse(mock_collection.insert_many.call_args[1]['ordered'])
+        self.assertEqual(criados, 1)
+
+    @patch('app.models.caixa_saida.mongo.get_collection')
+    def test_adicionar_em_lote_vazio_nao_acessa_banco(self, mock_get_collection):
+        """Testa se uma lista vazia não gera escrita"""
+        # Arrange, Act & Assert
+        self.assertEqual(CaixaSaida.adicionar_em_lote([]), 0)
+        mock_get_collection.assert_not_called()
+
+    # ==================== TESTES DE acumular() e liberar() ====================
+
+    @patch('app.models.caixa_saida.mongo.get_collection')
+    def test_acumular_faz_upsert_do_item_pendente_por_chave(self, mock_get_collection):
+        """Testa se as entradas são acrescentadas sem repetição ao item pendente da chave, criado se preciso"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_get_collection.return_value = mock_collection
+        disponivel_em = datetime(2030, 1, 1)
+
+        # Act
+        recusadas = CaixaSaida.acumular('resumo', [('k1', {'email': 'x@ex.com'}, [{'artigo_id': 'a'}])], disponivel_em)
+
+        # Assert
+        operacao = mock_collection.bulk_write.call_args[0][0][0]
+        self.assertEqual(operacao._filter, {'chave': 'k1', 'status': PENDENTE})
+        self.assertTrue(operacao._upsert)
+        self.assertEqual(operacao._doc['$addToSet'], {'entradas': {'$each': [{'artigo_id': 'a'}]}})
+        self.assertEqual(operacao._doc['$max'], {'proxima_tentativa': disponivel_em})
+        self.assertNotIn('proxima_tentativa', operacao._doc['$setOnInsert'])
+        self.assertNotIn('entradas', operacao._doc['$setOnInsert'])
+        self.assertEqual(recusadas, [])
+
+    @patch('app.models.caixa_saida.mongo.get_collection')
+    def test_acumular_retorna_chaves_de_itens_ja_reservados(self, mock_get_collection):
+        """Testa se a chave cujo item já saiu de pendente (chave duplicada no upsert) é devolvida"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_collection.bulk_write.side_effect = BulkWriteError({'writeErrors': [{'index': 1, 'code': 11000}]})
+        mock_get_collection.return_value = mock_collection
+
+        # Act
+        recusadas = CaixaSaida.acumular('resumo', [('k1', {}, []), ('k2', {}, [])], datetime.utcnow())
+
+        # Assert
+        self.assertEqual(recusadas, ['k2'])
+
+    @patch('app.models.caixa_saida.mongo.get_collection')
+    def test_liberar_antecipa_itens_pendentes_do_prefixo(self, mock_get_collection):
+        """Testa se liberar filtra pelo prefixo literal da chave e torna os itens prontos"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_collection.update_many.return_value.modified_count = 2
+        mock_get_collection.return_value = mock_collection
+
+        # Act
+        liberados = CaixaSaida.liberar('resumo:imp.1:')
+
+        # Assert
+        filtro, alteracao = mock_collection.update_many.call_args[0]
+        self.assertEqual(filtro['chave'], {'$regex': r'^resumo:imp\.1:'})
+        self.assertEqual(filtro['status'], PENDENTE)
+        self.assertLessEqual(alteracao['$set']['proxima_tentativa'], datetime.utcnow())
+        self.assertEqual(liberados, 2)
+
+    # ==================== TESTES DE reservar() ====================
+
+    @patch('app.models.caixa_saida.mongo.get_collection')
+    def test_reservar_usa_find_one_and_update(self, mock_get_collection):
+        """Testa se a reserva é atômica, conta a tentativa e retoma reservas expiradas"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_get_collection.return_value = mock_collection
+
+        # Act
+        CaixaSaida.reservar(60)
+
+        # Assert
+        filtro, alteracao = mock_collection.find_one_and_update.call_args[0]
+        self.assertEqual([condicao['status'] for condicao in filtro['$or']], [PENDENTE, PROCESSANDO])
+        self.assertEqual(alteracao['$set']['status'], PROCESSANDO)
+        self.assertEqual(alteracao['$inc'], {'tentativas': 1})
+
+    # ==================== TESTES DE reagendar() e falhar() ====================
+
+    @patch('app.models.caixa_saida.mongo.get_collection')
+    def test_reagendar_devolve_item_a_fila(self, mock_get_collection):
+        """Testa se o item volta a pendente com a próxima tentativa no futuro"""
+        # Arrange
+        item_id = ObjectId()
+        mock_collection = MagicMock()
+        mock_get_collection.return_value = mock_collection
+
+        # Act
+        CaixaSaida.reagendar(item_id, 'smtp indisponível', 30)
+
+        # Assert
+        filtro, alteracao = mock_collection.update_one.call_args[0]
+        self.assertEqual(filtro, {'_id': item_id})
+        self.assertEqual(alteracao['$set']['status'], PENDENTE)
+        self.assertGreater(alteracao['$set']['proxima_tentativa'], datetime.utcnow())
+
+    @patch('app.models.caixa_saida.mongo.get_collection')
+    def test_falhar_registra_erro(self, mock_get_collection):
+        """Testa se o item é marcado como falho com a mensagem de erro"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_get_collection.return_value = mock_collection
+
+        # Act
+        CaixaSaida.falhar(ObjectId(), 'smtp indisponível')
+
+        # Assert
+        alteracao = mock_collection.update_one.call_args[0][1]
+        self.assertEqual(alteracao['$set']['status'], FALHOU)
+        self.assertEqual(alteracao['$set']['error'], 'smtp indisponível')
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -327,6 +327,65 @@ class TestEdicaoEventoModel(unittest.TestCase):
         self.assertIsInstance(result, list)
         self.assertEqual(len(result), 1)
     
+    @patch('app.models.edicao.mongo.get_collection')
+    def test_find_by_evento_uses_single_objectid_equality(self, mock_get_collection):
+        """Testa se find_by_evento consulta apenas pela forma ObjectId de evento_id"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_collection.find.return_value = []
+        mock_get_collection.return_value = mock_collection
+        
+        # Act
+        EdicaoEvento.find_by_evento(self.test_evento_id)
+        
+        # Assert
+        mock_collection.find.assert_called_once_with({'evento_id': ObjectId(self.test_evento_id)})
+    
+    @patch('app.models.edicao.mongo.get_collection')
+    def test_find_by_evento_returns_empty_list_for_invalid_id(self, mock_get_collection):
+        """Testa se find_by_evento retorna lista vazia para um evento_id inválido"""
+        # Arrange
+        mock_get_collection.return_value = MagicMock()
+        
+        # Act
+        result = EdicaoEvento.find_by_evento('id-invalido')
+        
+        # Assert
+        self.assertEqual(result, [])
+    
+    # ==================== TESTES COM MOCKS - find_by_evento_ano() ====================
+    
+    @patch('app.models.edicao.mongo.get_collection')
+    def test_find_by_evento_ano_uses_direct_lookup(self, mock_get_collection):
+        """Testa se find_by_evento_ano faz uma única busca por evento_id e ano"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_collection.find_one.return_value = {
+            '_id': ObjectId(), 'evento_id': ObjectId(self.test_evento_id), 'ano': self.test_ano
+        }
+        mock_get_collection.return_value = mock_collection
+        
+        # Act
+        result = EdicaoEvento.find_by_evento_ano(self.test_evento_id, self.test_ano)
+        
+        # Assert
+        mock_collection.find_one.assert_called_once_with(
+            {'evento_id': ObjectId(self.test_evento_id), 'ano': self.test_ano}
+        )
+        self.assertIsInstance(result['_id'], str)
+        self.assertIsInstance(result['evento_id'], str)
+    
+    @patch('app.models.edicao.mongo.get_collection')
+    def test_find_by_evento_ano_returns_none_when_not_found(self, mock_get_collection):
+        """Testa se find_by_evento_ano retorna None quando a edição não existe"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_collection.find_one.return_value = None
+        mock_get_collection.return_value = mock_collection
+        
+        # Act & Assert
+        self.assertIsNone(EdicaoEvento.find_by_evento_ano(self.test_evento_id, 1999))
+    
     # ==================== TESTES COM MOCKS - find_by_id() ====================
     
     @patch('app.models.edicao.mongo.get_collection')
@@ -233,6 +233,42 @@ class TestEmailService(unittest.TestCase):
         self.assertTrue(any("Erro ao enviar email" in str(call) 
                            for call in mock_print.call_args_list))
     
+    def test_enviar_notificacao_usa_pool_quando_envio_real(self):
+        """Testa se, com SMTP_ENVIAR=true, a mensagem vai para o pool de conexões em vez de ser simulada"""
+        # Arrange
+        with patch.dict(os.environ, {'SMTP_ENVIAR': 'true'}):
+            service = EmailService()
+        service._pool = MagicMock()
+        service._pool.enviar_varios.return_value = [False]
+
+        # Act
+        result = service.enviar_notificacao(self.test_destinatario, self.test_nome_autor, self.test_artigo)
+
+        # Assert
+        self.assertFalse(result)
+        msg = service._pool.enviar_varios.call_args[0][0][0]
+        self.assertEqual(msg['To'], self.test_destinatario)
+        self.assertEqual(msg['Subject'], f"Novo artigo publicado de {self.test_nome_autor}")
+    
+    def test_mensagem_resumo_lista_cada_artigo_uma_vez(self):
+        """Testa se o resumo junta os autores acompanhados de um mesmo artigo em uma só linha"""
+        # Arrange
+        service = EmailService()
+        entradas = [
+            {'artigo_id': 'a', 'titulo': 'Artigo A', 'nome_autor': 'Ana Silva'},
+            {'artigo_id': 'a', 'titulo': 'Artigo A', 'nome_autor': 'Bruno Souza'},
+            {'artigo_id': 'b', 'titulo': 'Artigo B', 'nome_autor': 'Ana Silva'},
+        ]
+        
+        # Act
+        msg = service.mensagem_resumo(self.test_destinatario, entradas)
+        
+        # Assert
+        corpo = msg.get_payload(decode=True).decode('utf-8')
+        self.assertTrue(msg['Subject'].startswith('2 novo(s) artigo(s)'))
+        self.assertEqual(corpo.count('Artigo A'), 1)
+        self.assertIn('Artigo A (Ana Silva, Bruno Souza)', corpo)
+    
     # ==================== TESTES DE enviar_email_confirmacao_inscricao() ====================
     
     @patch('builtins.print')
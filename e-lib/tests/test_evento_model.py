@@ -9,6 +9,7 @@ import os
 from datetime import datetime
 from unittest.mock import Mock, patch, MagicMock
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
 
 # Adiciona o caminho do backend ao sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
@@ -156,6 +157,19 @@ class TestEventoModel(unittest.TestCase):
         # Assert
         self.assertIsNone(result)
     
+    @patch('app.models.evento.mongo.get_collection')
+    def test_save_propaga_sigla_duplicada(self, mock_get_collection):
+        """Testa se save() propaga DuplicateKeyError para a rota responder 409"""
+        # Arrange
+        evento = Evento(nome=self.test_nome, sigla=self.test_sigla)
+        mock_collection = MagicMock()
+        mock_collection.insert_one.side_effect = DuplicateKeyError('duplicate key', 11000)
+        mock_get_collection.return_value = mock_collection
+        
+        # Act & Assert
+        with self.assertRaises(DuplicateKeyError):
+            evento.save()
+    
     # ==================== TESTES COM MOCKS - find_all() ====================
     
     @patch('app.models.evento.mongo.get_collection')
@@ -343,6 +357,18 @@ class TestEventoModel(unittest.TestCase):
         # Assert
         self.assertIsNone(result)
     
+    @patch('app.models.evento.mongo.get_collection')
+    def test_update_propaga_sigla_duplicada(self, mock_get_collection):
+        """Testa se update() propaga DuplicateKeyError ao trocar para uma sigla existente"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_collection.update_one.side_effect = DuplicateKeyError('duplicate key', 11000)
+        mock_get_collection.return_value = mock_collection
+        
+        # Act & Assert
+        with self.assertRaises(DuplicateKeyError):
+            Evento.update(str(ObjectId()), {'sigla': 'SBES'})
+    
     # ==================== TESTES COM MOCKS - delete() ====================
     
     @patch('app.models.evento.mongo.get_collection')
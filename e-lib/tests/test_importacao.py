@@ -0,0 +1,657 @@
+"""
+Testes unitários para o serviço de importação em lote
+Testa a deduplicação por título, a resolução de eventos/edições, as inserções em lote
+e a execução das importações em segundo plano com mocks do MongoDB
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+from datetime import datetime, timedelta
+from unittest.mock import patch, MagicMock
+
+# Adiciona o caminho do backend ao sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+from app.models.artigo import hash_titulo
+from app.services.bibtex import ler_entradas
+from app.services.importacao import (
+    em_lotes, artigos_existentes, gravar_artigos, upsert_em_lote, resolver_eventos, resolver_edicoes,
+    importar_entradas, importar_lotes, importar_arquivo, executar_importacao,
+    carregar_checkpoint, salvar_checkpoint, estatisticas_vazias, CacheResolucao,
+    situacao_importacao, enfileirar_importacao, LIMITE_AMOSTRA_STATS
+)
+
+
+class TestImportacao(unittest.TestCase):
+    """Suite de testes unitários para o serviço de importação"""
+
+    # ==================== TESTES DE em_lotes() ====================
+
+    def test_em_lotes_divide_lista(self):
+        """Testa se a lista é dividida em fatias do tamanho pedido"""
+        # Arrange & Act
+        lotes = list(em_lotes(range(5), 2))
+
+        # Assert
+        self.assertEqual(lotes, [[0, 1], [2, 3], [4]])
+
+    # ==================== TESTES DE artigos_existentes() ====================
+
+    @patch('app.services.importacao.mongo.get_collection')
+    def test_artigos_existentes_usa_consultas_em_lote(self, mock_get_collection):
+        """Testa se hashes e citekeys são verificados com $in, e não com um find_one por entrada"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_collection.find.side_effect = [
+            [{'_id': ObjectId(), 'titulo_hash': 'h1'}],
+            [{'_id': ObjectId(), 'citekey': 'silva2024'}]
+        ]
+        mock_get_collection.return_value = mock_collection
+
+        # Act
+        hashes, citekeys = artigos_existentes(['h1', 'h2'], ['silva2024', 'costa2023'])
+
+        # Assert
+        self.assertEqual(hashes, {'h1'})
+        self.assertEqual(citekeys, {'silva2024'})
+        self.assertEqual(mock_collection.find.call_count, 2)
+        self.assertEqual(set(mock_collection.find.call_args_list[0][0][0]['titulo_hash']['$in']), {'h1', 'h2'})
+        mock_collection.find_one.assert_not_called()
+
+    # ==================== TESTES DE gravar_artigos() ====================
+
+    @patch('app.services.importacao.mongo.get_collection')
+    def test_gravar_artigos_faz_upsert_pelo_hash(self, mock_get_collection):
+        """Testa se cada artigo vira um upsert com $setOnInsert filtrado pelo titulo_hash"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_collection.bulk_write.return_value.upserted_ids = {0: 'id0'}
+        mock_get_collection.return_value = mock_collection
+        documentos = [{'titulo': 'A', 'titulo_hash': 'h1'}, {'titulo': 'B', 'titulo_hash': 'h2'}]
+
+        # Act
+        inseridos, duplicados, erros = gravar_artigos(documentos)
+
+        # Assert
+        operacoes = mock_collection.bulk_write.call_args[0][0]
+        self.assertEqual(operacoes[0]._filter, {'titulo_hash': 'h1'})
+        self.assertTrue(operacoes[0]._upsert)
+        self.assertIn('$setOnInsert', operacoes[0]._doc)
+        self.assertEqual(inseridos, [documentos[0]['_id']])
+        self.assertEqual(duplicados, 1)
+        self.assertEqual(erros, [])
+
+    @patch('app.services.importacao.mongo.get_collection')
+    def test_gravar_artigos_conflito_de_citekey_conta_como_duplicata(self, mock_get_collection):
+        """Testa se violações de índice único contam como duplicatas e outros erros são reportados"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_collection.bulk_write.side_effect = BulkWriteError({
+            'upserted': [{'index': 0, '_id': 'id0'}],
+            'writeErrors': [
+                {'index': 1, 'code': 11000, 'errmsg': 'duplicate key citekey_unico'},
+                {'index': 2, 'code': 121, 'errmsg': 'validation failed'}
+            ]
+        })
+        mock_get_collection.return_value = mock_collection
+        documentos = [{'titulo_hash': f'h{i}'} for i in range(3)]
+
+        # Act
+        inseridos, duplicados, erros = gravar_artigos(documentos)
+
+        # Assert
+        self.assertEqual(inseridos, [documentos[0]['_id']])
+        self.assertEqual(duplicados, 1)
+        self.assertEqual(erros[0]['indice'], 2)
+
+    # ==================== TESTES DE upsert_em_lote() ====================
+
+    @patch('app.services.importacao.mongo.get_collection')
+    def test_upsert_em_lote_usa_set_on_insert_nao_ordenado(self, mock_get_collection):
+        """Testa se cada documento vira um upsert com $setOnInsert sob o seu filtro"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_collection.bulk_write.return_value.upserted_ids = {1: 'id1'}
+        mock_get_collection.return_value = mock_collection
+
+        # Act
+        criados = upsert_em_lote('eventos', [{'sigla': 'A'}, {'sigla': 'B'}], [{'nome': 'a'}, {'nome': 'b'}])
+
+        # Assert
+        operacoes = mock_collection.bulk_write.call_args[0][0]
+        self.assertFalse(mock_collection.bulk_write.call_args[1]['ordered'])
+        self.assertEqual(operacoes[1]._filter, {'sigla': 'B'})
+        self.assertEqual(operacoes[1]._doc, {'$setOnInsert': {'nome': 'b'}})
+        self.assertEqual(criados, {1: 'id1'})
+
+    @patch('app.services.importacao.mongo.get_collection')
+    def test_upsert_em_lote_conflito_concorrente_nao_e_erro(self, mock_get_collection):
+        """Testa se a chave criada ao mesmo tempo por outra importação é tratada como existente"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_collection.bulk_write.side_effect = BulkWriteError({
+            'upserted': [{'index': 0, '_id': 'id0'}],
+            'writeErrors': [{'index': 1, 'code': 11000, 'errmsg': 'duplicate key'}]
+        })
+        mock_get_collection.return_value = mock_collection
+
+        # Act
+        criados = upsert_em_lote('eventos', [{'sigla': 'A'}, {'sigla': 'B'}], [{}, {}])
+
+        # Assert
+        self.assertEqual(criados, {0: 'id0'})
+
+    @patch('app.services.importacao.mongo.get_collection')
+    def test_upsert_em_lote_propaga_outros_erros(self, mock_get_collection):
+        """Testa se erros que não são de chave duplicada interrompem a importação"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_collection.bulk_write.side_effect = BulkWriteError({
+            'writeErrors': [{'index': 0, 'code': 121, 'errmsg': 'validation failed'}]
+        })
+        mock_get_collection.return_value = mock_collection
+
+        # Act & Assert
+        with self.assertRaises(BulkWriteError):
+            upsert_em_lote('eventos', [{'sigla': 'A'}], [{}])
+
+    # ==================== TESTES DE resolver_eventos() ====================
+
+    @patch('app.services.importacao.mongo.get_collection')
+    def test_resolver_eventos_cria_apenas_os_ausentes(self, mock_get_collection):
+        """Testa se os ausentes são criados por upsert e os existentes lidos em uma consulta"""
+        # Arrange
+        existente_id = ObjectId()
+        mock_collection = MagicMock()
+        mock_collection.bulk_write.return_value.upserted_ids = {1: 'icse_id'}
+        mock_collection.find.return_value = [{'_id': existente_id, 'sigla': 'SBES'}]
+        mock_get_collection.return_value = mock_collection
+        eventos_info = {
+            'SBES': {'sigla': 'SBES', 'nome': 'Simpósio', 'descricao': ''},
+            'ICSE': {'sigla': 'ICSE', 'nome': 'Conference', 'descricao': ''}
+        }
+
+        # Act
+        ids, criados = resolver_eventos(eventos_info)
+
+        # Assert
+        self.assertEqual(ids, {'SBES': existente_id, 'ICSE': 'icse_id'})
+        self.assertEqual(criados, 1)
+        self.assertEqual(mock_collection.find.call_args[0][0], {'sigla': {'$in': ['SBES']}})
+
+    # ==================== TESTES DE resolver_edicoes() ====================
+
+    @patch('app.services.importacao.mongo.get_collection')
+    def test_resolver_edicoes_cria_apenas_as_ausentes(self, mock_get_collection):
+        """Testa se edições são resolvidas por (evento_id, ano) com upserts e uma consulta"""
+        # Arrange
+        evento_id = ObjectId()
+        existente_id = ObjectId()
+        mock_collection = MagicMock()
+        mock_collection.bulk_write.return_value.upserted_ids = {1: 'nova_id'}
+        mock_collection.find.return_value = [{'_id': existente_id, 'evento_id': evento_id, 'ano': 2023}]
+        mock_get_collection.return_value = mock_collection
+
+        # Act
+        ids, criadas = resolver_edicoes({(evento_id, 2023): {}, (evento_id, 2024): {'local': 'Recife'}})
+
+        # Assert
+        self.assertEqual(ids, {(evento_id, 2023): existente_id, (evento_id, 2024): 'nova_id'})
+        self.assertEqual(criadas, 1)
+        self.assertEqual(mock_collection.find.call_count, 1)
+        nova = mock_collection.bulk_write.call_args[0][0][1]
+        self.assertEqual(nova._filter, {'evento_id': evento_id, 'ano': 2024})
+        self.assertEqual(nova._doc['$setOnInsert']['local'], 'Recife')
+
+    def test_resolver_vazio_nao_consulta_banco(self):
+        """Testa se nenhuma consulta é feita sem eventos ou edições"""
+        # Arrange, Act & Assert
+        self.assertEqual(resolver_eventos({}), ({}, 0))
+        self.assertEqual(resolver_edicoes({}), ({}, 0))
+
+    # ==================== TESTES DE CacheResolucao ====================
+
+    @patch('app.services.importacao.resolver_edicoes')
+    @patch('app.services.importacao.resolver_eventos')
+    def test_cache_resolucao_consulta_cada_chave_uma_vez(self, mock_eventos, mock_edicoes):
+        """Testa se siglas e edições já resolvidas na importação não voltam ao banco"""
+        # Arrange
+        evento_id = ObjectId()
+        mock_eventos.side_effect = lambda info: ({sigla: evento_id for sigla in info}, len(info))
+        mock_edicoes.side_effect = lambda info: ({chave: ObjectId() for chave in info}, len(info))
+        resolucao = CacheResolucao()
+        sbes = {'SBES': {'sigla': 'SBES'}}
+
+        # Act
+        primeiro, criados = resolucao.resolver_eventos(sbes)
+        segundo, criados_depois = resolucao.resolver_eventos(dict(sbes, ICSE={'sigla': 'ICSE'}))
+        edicao, _ = resolucao.resolver_edicoes({(evento_id, 2024): {}})
+        mesma_edicao, criadas_depois = resolucao.resolver_edicoes({(evento_id, 2024): {}})
+
+        # Assert
+        self.assertEqual((criados, criados_depois), (1, 1))
+        self.assertEqual(mock_eventos.call_args_list[1][0][0], {'ICSE': {'sigla': 'ICSE'}})
+        self.assertEqual(segundo['SBES'], primeiro['SBES'])
+        self.assertEqual(mesma_edicao, edicao)
+        self.assertEqual(criadas_depois, 0)
+        self.assertEqual(mock_edicoes.call_args_list[1][0][0], {})
+
+    # ==================== TESTES DE importar_entradas() ====================
+
+    @patch('app.services.importacao.notificar_importacao', return_value=0)
+    @patch('app.services.importacao.procurar_semelhantes', return_value=[])
+    @patch('app.services.importacao.registrar_alteracao')
+    @patch('app.services.importacao.Autor.registrar_artigos')
+    @patch('app.services.importacao.gravar_artigos')
+    @patch('app.services.importacao.resolver_edicoes')
+    @patch('app.services.importacao.resolver_eventos')
+    @patch('app.services.importacao.artigos_existentes')
+    def test_importar_entradas_conta_duplicatas_e_erros(self, mock_existentes, mock_eventos, mock_edicoes,
+                                                        mock_gravar, mock_autores, mock_alteracao, mock_semelhantes,
+                                                        mock_notificar):
+        """Testa se duplicatas (título equivalente, citekey repetida ou já no banco) e entradas sem título entram nas estatísticas"""
+        # Arrange
+        evento_id = ObjectId()
+        mock_existentes.return_value = ({hash_titulo('Existente')}, set())
+        mock_eventos.return_value = ({'SBES': evento_id}, 1)
+        mock_edicoes.return_value = ({(evento_id, 2024): ObjectId()}, 1)
+        mock_gravar.side_effect = lambda docs: ([d.setdefault('_id', ObjectId()) for d in docs], 0, [])
+        entries = [
+            {'ID': 'a', 'title': 'Novo', 'booktitle': 'SBES', 'year': '2024', 'author': 'Ana Silva'},
+            {'ID': 'b', 'title': '{N}OVO.', 'booktitle': 'SBES', 'year': '2024'},
+            {'ID': 'c', 'title': 'Existente', 'booktitle': 'SBES', 'year': '2024'},
+            {'ID': 'a', 'title': 'Outro título', 'booktitle': 'SBES', 'year': '2024'},
+            {'ID': 'd', 'booktitle': 'SBES'}
+        ]
+        progresso = MagicMock()
+
+        # Act
+        stats = importar_entradas(entries, progresso=progresso)
+
+        # Assert
+        self.assertEqual(stats['artigos_criados'], 1)
+        self.assertEqual(stats['artigos_duplicados'], 3)
+        self.assertEqual(stats['erros'][0]['entry'], 'd')
+        mock_autores.assert_called_once()
+        progresso.assert_called_with('gravacao', 5, None)
+
+    @patch('app.services.importacao.notificar_importacao', return_value=0)
+    @patch('app.services.importacao.artigos_existentes', return_value=(set(), set()))
+    def test_importar_entradas_limita_lista_de_erros(self, mock_existentes, mock_notificar):
+        """Testa se os erros são todos contados, mas só os primeiros ficam listados nas estatísticas"""
+        # Arrange
+        entries = [{'ID': f'e{i}', 'booktitle': 'SBES'} for i in range(LIMITE_AMOSTRA_STATS + 50)]
+
+        # Act
+        stats = importar_entradas(entries)
+
+        # Assert
+        self.assertEqual(stats['total_erros'], LIMITE_AMOSTRA_STATS + 50)
+        self.assertEqual(len(stats['erros']), LIMITE_AMOSTRA_STATS)
+        self.assertEqual(stats['erros'][0]['entry'], 'e0')
+
+    @patch('app.services.importacao.notificar_importacao', return_value=0)
+    @patch('app.services.importacao.procurar_semelhantes', return_value=[])
+    @patch('app.services.importacao.registrar_alteracao')
+    @patch('app.services.importacao.Autor.registrar_artigos')
+    @patch('app.services.importacao.gravar_artigos')
+    @patch('app.services.importacao.resolver_edicoes')
+    @patch('app.services.importacao.resolver_eventos')
+    @patch('app.services.importacao.artigos_existentes')
+    def test_importar_lotes_detecta_duplicata_entre_lotes(self, mock_existentes, mock_eventos, mock_edicoes,
+                                                          mock_gravar, mock_autores, mock_alteracao, mock_semelhantes,
+                                                          mock_notificar):
+        """Testa se um título repetido em lotes diferentes do mesmo arquivo conta como duplicata"""
+        # Arrange
+        evento_id = ObjectId()
+        mock_existentes.return_value = (set(), set())
+        mock_eventos.return_value = ({'SBES': evento_id}, 0)
+        mock_edicoes.return_value = ({(evento_id, 2024): ObjectId()}, 0)
+        mock_gravar.side_effect = lambda docs: ([d.setdefault('_id', ObjectId()) for d in docs], 0, [])
+        entrada = {'ID': 'a', 'title': 'Repetido', 'booktitle': 'SBES', 'year': '2024'}
+
+        # Act
+        stats = importar_lotes(iter([[entrada], [dict(entrada, ID='b')]]))
+
+        # Assert
+        self.assertEqual(stats['total_entries'], 2)
+        self.assertEqual(stats['artigos_criados'], 1)
+        self.assertEqual(stats['artigos_duplicados'], 1)
+        self.assertEqual(mock_gravar.call_count, 1)
+
+    @patch('app.services.importacao.liberar_resumos')
+    @patch('app.services.importacao.notificar_importacao', return_value=3)
+    @patch('app.services.importacao.procurar_semelhantes', return_value=[])
+    @patch('app.services.importacao.registrar_alteracao')
+    @patch('app.services.importacao.Autor.registrar_artigos')
+    @patch('app.services.importacao.gravar_artigos')
+    @patch('app.services.importacao.resolver_edicoes')
+    @patch('app.services.importacao.resolver_eventos')
+    @patch('app.services.importacao.artigos_existentes')
+    def test_importar_lotes_notifica_inscritos_em_um_resumo_por_importacao(
+            self, mock_existentes, mock_eventos, mock_edicoes, mock_gravar, mock_autores,
+            mock_alteracao, mock_semelhantes, mock_notificar, mock_liberar):
+        """Testa se cada lote agenda as notificações dos artigos criados no mesmo grupo, liberado ao final"""
+        # Arrange
+        evento_id = ObjectId()
+        mock_existentes.return_value = (set(), set())
+        mock_eventos.return_value = ({'SBES': evento_id}, 0)
+        mock_edicoes.return_value = ({(evento_id, 2024): ObjectId()}, 0)
+        mock_gravar.side_effect = lambda docs: ([d['_id'] for d in docs], 0, [])
+        lote = lambda chave: [{'ID': chave, 'title': f'Artigo {chave}', 'booktitle': 'SBES', 'year': '2024',
+                               'author': 'Ana Silva'}]
+
+        # Act
+        stats = importar_lotes(iter([lote('a'), lote('b')]))
+
+        # Assert
+        self.assertEqual(mock_notificar.call_count, 2)
+        grupos = {chamada[0][1] for chamada in mock_notificar.call_args_list}
+        self.assertEqual(len(grupos), 1)
+        artigos = mock_notificar.call_args_list[0][0][0]
+        self.assertEqual(artigos[0]['autores'][0]['nome'], 'Ana Silva')
+        mock_liberar.assert_called_once_with(grupos.pop())
+        self.assertEqual(stats['notificacoes_agendadas'], 6)
+
+    @patch('builtins.print')
+    @patch('app.services.importacao.liberar_resumos')
+    @patch('app.services.importacao.importar_lote')
+    def test_importar_lotes_libera_resumos_mesmo_com_erro(self, mock_importar_lote, mock_liberar, mock_print):
+        """Testa se as notificações já agendadas são liberadas quando a importação falha no meio"""
+        # Arrange
+        def importar(entries, stats, vistos, resolucao, anexar_pdf, grupo_notificacao):
+            if entries == ['erro']:
+                raise RuntimeError('falha no banco')
+            stats['notificacoes_agendadas'] += 1
+        mock_importar_lote.side_effect = importar
+
+        # Act & Assert
+        with self.assertRaises(RuntimeError):
+            importar_lotes(iter([['ok'], ['erro']]))
+        mock_liberar.assert_called_once()
+
+    @patch('app.services.importacao.notificar_importacao', return_value=0)
+    @patch('app.services.importacao.procurar_semelhantes')
+    @patch('app.services.importacao.registrar_alteracao')
+    @patch('app.services.importacao.Autor.registrar_artigos')
+    @patch('app.services.importacao.gravar_artigos')
+    @patch('app.services.importacao.resolver_edicoes')
+    @patch('app.services.importacao.resolver_eventos')
+    @patch('app.services.importacao.artigos_existentes')
+    def test_importar_entradas_reporta_provaveis_duplicatas(self, mock_existentes, mock_eventos, mock_edicoes,
+                                                            mock_gravar, mock_autores, mock_alteracao, mock_semelhantes,
+                                                            mock_notificar):
+        """Testa se quase-duplicatas são gravadas e listadas nas estatísticas"""
+        # Arrange
+        evento_id = ObjectId()
+        existente_id = str(ObjectId())
+        mock_existentes.return_value = (set(), set())
+        mock_eventos.return_value = ({'SBES': evento_id}, 0)
+        mock_edicoes.return_value = ({(evento_id, 2024): ObjectId()}, 0)
+        mock_gravar.side_effect = lambda docs: ([d['_id'] for d in docs], 0, [])
+        mock_semelhantes.return_value = [(0, existente_id, 'A Study of Testing', 0.9)]
+        entries = [{'ID': 'a', 'title': 'A Study on Testing', 'booktitle': 'SBES', 'year': '2024'}]
+
+        # Act
+        stats = importar_entradas(entries)
+
+        # Assert
+        artigos = mock_semelhantes.call_args[0][0]
+        self.assertIn('minhash', artigos[0])
+        self.assertTrue(artigos[0]['lsh_baldes'])
+        self.assertEqual(stats['artigos_criados'], 1)
+        self.assertEqual(stats['total_provaveis_duplicatas'], 1)
+        self.assertEqual(stats['provaveis_duplicatas'], [{
+            'entry': 'a', 'artigo_id': str(artigos[0]['_id']), 'semelhante_a': existente_id,
+            'titulo_semelhante': 'A Study of Testing', 'similaridade': 0.9
+        }])
+
+    @patch('app.services.importacao.notificar_importacao', return_value=0)
+    @patch('app.services.importacao.procurar_semelhantes', return_value=[])
+    @patch('app.services.importacao.registrar_alteracao')
+    @patch('app.services.importacao.Autor.registrar_artigos')
+    @patch('app.services.importacao.gravar_artigos')
+    @patch('app.services.importacao.resolver_edicoes')
+    @patch('app.services.importacao.resolver_eventos')
+    @patch('app.services.importacao.artigos_existentes')
+    def test_importar_entradas_anexa_pdfs_e_remove_os_de_duplicatas(self, mock_existentes, mock_eventos, mock_edicoes,
+                                                                    mock_gravar, mock_autores, mock_alteracao,
+                                                                    mock_semelhantes, mock_notificar):
+        """Testa se o PDF é gravado no artigo e removido quando o artigo não chega a ser inserido"""
+        # Arrange
+        evento_id = ObjectId()
+        mock_existentes.return_value = (set(), set())
+        mock_eventos.return_value = ({'SBES': evento_id}, 0)
+        mock_edicoes.return_value = ({(evento_id, 2024): ObjectId()}, 0)
+        # O segundo artigo foi gravado antes por outra importação
+        mock_gravar.side_effect = lambda docs: ([docs[0]['_id']], 1, [])
+        pasta = tempfile.mkdtemp()
+        self.addCleanup(os.rmdir, pasta)
+
+        def anexar_pdf(citekey, artigo_id):
+            caminho = os.path.join(pasta, f'{citekey}.pdf')
+            open(caminho, 'wb').close()
+            return caminho
+        entries = [
+            {'ID': 'a', 'title': 'Primeiro', 'booktitle': 'SBES', 'year': '2024'},
+            {'ID': 'b', 'title': 'Segundo', 'booktitle': 'SBES', 'year': '2024'}
+        ]
+
+        # Act
+        stats = importar_lotes([entries], anexar_pdf=anexar_pdf)
+
+        # Assert
+        artigos = mock_gravar.call_args[0][0]
+        self.assertEqual([a['pdf_path'] for a in artigos], [os.path.join(pasta, 'a.pdf'), os.path.join(pasta, 'b.pdf')])
+        self.assertEqual(stats['pdfs_anexados'], 1)
+        self.assertEqual(os.listdir(pasta), ['a.pdf'])
+        os.remove(os.path.join(pasta, 'a.pdf'))
+
+    # ==================== TESTES DE checkpoint ====================
+
+    def _criar_arquivo(self, conteudo):
+        fd, caminho = tempfile.mkstemp(suffix='.bib')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(conteudo)
+        self.addCleanup(lambda: os.path.exists(caminho) and os.remove(caminho))
+        self.addCleanup(lambda: os.path.exists(caminho + '.checkpoint') and os.remove(caminho + '.checkpoint'))
+        return caminho
+
+    def test_checkpoint_ida_e_volta(self):
+        """Testa se as estatísticas salvas são recuperadas para o mesmo arquivo"""
+        # Arrange
+        caminho = self._criar_arquivo('@article{a, title={A}}')
+        stats = dict(estatisticas_vazias(), total_entries=500, artigos_criados=480)
+
+        # Act
+        salvar_checkpoint(caminho + '.checkpoint', caminho, stats)
+
+        # Assert
+        self.assertEqual(carregar_checkpoint(caminho + '.checkpoint', caminho), stats)
+
+    def test_checkpoint_de_arquivo_alterado_e_ignorado(self):
+        """Testa se o checkpoint é descartado quando o arquivo mudou"""
+        # Arrange
+        caminho = self._criar_arquivo('@article{a, title={A}}')
+        salvar_checkpoint(caminho + '.checkpoint', caminho, estatisticas_vazias())
+        with open(caminho, 'a', encoding='utf-8') as f:
+            f.write('\n@article{b, title={B}}')
+
+        # Act & Assert
+        self.assertIsNone(carregar_checkpoint(caminho + '.checkpoint', caminho))
+
+    @patch('app.services.importacao.importar_lote')
+    def test_importar_arquivo_retoma_do_checkpoint(self, mock_importar_lote):
+        """Testa se a importação pula as entradas já gravadas e remove o checkpoint ao final"""
+        # Arrange
+        caminho = self._criar_arquivo('@article{a, title={A}}\n@article{b, title={B}}\n@article{c, title={C}}')
+        checkpoint = caminho + '.checkpoint'
+        salvar_checkpoint(checkpoint, caminho, dict(estatisticas_vazias(), total_entries=2, blocos_lidos=2, artigos_criados=2))
+
+        def importar(entries, stats, vistos, resolucao, anexar_pdf, grupo_notificacao):
+            stats['total_entries'] += len(entries)
+        mock_importar_lote.side_effect = importar
+
+        # Act
+        stats = importar_arquivo(caminho, checkpoint=checkpoint)
+
+        # Assert
+        entradas = mock_importar_lote.call_args[0][0]
+        self.assertEqual([e['ID'] for e in entradas], ['c'])
+        self.assertEqual(stats['total_entries'], 3)
+        self.assertEqual(stats['artigos_criados'], 2)
+        self.assertFalse(os.path.exists(checkpoint))
+
+    @patch('app.services.importacao.importar_lote')
+    def test_importar_arquivo_retoma_apos_entradas_descartadas_pelo_parser(self, mock_importar_lote):
+        """Testa se entradas descartadas pelo bibtexparser (@online) contam na posição salva no checkpoint"""
+        # Arrange
+        caminho = self._criar_arquivo(
+            '@online{a, title={A}}\n@article{b, title={B}}\n@article{c, title={C}}\n@article{d, title={D}}'
+        )
+        checkpoint = caminho + '.checkpoint'
+
+        def importar(entries, stats, vistos, resolucao, anexar_pdf, grupo_notificacao):
+            stats['total_entries'] += len(entries)
+            if any(e['ID'] == 'c' for e in entries):
+                raise Exception('falha no meio da importação')
+        mock_importar_lote.side_effect = importar
+
+        with patch('app.services.importacao.ler_entradas',
+                   side_effect=lambda *args, **kwargs: ler_entradas(*args, tamanho_lote=2, **kwargs)):
+            # Act
+            with self.assertRaises(Exception):
+                importar_arquivo(caminho, checkpoint=checkpoint)
+            salvo = carregar_checkpoint(checkpoint, caminho)
+            mock_importar_lote.side_effect = lambda entries, stats, *args: stats.__setitem__(
+                'total_entries', stats['total_entries'] + len(entries))
+            importar_arquivo(caminho, checkpoint=checkpoint)
+
+        # Assert
+        self.assertEqual(salvo['total_entries'], 1)
+        self.assertEqual(salvo['blocos_lidos'], 2)
+        entradas = mock_importar_lote.call_args[0][0]
+        self.assertEqual([e['ID'] for e in entradas], ['c', 'd'])
+
+    # ==================== TESTES DE executar_importacao() ====================
+
+    @patch('app.services.importacao.Importacao')
+    @patch('app.services.importacao.importar_arquivo')
+    def test_executar_importacao_conclui_e_remove_arquivo(self, mock_importar, mock_importacao):
+        """Testa se a importação é concluída com as estatísticas e o arquivo temporário é removido"""
+        # Arrange
+        fd, caminho = tempfile.mkstemp(suffix='.bib')
+        os.close(fd)
+        stats = {'total_entries': 1, 'artigos_criados': 1}
+        mock_importar.return_value = stats
+        importacao_id = ObjectId()
+
+        # Act
+        executar_importacao(importacao_id, caminho)
+
+        # Assert
+        mock_importacao.iniciar.assert_called_once_with(importacao_id)
+        mock_importacao.concluir.assert_called_once_with(importacao_id, stats)
+        self.assertFalse(os.path.exists(caminho))
+
+    @patch('app.services.importacao.Importacao')
+    def test_executar_importacao_usa_importador_informado(self, mock_importacao):
+        """Testa se a importação de pacotes usa a função de importação recebida"""
+        # Arrange
+        fd, caminho = tempfile.mkstemp(suffix='.zip')
+        os.close(fd)
+        stats = {'total_entries': 2, 'artigos_criados': 2}
+        importar = MagicMock(return_value=stats)
+
+        # Act
+        resultado = executar_importacao(ObjectId(), caminho, importar)
+
+        # Assert
+        self.assertEqual(resultado, stats)
+        self.assertEqual(importar.call_args[0][0], caminho)
+        self.assertFalse(os.path.exists(caminho))
+
+    @patch('builtins.print')
+    @patch('app.services.importacao.Importacao')
+    @patch('app.services.importacao.importar_arquivo')
+    def test_executar_importacao_expirada_nao_e_processada(self, mock_importar, mock_importacao, mock_print):
+        """Testa se uma importação que expirou na fila é descartada sem importar e o arquivo é removido"""
+        # Arrange
+        fd, caminho = tempfile.mkstemp(suffix='.bib')
+        os.close(fd)
+        mock_importacao.iniciar.return_value = False
+
+        # Act
+        resultado = executar_importacao(ObjectId(), caminho)
+
+        # Assert
+        self.assertIsNone(resultado)
+        mock_importar.assert_not_called()
+        mock_importacao.concluir.assert_not_called()
+        self.assertFalse(os.path.exists(caminho))
+
+    @patch('app.services.importacao.Importacao')
+    @patch('app.services.importacao.importar_arquivo')
+    def test_executar_importacao_sem_entradas_falha(self, mock_importar, mock_importacao):
+        """Testa se um arquivo sem entradas marca a importação como falha"""
+        # Arrange
+        mock_importar.return_value = {'total_entries': 0}
+
+        # Act
+        resultado = executar_importacao(ObjectId(), '/caminho/inexistente.bib')
+
+        # Assert
+        self.assertIsNone(resultado)
+        mock_importacao.falhar.assert_called_once()
+        mock_importacao.concluir.assert_not_called()
+
+    @patch('app.services.importacao.Importacao')
+    @patch('app.services.importacao.importar_arquivo')
+    def test_executar_importacao_registra_falha(self, mock_importar, mock_importacao):
+        """Testa se uma exceção durante a importação marca o registro como falho"""
+        # Arrange
+        mock_importar.side_effect = ValueError('arquivo corrompido')
+        importacao_id = ObjectId()
+
+        # Act
+        resultado = executar_importacao(importacao_id, '/caminho/inexistente.bib')
+
+        # Assert
+        self.assertIsNone(resultado)
+        mock_importacao.falhar.assert_called_once()
+        mock_importacao.concluir.assert_not_called()
+
+    @patch('app.services.importacao.Importacao.find_by_id')
+    def test_situacao_importacao_apresenta_abandonada_como_falha_sem_gravar(self, mock_find_by_id):
+        """Testa se a consulta de situação mostra a importação parada como falha sem escrever no banco"""
+        # Arrange
+        mock_find_by_id.return_value = {'_id': 'x', 'status': 'processando',
+                                        'atualizado_em': datetime.utcnow() - timedelta(days=1)}
+
+        # Act
+        with patch('app.services.importacao.Importacao.expirar_abandonadas') as mock_expirar:
+            importacao = situacao_importacao('x')
+
+        # Assert
+        self.assertEqual(importacao['status'], 'falhou')
+        self.assertIn('interrompida', importacao['error'])
+        mock_expirar.assert_not_called()
+
+    @patch('app.services.importacao.executor_importacoes')
+    @patch('app.services.importacao.Importacao')
+    def test_enfileirar_importacao_expira_apenas_em_andamento(self, mock_importacao, mock_executor):
+        """Testa se o envio de um arquivo não expira importações pendentes que estão na fila"""
+        # Act
+        enfileirar_importacao('/tmp/x.bib', 'x.bib')
+
+        # Assert
+        self.assertFalse(mock_importacao.expirar_abandonadas.call_args[1]['incluir_pendentes'])
+        mock_executor.submit.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,171 @@
+"""
+Testes unitários para o modelo Importacao
+Testa o registro e as transições de estado das importações em lote com mocks do banco de dados
+"""
+
+import unittest
+import sys
+import os
+from datetime import datetime, timedelta
+from unittest.mock import patch, MagicMock
+from bson import ObjectId
+
+# Adiciona o caminho do backend ao sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+from app.models.importacao import Importacao, PENDENTE, PROCESSANDO, CONCLUIDA, FALHOU
+
+
+class TestImportacaoModel(unittest.TestCase):
+    """Suite de testes unitários para o modelo Importacao"""
+    
+    # ==================== TESTES DE create() ====================
+    
+    @patch('app.models.importacao.mongo.get_collection')
+    def test_create_registra_importacao_pendente(self, mock_get_collection):
+        """Testa se a importação é criada como pendente e sem estatísticas"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_collection.insert_one.return_value.inserted_id = ObjectId()
+        mock_get_collection.return_value = mock_collection
+        
+        # Act
+        importacao_id = Importacao.create('anais.bib')
+        
+        # Assert
+        documento = mock_collection.insert_one.call_args[0][0]
+        self.assertEqual(importacao_id, mock_collection.insert_one.return_value.inserted_id)
+        self.assertEqual(documento['status'], PENDENTE)
+        self.assertEqual(documento['arquivo'], 'anais.bib')
+        self.assertIsNone(documento['stats'])
+    
+    # ==================== TESTES DE find_by_id() ====================
+    
+    @patch('app.models.importacao.mongo.get_collection')
+    def test_find_by_id_converte_id(self, mock_get_collection):
+        """Testa se o _id é devolvido como string"""
+        # Arrange
+        importacao_id = ObjectId()
+        mock_collection = MagicMock()
+        mock_collection.find_one.return_value = {'_id': importacao_id, 'status': PROCESSANDO}
+        mock_get_collection.return_value = mock_collection
+        
+        # Act
+        importacao = Importacao.find_by_id(str(importacao_id))
+        
+        # Assert
+        self.assertEqual(importacao['_id'], str(importacao_id))
+    
+    @patch('app.models.importacao.mongo.get_collection')
+    def test_find_by_id_invalido_retorna_none(self, mock_get_collection):
+        """Testa se um ID inválido retorna None sem consultar o banco"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_get_collection.return_value = mock_collection
+        
+        # Act
+        importacao = Importacao.find_by_id('id-invalido')
+        
+        # Assert
+        self.assertIsNone(importacao)
+        mock_collection.find_one.assert_not_called()
+    
+    # ==================== TESTES DE transições ====================
+    
+    @patch('app.models.importacao.mongo.get_collection')
+    def test_concluir_grava_stats(self, mock_get_collection):
+        """Testa se concluir grava o status e as estatísticas"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_get_collection.return_value = mock_collection
+        stats = {'artigos_criados': 3, 'artigos_duplicados': 1, 'erros': []}
+        
+        # Act
+        Importacao.concluir(ObjectId(), stats)
+        
+        # Assert
+        alteracao = mock_collection.update_one.call_args[0][1]['$set']
+        self.assertEqual(alteracao['status'], CONCLUIDA)
+        self.assertEqual(alteracao['stats'], stats)
+    
+    @patch('app.models.importacao.mongo.get_collection')
+    def test_falhar_grava_erro(self, mock_get_collection):
+        """Testa se falhar grava o status e a mensagem de erro"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_get_collection.return_value = mock_collection
+        
+        # Act
+        Importacao.falhar(ObjectId(), 'arquivo inválido')
+        
+        # Assert
+        alteracao = mock_collection.update_one.call_args[0][1]['$set']
+        self.assertEqual(alteracao['status'], FALHOU)
+        self.assertEqual(alteracao['error'], 'arquivo inválido')
+
+    
+    @patch('app.models.importacao.mongo.get_collection')
+    def test_iniciar_so_inicia_importacao_pendente(self, mock_get_collection):
+        """Testa se iniciar exige status pendente e informa quando a importação já expirou"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_collection.update_one.return_value.modified_count = 0
+        mock_get_collection.return_value = mock_collection
+        
+        # Act
+        iniciada = Importacao.iniciar(ObjectId())
+        
+        # Assert
+        filtro, alteracao = mock_collection.update_one.call_args[0]
+        self.assertEqual(filtro['status'], PENDENTE)
+        self.assertEqual(alteracao['$set']['status'], PROCESSANDO)
+        self.assertFalse(iniciada)
+    
+    # ==================== TESTES DE expirar_abandonadas() ====================
+    
+    @patch('app.models.importacao.mongo.get_collection')
+    def test_expirar_abandonadas_falha_importacoes_sem_progresso(self, mock_get_collection):
+        """Testa se importações em andamento sem atualização recente são marcadas como falhas"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_collection.update_many.return_value.modified_count = 2
+        mock_get_collection.return_value = mock_collection
+        
+        # Act
+        expiradas = Importacao.expirar_abandonadas(600, 'interrompida')
+        
+        # Assert
+        filtro, alteracao = mock_collection.update_many.call_args[0]
+        self.assertEqual(filtro['status'], {'$in': [PROCESSANDO]})
+        self.assertIn('$lt', filtro['$or'][0]['atualizado_em'])
+        self.assertEqual(alteracao['$set']['status'], FALHOU)
+        self.assertEqual(alteracao['$set']['error'], 'interrompida')
+        self.assertEqual(expiradas, 2)
+    
+    @patch('app.models.importacao.mongo.get_collection')
+    def test_expirar_abandonadas_inclui_pendentes_so_quando_pedido(self, mock_get_collection):
+        """Testa se importações pendentes (possivelmente só esperando na fila) só expiram na inicialização"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_get_collection.return_value = mock_collection
+        
+        # Act
+        Importacao.expirar_abandonadas(600, 'interrompida', incluir_pendentes=True)
+        
+        # Assert
+        filtro = mock_collection.update_many.call_args[0][0]
+        self.assertEqual(filtro['status'], {'$in': [PENDENTE, PROCESSANDO]})
+    
+    def test_abandonada_considera_apenas_em_andamento_sem_progresso(self):
+        """Testa se só importações em andamento com progresso antigo são consideradas abandonadas"""
+        # Arrange
+        agora = datetime(2024, 1, 1, 12, 0)
+        antiga = agora - timedelta(seconds=601)
+        
+        # Act & Assert
+        self.assertTrue(Importacao.abandonada({'status': PROCESSANDO, 'atualizado_em': antiga}, 600, agora))
+        self.assertFalse(Importacao.abandonada({'status': PROCESSANDO, 'atualizado_em': agora}, 600, agora))
+        self.assertFalse(Importacao.abandonada({'status': PENDENTE, 'atualizado_em': antiga}, 600, agora))
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,331 @@
+"""
+Testes unitários para o registro de índices e as migrações versionadas
+Testa as funcionalidades com mocks para isolar dependências do MongoDB
+"""
+
+import unittest
+import sys
+import os
+from datetime import datetime, timedelta
+from unittest.mock import patch, MagicMock
+from bson import ObjectId
+from pymongo.errors import OperationFailure, BulkWriteError, DuplicateKeyError
+
+# Adiciona o caminho do backend ao sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+from app.services import indices
+from app.services.indices import (
+    INDICES, MIGRACOES, garantir_indices, aplicar_migracoes, normalizar_referencias,
+    reserva_expirada
+)
+
+
+class TestIndices(unittest.TestCase):
+    """Suite de testes unitários para o registro de índices"""
+
+    # ==================== TESTES DO REGISTRO ====================
+
+    def test_registro_declara_indices_das_consultas_principais(self):
+        """Testa se os índices usados pelas consultas principais estão declarados"""
+        # Arrange
+        nomes = {
+            colecao: {indice.document['name'] for indice in lista}
+            for colecao, lista in INDICES.items()
+        }
+
+        # Assert
+        self.assertIn('edicao_id_1', nomes['artigos'])
+        self.assertIn('sigla_unica', nomes['eventos'])
+        self.assertIn('evento_id_ano_unico', nomes['edicoes'])
+        self.assertIn('email_unico', nomes['inscricoes'])
+        self.assertIn('titulo_hash_unico', nomes['artigos'])
+        self.assertIn('citekey_unico', nomes['artigos'])
+        self.assertIn('lsh_baldes_1', nomes['artigos'])
+
+    def test_migracoes_tem_versoes_unicas_e_ordenadas(self):
+        """Testa se as migrações estão em ordem crescente e sem versões repetidas"""
+        # Arrange
+        versoes = [m['versao'] for m in MIGRACOES]
+
+        # Assert
+        self.assertEqual(versoes, sorted(set(versoes)))
+
+    # ==================== TESTES DE garantir_indices() ====================
+
+    @patch('builtins.print')
+    @patch('app.services.indices.mongo.get_collection')
+    def test_garantir_indices_continua_apos_falha(self, mock_get_collection, mock_print):
+        """Testa se a falha de um índice não impede a criação dos demais"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_collection.create_indexes.side_effect = [OperationFailure('duplicados')] + [None] * 50
+        mock_get_collection.return_value = mock_collection
+
+        # Act
+        resultado = garantir_indices(['artigos'])
+
+        # Assert
+        self.assertEqual(len(resultado['erros']), 1)
+        self.assertEqual(len(resultado['criados']), len(INDICES['artigos']) - 1)
+
+    # ==================== TESTES DE aplicar_migracoes() ====================
+
+    @patch('builtins.print')
+    @patch('app.services.indices.garantir_indices')
+    @patch('app.services.indices.mongo.get_collection')
+    def test_aplicar_migracoes_executa_apenas_pendentes(self, mock_get_collection, mock_garantir, mock_print):
+        """Testa se migrações já reservadas não são executadas de novo"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_get_collection.return_value = mock_collection
+        pendente = MagicMock()
+        aplicada = MagicMock()
+        mock_collection.update_one.side_effect = [
+            MagicMock(upserted_id=None),   # versão 1 já aplicada
+            MagicMock(upserted_id='novo'), # versão 2 pendente
+            MagicMock()                    # marca versão 2 como concluída
+        ]
+        mock_collection.find_one_and_update.return_value = None
+        mock_collection.find_one.return_value = {'status': 'concluida'}
+        migracoes = [
+            {'versao': 1, 'descricao': 'aplicada', 'funcao': aplicada},
+            {'versao': 2, 'descricao': 'pendente', 'funcao': pendente}
+        ]
+
+        # Act
+        with patch.object(indices, 'MIGRACOES', migracoes):
+            result = aplicar_migracoes()
+
+        # Assert
+        self.assertEqual(result, [2])
+        aplicada.assert_not_called()
+        pendente.assert_called_once()
+
+    @patch('builtins.print')
+    @patch('app.services.indices.garantir_indices')
+    @patch('app.services.indices.mongo.get_collection')
+    def test_aplicar_migracoes_libera_reserva_em_erro(self, mock_get_collection, mock_garantir, mock_print):
+        """Testa se uma migração que falha pode ser tentada novamente"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_get_collection.return_value = mock_collection
+        mock_collection.update_one.return_value = MagicMock(upserted_id='reserva')
+        migracoes = [{'versao': 1, 'descricao': 'falha', 'funcao': MagicMock(side_effect=RuntimeError('x'))}]
+
+        # Act & Assert
+        with patch.object(indices, 'MIGRACOES', migracoes):
+            with self.assertRaises(RuntimeError):
+                aplicar_migracoes()
+        mock_collection.delete_one.assert_called_once_with({'_id': 'reserva'})
+
+
+    @patch('builtins.print')
+    @patch('app.services.indices.garantir_indices')
+    @patch('app.services.indices.mongo.get_collection')
+    def test_aplicar_migracoes_retoma_reserva_expirada(self, mock_get_collection, mock_garantir, mock_print):
+        """Testa se uma reserva 'em_andamento' abandonada é retomada e concluída"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_get_collection.return_value = mock_collection
+        mock_collection.update_one.return_value = MagicMock(upserted_id=None)
+        mock_collection.find_one_and_update.return_value = {'_id': 'antiga', 'versao': 1}
+        funcao = MagicMock()
+        migracoes = [{'versao': 1, 'descricao': 'interrompida', 'funcao': funcao}]
+
+        # Act
+        with patch.object(indices, 'MIGRACOES', migracoes):
+            result = aplicar_migracoes()
+
+        # Assert
+        self.assertEqual(result, [1])
+        funcao.assert_called_once()
+        filtro = mock_collection.find_one_and_update.call_args[0][0]
+        self.assertEqual(filtro['status'], 'em_andamento')
+        self.assertIn('$lt', filtro['iniciada_em'])
+        conclusao = mock_collection.update_one.call_args_list[-1][0]
+        self.assertEqual(conclusao[0], {'_id': 'antiga'})
+        self.assertEqual(conclusao[1]['$set']['status'], 'concluida')
+
+    @patch('builtins.print')
+    @patch('app.services.indices.garantir_indices')
+    @patch('app.services.indices.mongo.get_collection')
+    def test_aplicar_migracoes_para_na_versao_em_execucao_em_outro_processo(self, mock_get_collection, mock_garantir, mock_print):
+        """Testa se as migrações seguintes não são aplicadas antes da versão que outro processo executa"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_get_collection.return_value = mock_collection
+        mock_collection.update_one.return_value = MagicMock(upserted_id=None)
+        mock_collection.find_one_and_update.return_value = None
+        mock_collection.find_one.return_value = {'status': 'em_andamento'}
+        seguinte = MagicMock()
+        migracoes = [
+            {'versao': 1, 'descricao': 'em execução', 'funcao': MagicMock()},
+            {'versao': 2, 'descricao': 'depende da 1', 'funcao': seguinte}
+        ]
+
+        # Act
+        with patch.object(indices, 'MIGRACOES', migracoes):
+            result = aplicar_migracoes()
+
+        # Assert
+        self.assertEqual(result, [])
+        seguinte.assert_not_called()
+
+    @patch('builtins.print')
+    @patch('app.services.indices.garantir_indices')
+    @patch('app.services.indices.mongo.get_collection')
+    def test_aplicar_migracoes_trata_reserva_simultanea(self, mock_get_collection, mock_garantir, mock_print):
+        """Testa se o upsert concorrente da reserva (DuplicateKeyError) conta como reservada por outro processo"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_get_collection.return_value = mock_collection
+        mock_collection.update_one.side_effect = DuplicateKeyError('duplicate key', 11000)
+        mock_collection.find_one_and_update.return_value = None
+        mock_collection.find_one.return_value = {'status': 'em_andamento'}
+        funcao = MagicMock()
+
+        # Act
+        with patch.object(indices, 'MIGRACOES', [{'versao': 1, 'descricao': 'x', 'funcao': funcao}]):
+            result = aplicar_migracoes()
+
+        # Assert
+        self.assertEqual(result, [])
+        funcao.assert_not_called()
+
+    def test_reserva_expirada(self):
+        """Testa se só reservas em andamento além do prazo são consideradas abandonadas"""
+        # Arrange
+        agora = datetime(2024, 1, 1, 12, 0)
+        antiga = agora - timedelta(seconds=indices.MIGRACAO_EXPIRACAO + 1)
+        recente = agora - timedelta(seconds=60)
+
+        # Act & Assert
+        self.assertTrue(reserva_expirada({'status': 'em_andamento', 'iniciada_em': antiga}, agora))
+        self.assertFalse(reserva_expirada({'status': 'em_andamento', 'iniciada_em': recente}, agora))
+        self.assertFalse(reserva_expirada({'status': 'concluida', 'iniciada_em': antiga}, agora))
+
+
+    # ==================== TESTES DE normalizar_referencias() ====================
+
+    def _mock_lotes(self, mock_get_collection, *lotes):
+        mock_collection = MagicMock()
+        mock_collection.find.return_value.sort.return_value.limit.side_effect = list(lotes) + [[]]
+        mock_get_collection.return_value = mock_collection
+        return mock_collection
+
+    @patch('builtins.print')
+    @patch('app.services.indices.mongo.get_collection')
+    def test_normalizar_referencias_converte_strings_em_lotes(self, mock_get_collection, mock_print):
+        """Testa se referências string viram ObjectId, conferindo o valor antigo"""
+        # Arrange
+        evento_id = ObjectId()
+        documentos = [{'_id': ObjectId(), 'evento_id': str(evento_id)}]
+        mock_collection = self._mock_lotes(mock_get_collection, documentos)
+        mock_collection.bulk_write.return_value = MagicMock(modified_count=1)
+
+        # Act
+        stats = normalizar_referencias('edicoes', 'evento_id', lote=1)
+
+        # Assert
+        self.assertEqual(stats['convertidos'], 1)
+        operacao = mock_collection.bulk_write.call_args[0][0][0]
+        self.assertEqual(operacao._doc, {'$set': {'evento_id': evento_id}})
+        self.assertEqual(operacao._filter['evento_id'], str(evento_id))
+
+    @patch('builtins.print')
+    @patch('app.services.indices.mongo.get_collection')
+    def test_normalizar_referencias_ignora_ids_invalidos(self, mock_get_collection, mock_print):
+        """Testa se valores que não são ObjectId são contados e não reprocessados no lote"""
+        # Arrange
+        mock_collection = self._mock_lotes(mock_get_collection, [{'_id': ObjectId(), 'edicao_id': 'abc'}])
+
+        # Act
+        stats = normalizar_referencias('artigos', 'edicao_id')
+
+        # Assert
+        self.assertEqual(stats['invalidos'], 1)
+        mock_collection.bulk_write.assert_not_called()
+
+    @patch('builtins.print')
+    @patch('app.services.indices.mongo.get_collection')
+    def test_normalizar_referencias_resolve_duplicados(self, mock_get_collection, mock_print):
+        """Testa se conflitos de índice único são repassados para ao_duplicar"""
+        # Arrange
+        documento = {'_id': ObjectId(), 'evento_id': str(ObjectId())}
+        mock_collection = self._mock_lotes(mock_get_collection, [documento])
+        mock_collection.bulk_write.side_effect = BulkWriteError({
+            'nModified': 0, 'writeErrors': [{'index': 0, 'code': 11000}]
+        })
+        ao_duplicar = MagicMock()
+
+        # Act
+        stats = normalizar_referencias('edicoes', 'evento_id', ao_duplicar=ao_duplicar)
+
+        # Assert
+        self.assertEqual(stats['duplicados'], 1)
+        ao_duplicar.assert_called_once_with(documento['_id'])
+
+    # ==================== TESTES DA MIGRAÇÃO 4 (titulo_hash) ====================
+
+    @patch('builtins.print')
+    @patch('app.services.indices.garantir_indices')
+    @patch('app.services.indices.mongo.get_collection')
+    def test_calcular_hash_titulos_mantem_duplicatas_sem_hash(self, mock_get_collection, mock_garantir, mock_print):
+        """Testa se artigos com título equivalente já gravado são contados e mantidos sem hash"""
+        # Arrange
+        artigos = [{'_id': ObjectId(), 'titulo': 'Artigo'}, {'_id': ObjectId(), 'titulo': 'ARTIGO.'}]
+        mock_collection = self._mock_lotes(mock_get_collection, artigos)
+        mock_collection.bulk_write.side_effect = BulkWriteError({
+            'nModified': 1, 'writeErrors': [{'index': 1, 'code': 11000}]
+        })
+
+        # Act
+        stats = indices._calcular_hash_titulos()
+
+        # Assert
+        mock_garantir.assert_called_once_with(['artigos'])
+        self.assertEqual(stats, {'calculados': 1, 'duplicados': 1})
+
+
+    # ==================== TESTES DA MIGRAÇÃO 5 (MinHash) ====================
+
+    @patch('builtins.print')
+    @patch('app.services.indices.mongo.get_collection')
+    def test_calcular_assinaturas_preenche_baldes(self, mock_get_collection, mock_print):
+        """Testa se os artigos sem baldes LSH recebem assinatura e baldes"""
+        # Arrange
+        artigos = [{'_id': ObjectId(), 'titulo': 'Artigo', 'resumo': 'Resumo do artigo'}]
+        mock_collection = self._mock_lotes(mock_get_collection, artigos)
+        mock_collection.bulk_write.return_value = MagicMock(modified_count=1)
+
+        # Act
+        calculadas = indices._calcular_assinaturas()
+
+        # Assert
+        self.assertEqual(calculadas, 1)
+        operacao = mock_collection.bulk_write.call_args[0][0][0]
+        self.assertIn('lsh_baldes', operacao._doc['$set'])
+
+    # ==================== TESTES DA MIGRAÇÃO 6 (termos) ====================
+
+    @patch('builtins.print')
+    @patch('app.services.indices.mongo.get_collection')
+    def test_calcular_termos_busca_preenche_termos(self, mock_get_collection, mock_print):
+        """Testa se os artigos sem termos recebem as palavras normalizadas de título e autores"""
+        # Arrange
+        artigos = [{'_id': ObjectId(), 'titulo': 'Análise', 'autores': [{'nome': 'Ana Silva'}]}]
+        mock_collection = self._mock_lotes(mock_get_collection, artigos)
+        mock_collection.bulk_write.return_value = MagicMock(modified_count=1)
+
+        # Act
+        calculados = indices._calcular_termos_busca()
+
+        # Assert
+        self.assertEqual(calculados, 1)
+        operacao = mock_collection.bulk_write.call_args[0][0][0]
+        self.assertEqual(operacao._doc['$set']['termos'], ['ana', 'analise', 'silva'])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
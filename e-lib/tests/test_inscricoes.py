@@ -0,0 +1,147 @@
+"""
+Testes unitários para o índice em memória das inscrições de notificação
+Testa a carga, a comparação por nome normalizado e as atualizações incrementais com mocks,
+e a rota de criação de inscrições
+"""
+
+import unittest
+import sys
+import os
+from unittest.mock import patch, MagicMock
+from bson import ObjectId
+from flask import Flask
+from pymongo.errors import DuplicateKeyError
+
+# Adiciona o caminho do backend ao sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+from app.services.inscricoes import IndiceInscricoes
+from app.routes.inscricoes import inscricoes_bp
+
+
+class TestIndiceInscricoes(unittest.TestCase):
+    """Suite de testes unitários para o IndiceInscricoes"""
+
+    def setUp(self):
+        self.id_ana = ObjectId()
+        self.ativas = [
+            {'_id': self.id_ana, 'email': 'x@ex.com', 'nome_autor': 'Ana  Conceição'},
+            {'_id': ObjectId(), 'email': 'y@ex.com', 'nome_autor': 'ana conceicao'},
+            {'_id': ObjectId(), 'email': 'z@ex.com', 'nome_autor': 'Bruno Souza'},
+        ]
+        self.indice = IndiceInscricoes(ttl=300)
+
+    # ==================== TESTES DE correspondencias() ====================
+
+    @patch('app.services.inscricoes.Notificacao.listar_ativas')
+    def test_correspondencias_ignora_acentos_e_maiusculas(self, mock_listar):
+        """Testa se nomes com grafias diferentes casam com as mesmas inscrições"""
+        # Arrange
+        mock_listar.return_value = self.ativas
+
+        # Act
+        resultado = self.indice.correspondencias(['ANA CONCEIÇÃO', 'Carla Dias'])
+
+        # Assert
+        self.assertEqual(list(resultado), ['ANA CONCEIÇÃO'])
+        self.assertEqual({i['email'] for i in resultado['ANA CONCEIÇÃO']}, {'x@ex.com', 'y@ex.com'})
+
+    @patch('app.services.inscricoes.Notificacao.listar_ativas')
+    def test_consultas_seguintes_nao_acessam_banco(self, mock_listar):
+        """Testa se o banco é lido uma vez e as consultas seguintes usam só a memória"""
+        # Arrange
+        mock_listar.return_value = self.ativas
+
+        # Act
+        self.indice.inscritos('Bruno Souza')
+        self.indice.correspondencias(['Ana Conceição'] * 10000)
+
+        # Assert
+        mock_listar.assert_called_once()
+
+    @patch('app.services.inscricoes.Notificacao.listar_ativas')
+    def test_recarrega_apos_ttl(self, mock_listar):
+        """Testa se o índice é recarregado quando a carga expira"""
+        # Arrange
+        mock_listar.return_value = self.ativas
+        self.indice.ttl = -1
+
+        # Act
+        self.indice.inscritos('Bruno Souza')
+        self.indice.inscritos('Bruno Souza')
+
+        # Assert
+        self.assertEqual(mock_listar.call_count, 2)
+
+    @patch('app.services.inscricoes.Notificacao.listar_ativas')
+    def test_nome_autor_nao_e_tratado_como_regex(self, mock_listar):
+        """Testa se um nome com caracteres especiais não casa com outros nomes"""
+        # Arrange
+        mock_listar.return_value = self.ativas
+
+        # Act & Assert
+        self.assertEqual(self.indice.inscritos('.*'), [])
+
+    # ==================== TESTES DE adicionar() e remover() ====================
+
+    @patch('app.services.inscricoes.Notificacao.listar_ativas')
+    def test_adicionar_e_remover_atualizam_sem_recarga(self, mock_listar):
+        """Testa se inscrições criadas e desativadas entram e saem do índice incrementalmente"""
+        # Arrange
+        mock_listar.return_value = self.ativas
+        self.indice.inscritos('Bruno Souza')
+
+        # Act
+        self.indice.adicionar({'_id': ObjectId(), 'email': 'w@ex.com', 'nome_autor': 'Carla Dias'})
+        self.indice.remover(str(self.id_ana))
+
+        # Assert
+        self.assertEqual([i['email'] for i in self.indice.inscritos('carla dias')], ['w@ex.com'])
+        self.assertEqual([i['email'] for i in self.indice.inscritos('Ana Conceição')], ['y@ex.com'])
+        mock_listar.assert_called_once()
+
+    @patch('app.services.inscricoes.Notificacao.listar_ativas')
+    def test_erro_na_carga_e_propagado(self, mock_listar):
+        """Testa se uma falha do banco não vira uma lista vazia de inscritos"""
+        # Arrange
+        mock_listar.side_effect = Exception('banco indisponível')
+
+        # Act & Assert
+        with self.assertRaises(Exception):
+            self.indice.correspondencias(['Ana Conceição'])
+
+
+
+class TestRotaCriarInscricao(unittest.TestCase):
+    """Suite de testes unitários para a rota POST /inscricoes"""
+
+    def setUp(self):
+        """Aplicação mínima com o blueprint de inscrições"""
+        app = Flask(__name__)
+        app.register_blueprint(inscricoes_bp, url_prefix='/api/inscricoes')
+        self.client = app.test_client()
+
+    # ==================== TESTES DE criar_inscricao() ====================
+
+    @patch('builtins.print')
+    @patch('app.routes.inscricoes.enviar_email_confirmacao_inscricao')
+    @patch('app.routes.inscricoes.mongo.get_collection')
+    def test_inscricao_simultanea_do_mesmo_email_retorna_409(self, mock_get_collection, mock_enviar, mock_print):
+        """Testa se o DuplicateKeyError de uma inscrição concorrente do mesmo email retorna 409"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_get_collection.return_value = mock_collection
+        mock_collection.find_one.return_value = None
+        mock_collection.insert_one.side_effect = DuplicateKeyError('duplicate key', 11000)
+
+        # Act
+        response = self.client.post('/api/inscricoes', json={'email': 'Ana@Ex.com'})
+
+        # Assert
+        self.assertEqual(response.status_code, 409)
+        self.assertIn('error', response.get_json())
+        mock_enviar.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
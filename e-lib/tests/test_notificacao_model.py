@@ -207,6 +207,21 @@ class TestNotificacaoModel(unittest.TestCase):
         self.assertIn('$regex', call_args['nome_autor'])
         self.assertEqual(call_args['nome_autor']['$options'], 'i')
     
+    @patch('app.models.notificacao.mongo.get_collection')
+    def test_find_by_autor_escapes_special_characters(self, mock_get_collection):
+        """Testa se o nome do autor é tratado como texto literal, não como regex"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_collection.find.return_value = []
+        mock_get_collection.return_value = mock_collection
+        
+        # Act
+        Notificacao.find_by_autor("Silva (J.)")
+        
+        # Assert
+        call_args = mock_collection.find.call_args[0][0]
+        self.assertEqual(call_args['nome_autor']['$regex'], r'Silva\ \(J\.\)')
+    
     @patch('app.models.notificacao.mongo.get_collection')
     def test_find_by_autor_only_returns_active_notifications(self, mock_get_collection):
         """Testa se find_by_autor retorna apenas notificações ativas"""
@@ -252,6 +267,35 @@ class TestNotificacaoModel(unittest.TestCase):
         self.assertTrue(any("Erro ao buscar notificações" in str(call) 
                            for call in mock_print.call_args_list))
     
+    # ==================== TESTES COM MOCKS - listar_ativas() ====================
+    
+    @patch('app.models.notificacao.mongo.get_collection')
+    def test_listar_ativas_busca_apenas_email_e_nome(self, mock_get_collection):
+        """Testa se listar_ativas filtra inscrições ativas e projeta só os campos usados no índice"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_collection.find.return_value = [{'_id': ObjectId(), 'email': self.test_email, 'nome_autor': 'A'}]
+        mock_get_collection.return_value = mock_collection
+        
+        # Act
+        result = Notificacao.listar_ativas()
+        
+        # Assert
+        filtro, projecao = mock_collection.find.call_args[0]
+        self.assertEqual(filtro, {'ativo': True})
+        self.assertEqual(projecao, {'email': 1, 'nome_autor': 1})
+        self.assertEqual(len(result), 1)
+    
+    @patch('app.models.notificacao.mongo.get_collection')
+    def test_listar_ativas_propaga_erro_do_banco(self, mock_get_collection):
+        """Testa se um erro do banco não é confundido com a ausência de inscritos"""
+        # Arrange
+        mock_get_collection.side_effect = Exception("Database error")
+        
+        # Act & Assert
+        with self.assertRaises(Exception):
+            Notificacao.listar_ativas()
+    
     # ==================== TESTES COM MOCKS - desativar_inscricao() ====================
     
     @patch('app.models.notificacao.mongo.get_collection')
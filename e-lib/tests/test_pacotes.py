@@ -0,0 +1,103 @@
+"""
+Testes unitários para a importação de pacotes zip (.bib + PDFs)
+Testa a localização dos membros do pacote e a extração dos PDFs com a importação mockada
+"""
+
+import unittest
+import sys
+import os
+import io
+import shutil
+import tempfile
+import zipfile
+from unittest.mock import patch
+from bson import ObjectId
+
+# Adiciona o caminho do backend ao sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+from app.services.pacotes import membros_do_pacote, importar_pacote
+from app.services.importacao import estatisticas_vazias
+
+
+class TestPacotes(unittest.TestCase):
+    """Suite de testes unitários para o serviço de pacotes"""
+
+    def setUp(self):
+        self.pasta = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.pasta)
+
+    def _pacote(self, membros):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w') as pacote:
+            for nome, conteudo in membros.items():
+                pacote.writestr(nome, conteudo)
+        buffer.seek(0)
+        return buffer
+
+    # ==================== TESTES DE membros_do_pacote() ====================
+
+    def test_membros_do_pacote_associa_pdfs_pela_citekey(self):
+        """Testa se os PDFs são indexados pelo nome sem extensão, em qualquer pasta"""
+        # Arrange
+        arquivo = self._pacote({
+            'anais/anais.bib': '', 'pdfs/silva2024.pdf': b'%PDF', 'SOUZA2023.PDF': b'%PDF',
+            '__MACOSX/._silva2024.pdf': b'', 'leiame.txt': ''
+        })
+
+        # Act
+        with zipfile.ZipFile(arquivo) as pacote:
+            bib, pdfs = membros_do_pacote(pacote)
+
+        # Assert
+        self.assertEqual(bib, 'anais/anais.bib')
+        self.assertEqual(pdfs, {'silva2024': 'pdfs/silva2024.pdf', 'SOUZA2023': 'SOUZA2023.PDF'})
+
+    def test_membros_do_pacote_exige_um_bib(self):
+        """Testa se pacotes sem .bib ou com mais de um são rejeitados"""
+        # Arrange
+        sem_bib = self._pacote({'a.pdf': b'%PDF'})
+        dois_bibs = self._pacote({'a.bib': '', 'b.bib': ''})
+
+        # Act & Assert
+        for arquivo in (sem_bib, dois_bibs):
+            with zipfile.ZipFile(arquivo) as pacote, self.assertRaises(ValueError):
+                membros_do_pacote(pacote)
+
+    # ==================== TESTES DE importar_pacote() ====================
+
+    @patch('app.services.pacotes.importar_texto')
+    def test_importar_pacote_extrai_pdf_do_artigo_gravado(self, mock_importar_texto):
+        """Testa se o .bib é lido do zip e só os PDFs pedidos na importação são extraídos"""
+        # Arrange
+        arquivo = self._pacote({
+            'anais.bib': '@inproceedings{silva2024, title={A}}',
+            'silva2024.pdf': b'%PDF-silva', 'sobrando.pdf': b'%PDF'
+        })
+        artigo_id = ObjectId()
+        anexados = {}
+
+        def importar(texto, progresso, processos, anexar_pdf):
+            anexados['bib'] = texto.read()
+            anexados['silva2024'] = anexar_pdf('silva2024', artigo_id)
+            anexados['sem_pdf'] = anexar_pdf('sem_pdf', ObjectId())
+            return estatisticas_vazias()
+        mock_importar_texto.side_effect = importar
+
+        # Act
+        stats = importar_pacote(arquivo, self.pasta)
+
+        # Assert
+        self.assertEqual(anexados['bib'], '@inproceedings{silva2024, title={A}}')
+        self.assertEqual(anexados['silva2024'], os.path.join(self.pasta, f'{artigo_id}_silva2024.pdf'))
+        self.assertIsNone(anexados['sem_pdf'])
+        with open(anexados['silva2024'], 'rb') as pdf:
+            self.assertEqual(pdf.read(), b'%PDF-silva')
+        self.assertEqual(os.listdir(self.pasta), [f'{artigo_id}_silva2024.pdf'])
+        self.assertEqual(stats['pdfs_ignorados'], ['sobrando.pdf'])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
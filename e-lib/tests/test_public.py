@@ -0,0 +1,176 @@
+"""
+Testes unitários para as rotas públicas
+Testa a homepage do autor e a listagem de autores com mocks para isolar dependências do MongoDB
+"""
+
+import unittest
+import sys
+import os
+from unittest.mock import patch, MagicMock
+from bson import ObjectId
+from flask import Flask
+
+# Adiciona o caminho do backend ao sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+from app.routes.public import public_bp
+
+
+class TestHomepageAutor(unittest.TestCase):
+    """Suite de testes unitários para a rota /autores/<nome>"""
+
+    def setUp(self):
+        """Aplicação mínima com o blueprint público e coleções simuladas"""
+        app = Flask(__name__)
+        app.register_blueprint(public_bp, url_prefix='/api/public')
+        self.client = app.test_client()
+
+        self.edicao_2021 = ObjectId()
+        self.edicao_2023 = ObjectId()
+        self.edicao_removida = ObjectId()
+        self.artigos = [
+            {'_id': ObjectId(), 'titulo': 'Primeiro', 'edicao_id': self.edicao_2021},
+            {'_id': ObjectId(), 'titulo': 'Segundo', 'edicao_id': self.edicao_2023},
+            {'_id': ObjectId(), 'titulo': 'Terceiro', 'edicao_id': self.edicao_2023},
+            {'_id': ObjectId(), 'titulo': 'Órfão', 'edicao_id': self.edicao_removida},
+        ]
+        self.colecoes = {
+            'artigos': MagicMock(),
+            'edicoes': MagicMock(),
+            'eventos': MagicMock(),
+            'versoes': MagicMock(),
+        }
+        self.colecoes['artigos'].find.return_value = self.artigos
+        # A edição do artigo órfão não existe mais
+        self.colecoes['edicoes'].find.return_value = [
+            {'_id': self.edicao_2021, 'ano': 2021},
+            {'_id': self.edicao_2023, 'ano': 2023},
+        ]
+        self.colecoes['eventos'].find.return_value = []
+        self.colecoes['versoes'].find.return_value = []
+
+        patcher = patch('app.routes.public.mongo.get_collection', side_effect=self.colecoes.__getitem__)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    # ==================== TESTES DE homepage_autor() ====================
+
+    @patch('app.routes.public.Autor.find_by_nome')
+    def test_agrupa_artigos_por_ano_em_ordem_decrescente(self, mock_find_by_nome):
+        """Testa se os artigos são agrupados pelo ano da edição, com os anos mais recentes primeiro"""
+        # Arrange
+        mock_find_by_nome.return_value = {'nome': 'Ana Silva', 'artigos': [a['_id'] for a in self.artigos]}
+
+        # Act
+        response = self.client.get('/api/public/autores/ana silva')
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        dados = response.get_json()
+        self.assertEqual(dados['autor'], 'Ana Silva')
+        self.assertEqual(dados['anos_ordenados'], [2023, 2021])
+        self.assertEqual([a['titulo'] for a in dados['artigos_por_ano']['2023']], ['Segundo', 'Terceiro'])
+        self.assertEqual([a['titulo'] for a in dados['artigos_por_ano']['2021']], ['Primeiro'])
+        self.assertEqual(dados['artigos_por_ano']['2021'][0]['edicao_id'], str(self.edicao_2021))
+
+    @patch('app.routes.public.Autor.find_by_nome')
+    def test_artigo_sem_edicao_fica_fora_dos_anos(self, mock_find_by_nome):
+        """Testa se um artigo cuja edição não existe não entra em nenhum ano, mas conta no total"""
+        # Arrange
+        mock_find_by_nome.return_value = {'nome': 'Ana Silva', 'artigos': [a['_id'] for a in self.artigos]}
+
+        # Act
+        dados = self.client.get('/api/public/autores/ana silva').get_json()
+
+        # Assert
+        titulos = [a['titulo'] for artigos in dados['artigos_por_ano'].values() for a in artigos]
+        self.assertNotIn('Órfão', titulos)
+        self.assertEqual(dados['total_artigos'], 4)
+
+    @patch('app.routes.public.Autor.find_by_nome')
+    def test_busca_artigos_do_autor_em_uma_consulta(self, mock_find_by_nome):
+        """Testa se os artigos vêm de uma única consulta $in pelos IDs do documento do autor"""
+        # Arrange
+        ids = [a['_id'] for a in self.artigos]
+        mock_find_by_nome.return_value = {'nome': 'Ana Silva', 'artigos': ids}
+
+        # Act
+        self.client.get('/api/public/autores/ana silva')
+
+        # Assert
+        self.colecoes['artigos'].find.assert_called_once_with({'_id': {'$in': ids}})
+        self.colecoes['edicoes'].find.assert_called_once()
+
+    @patch('app.routes.public.Autor.find_by_nome', return_value=None)
+    def test_autor_desconhecido_retorna_pagina_vazia(self, mock_find_by_nome):
+        """Testa se um autor sem documento gera uma página vazia com o nome pedido"""
+        # Act
+        response = self.client.get('/api/public/autores/Fulano')
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        dados = response.get_json()
+        self.assertEqual(dados['autor'], 'Fulano')
+        self.assertEqual(dados['artigos_por_ano'], {})
+        self.assertEqual(dados['anos_ordenados'], [])
+        self.assertEqual(dados['total_artigos'], 0)
+        self.colecoes['artigos'].find.assert_not_called()
+
+    @patch('builtins.print')
+    @patch('app.routes.public.Autor.find_by_nome', side_effect=Exception('banco indisponível'))
+    def test_erro_retorna_500(self, mock_find_by_nome, mock_print):
+        """Testa se erros inesperados retornam 500 com a mensagem"""
+        # Act
+        response = self.client.get('/api/public/autores/Ana')
+
+        # Assert
+        self.assertEqual(response.status_code, 500)
+        self.assertIn('error', response.get_json())
+
+
+
+class TestListarAutores(unittest.TestCase):
+    """Suite de testes unitários para a rota /autores"""
+
+    def setUp(self):
+        """Aplicação mínima com o blueprint público"""
+        app = Flask(__name__)
+        app.register_blueprint(public_bp, url_prefix='/api/public')
+        self.client = app.test_client()
+
+        patcher = patch('app.routes.public.mongo.get_collection', return_value=MagicMock(find=MagicMock(return_value=[])))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    # ==================== TESTES DE listar_autores() ====================
+
+    @patch('app.routes.public.Autor.find_all')
+    def test_pagina_cheia_informa_proximo(self, mock_find_all):
+        """Testa se uma página com `limit` autores informa o cursor da próxima"""
+        # Arrange
+        mock_find_all.return_value = [{'nome': 'Ana', 'nome_normalizado': 'ana'}, {'nome': 'Bia', 'nome_normalizado': 'bia'}]
+
+        # Act
+        response = self.client.get('/api/public/autores?limit=2')
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['proximo'], 'bia')
+        mock_find_all.assert_called_once_with(limite=2, apos=None)
+
+    @patch('app.routes.public.Autor.find_all')
+    def test_limit_invalido_retorna_400(self, mock_find_all):
+        """Testa se limit não numérico, menor que 1 ou acima do máximo retorna 400 sem consultar o banco"""
+        for limite in ('abc', '0', '-5', '501'):
+            with self.subTest(limit=limite):
+                # Act
+                response = self.client.get(f'/api/public/autores?limit={limite}')
+
+                # Assert
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('error', response.get_json())
+        mock_find_all.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
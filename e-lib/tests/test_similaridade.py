@@ -0,0 +1,143 @@
+"""
+Testes unitários para a detecção de quase-duplicatas (MinHash/LSH)
+Testa as assinaturas, os baldes e as consultas ao MongoDB com mocks
+"""
+
+import unittest
+import sys
+import os
+from unittest.mock import patch, MagicMock
+from bson import ObjectId
+
+# Adiciona o caminho do backend ao sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+from app.services.similaridade import (
+    NUM_PERMUTACOES, BANDAS, shingles, assinatura, baldes, similaridade, campos_similaridade,
+    pares_candidatos, procurar_semelhantes, pares_duplicados
+)
+
+RESUMO = ('Este artigo apresenta uma ferramenta para a geração automática de casos de teste '
+          'a partir de modelos de requisitos, avaliada em três sistemas industriais.')
+
+
+class TestSimilaridade(unittest.TestCase):
+    """Suite de testes unitários para o serviço de similaridade"""
+
+    # ==================== TESTES DE ASSINATURA ====================
+
+    def test_shingles_ignoram_caixa_acentos_e_latex(self):
+        """Testa se variações de formatação geram os mesmos shingles"""
+        # Arrange, Act & Assert
+        self.assertEqual(shingles("An\\'{a}lise de \\textit{Requisitos}"), shingles('ANÁLISE DE REQUISITOS'))
+        self.assertEqual(shingles('Teste'), {'teste'})
+
+    def test_assinatura_tem_tamanho_fixo_e_e_deterministica(self):
+        """Testa se a assinatura tem NUM_PERMUTACOES valores e não depende da execução"""
+        # Arrange & Act
+        minhash = assinatura('Geração de Casos de Teste', RESUMO)
+
+        # Assert
+        self.assertEqual(len(minhash), NUM_PERMUTACOES)
+        self.assertEqual(minhash, assinatura('Geração de Casos de Teste', RESUMO))
+
+    def test_assinatura_sem_texto_retorna_none(self):
+        """Testa se artigos sem título e resumo não têm assinatura"""
+        # Arrange, Act & Assert
+        self.assertIsNone(assinatura('', None))
+        self.assertEqual(campos_similaridade('{}'), {'minhash': None, 'lsh_baldes': []})
+
+    def test_textos_parecidos_tem_alta_similaridade_e_baldes_em_comum(self):
+        """Testa se uma variação pequena do título é detectada e um artigo diferente não"""
+        # Arrange
+        original = assinatura('Geração Automática de Casos de Teste a partir de Requisitos', RESUMO)
+        variacao = assinatura('Geracao automatica de casos de teste a partir dos requisitos', RESUMO)
+        diferente = assinatura('Deep Learning for Code Search', 'We propose a neural model for code retrieval.')
+
+        # Act & Assert
+        self.assertGreaterEqual(similaridade(original, variacao), 0.6)
+        self.assertTrue(set(baldes(original)) & set(baldes(variacao)))
+        self.assertLess(similaridade(original, diferente), 0.2)
+        self.assertFalse(set(baldes(original)) & set(baldes(diferente)))
+
+    def test_baldes_um_por_banda(self):
+        """Testa se há uma chave por banda, prefixada pelo número da banda"""
+        # Arrange & Act
+        chaves = baldes(assinatura('Título', RESUMO))
+
+        # Assert
+        self.assertEqual(len(chaves), BANDAS)
+        self.assertEqual([c.split(':')[0] for c in chaves], [str(b) for b in range(BANDAS)])
+
+    def test_pares_candidatos_sem_repeticao(self):
+        """Testa se pares que dividem vários baldes aparecem uma vez só"""
+        # Arrange, Act & Assert
+        self.assertEqual(pares_candidatos([['b', 'a'], ['a', 'b', 'c'], ['d']]), {('a', 'b'), ('a', 'c'), ('b', 'c')})
+
+    # ==================== TESTES DE procurar_semelhantes() ====================
+
+    def _artigo(self, titulo, resumo=RESUMO):
+        return {'_id': ObjectId(), 'titulo': titulo, **campos_similaridade(titulo, resumo)}
+
+    @patch('app.services.similaridade.mongo.get_collection')
+    def test_procurar_semelhantes_compara_com_banco_e_com_o_lote(self, mock_get_collection):
+        """Testa se o artigo mais parecido é encontrado no banco ou entre os anteriores do lote"""
+        # Arrange
+        existente = self._artigo('Geração Automática de Casos de Teste')
+        mock_collection = MagicMock()
+        mock_collection.find.return_value = [existente]
+        mock_get_collection.return_value = mock_collection
+        novos = [
+            self._artigo('Geracao automatica de casos de teste.'),
+            self._artigo('Deep Learning for Code Search', 'We propose a neural model for code retrieval.'),
+            self._artigo('Deep learning for code search', 'We propose a neural model for code retrieval')
+        ]
+
+        # Act
+        semelhantes = procurar_semelhantes(novos)
+
+        # Assert
+        mock_collection.find.assert_called_once()
+        filtro = mock_collection.find.call_args[0][0]
+        self.assertEqual(set(filtro['lsh_baldes']['$in']), {b for a in novos for b in a['lsh_baldes']})
+        self.assertEqual([(s[0], s[1]) for s in semelhantes], [(0, str(existente['_id'])), (2, str(novos[1]['_id']))])
+
+    # ==================== TESTES DE pares_duplicados() ====================
+
+    @patch('app.services.similaridade.mongo.get_collection')
+    def test_pares_duplicados_filtra_pelo_limiar(self, mock_get_collection):
+        """Testa se só os pares acima do limiar são devolvidos, do mais ao menos parecido"""
+        # Arrange
+        a = self._artigo('Geração Automática de Casos de Teste')
+        b = self._artigo('Geracao automatica de casos de teste.')
+        c = self._artigo('Deep Learning for Code Search', 'We propose a neural model for code retrieval.')
+        mock_collection = MagicMock()
+        mock_collection.aggregate.return_value = [{'_id': '0:1', 'ids': [a['_id'], b['_id'], c['_id']]}]
+        mock_collection.find.return_value = [a, b, c]
+        mock_get_collection.return_value = mock_collection
+
+        # Act
+        pares = pares_duplicados(limiar=0.8)
+
+        # Assert
+        self.assertEqual(len(pares), 1)
+        self.assertEqual({artigo['_id'] for artigo in pares[0]['artigos']}, {str(a['_id']), str(b['_id'])})
+
+    @patch('app.services.similaridade.mongo.get_collection')
+    def test_pares_duplicados_sem_candidatos_nao_busca_artigos(self, mock_get_collection):
+        """Testa se nenhum artigo é lido quando nenhum balde é compartilhado"""
+        # Arrange
+        mock_collection = MagicMock()
+        mock_collection.aggregate.return_value = []
+        mock_get_collection.return_value = mock_collection
+
+        # Act
+        pares = pares_duplicados()
+
+        # Assert
+        self.assertEqual(pares, [])
+        mock_collection.find.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,176 @@
+"""
+Testes unitários para o pool de conexões SMTP
+Testa o reaproveitamento das conexões, a reconexão e a renovação com conexões simuladas
+"""
+
+import unittest
+import sys
+import os
+import smtplib
+from email.mime.text import MIMEText
+from unittest.mock import patch, MagicMock
+
+# Adiciona o caminho do backend ao sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+from app.services.smtp_pool import PoolSMTP
+
+
+def mensagem(destinatario='x@ex.com'):
+    msg = MIMEText('corpo')
+    msg['To'] = destinatario
+    return msg
+
+
+class TestPoolSMTP(unittest.TestCase):
+    """Suite de testes unitários para o PoolSMTP"""
+
+    def setUp(self):
+        self.conexoes = []
+
+        def fabrica(servidor, porta, timeout):
+            conexao = MagicMock()
+            self.conexoes.append(conexao)
+            return conexao
+
+        self.pool = PoolSMTP('smtp.ex.com', 587, usuario='user', senha='senha',
+                             tamanho=2, mensagens_por_conexao=3, fabrica=fabrica)
+
+    # ==================== TESTES DE enviar_varios() ====================
+
+    def test_varias_mensagens_usam_uma_conexao_autenticada(self):
+        """Testa se STARTTLS e login acontecem uma vez para várias mensagens"""
+        # Act
+        resultados = self.pool.enviar_varios([mensagem(), mensagem()])
+
+        # Assert
+        self.assertEqual(resultados, [True, True])
+        self.assertEqual(len(self.conexoes), 1)
+        self.conexoes[0].starttls.assert_called_once()
+        self.conexoes[0].login.assert_called_once_with('user', 'senha')
+        self.assertEqual(self.conexoes[0].send_message.call_count, 2)
+
+    def test_conexao_ociosa_e_reaproveitada_entre_chamadas(self):
+        """Testa se a conexão volta ao pool e é usada pelo envio seguinte"""
+        # Act
+        self.pool.enviar(mensagem())
+        self.pool.enviar(mensagem())
+
+        # Assert
+        self.assertEqual(len(self.conexoes), 1)
+
+    def test_conexao_derrubada_e_refeita_e_mensagem_reenviada(self):
+        """Testa se a queda da conexão provoca reconexão e novo envio da mesma mensagem"""
+        # Arrange
+        self.pool.enviar(mensagem())
+        self.conexoes[0].send_message.side_effect = smtplib.SMTPServerDisconnected('timeout')
+
+        # Act
+        resultado = self.pool.enviar(mensagem())
+
+        # Assert
+        self.assertTrue(resultado)
+        self.assertEqual(len(self.conexoes), 2)
+        self.conexoes[1].send_message.assert_called_once()
+
+    @patch('builtins.print')
+    def test_recusa_no_reenvio_mantem_a_nova_conexao(self, mock_print):
+        """Testa se, quando o reenvio após a reconexão é recusado, a nova conexão continua em uso e volta ao pool"""
+        # Arrange
+        recusa = smtplib.SMTPRecipientsRefused({'ruim@ex.com': (550, b'nao existe')})
+        self.pool.enviar(mensagem())
+        self.conexoes[0].send_message.side_effect = smtplib.SMTPServerDisconnected('timeout')
+
+        def fabrica(servidor, porta, timeout):
+            conexao = MagicMock()
+            conexao.send_message.side_effect = [recusa, None]
+            self.conexoes.append(conexao)
+            return conexao
+        self.pool.fabrica = fabrica
+
+        # Act
+        resultados = self.pool.enviar_varios([mensagem('ruim@ex.com'), mensagem()])
+        self.pool.fechar()
+
+        # Assert
+        self.assertEqual(resultados, [False, True])
+        self.assertEqual(len(self.conexoes), 2)
+        self.assertEqual(self.conexoes[1].send_message.call_count, 2)
+        self.conexoes[1].quit.assert_called_once()
+
+    @patch('builtins.print')
+    def test_falha_de_conexao_no_reenvio_fecha_a_nova_conexao(self, mock_print):
+        """Testa se a nova conexão é encerrada quando o reenvio também perde a conexão"""
+        # Arrange
+        self.pool.enviar(mensagem())
+        self.conexoes[0].send_message.side_effect = smtplib.SMTPServerDisconnected('timeout')
+
+        def fabrica(servidor, porta, timeout):
+            conexao = MagicMock()
+            conexao.send_message.side_effect = smtplib.SMTPServerDisconnected('timeout')
+            self.conexoes.append(conexao)
+            return conexao
+        self.pool.fabrica = fabrica
+
+        # Act
+        resultados = self.pool.enviar_varios([mensagem(), mensagem()])
+
+        # Assert
+        self.assertEqual(resultados, [False, False])
+        self.conexoes[1].quit.assert_called_once()
+        self.assertTrue(self.pool._livres.empty())
+
+    def test_conexao_renovada_apos_limite_de_mensagens(self):
+        """Testa se a conexão é trocada ao atingir mensagens_por_conexao"""
+        # Act
+        self.pool.enviar_varios([mensagem() for _ in range(4)])
+
+        # Assert
+        self.assertEqual(len(self.conexoes), 2)
+        self.conexoes[0].quit.assert_called_once()
+        self.assertEqual(self.conexoes[1].send_message.call_count, 1)
+
+    @patch('builtins.print')
+    def test_destinatario_recusado_nao_descarta_conexao(self, mock_print):
+        """Testa se a recusa de uma mensagem não interrompe as demais nem reconecta"""
+        # Arrange
+        recusa = smtplib.SMTPRecipientsRefused({'ruim@ex.com': (550, b'nao existe')})
+        self.pool.enviar(mensagem())
+        self.conexoes[0].send_message.side_effect = [recusa, None]
+
+        # Act
+        resultados = self.pool.enviar_varios([mensagem('ruim@ex.com'), mensagem()])
+
+        # Assert
+        self.assertEqual(resultados, [False, True])
+        self.assertEqual(len(self.conexoes), 1)
+
+    @patch('builtins.print')
+    def test_servidor_indisponivel_falha_mensagens_restantes(self, mock_print):
+        """Testa se, sem conseguir conectar, todas as mensagens retornam False"""
+        # Arrange
+        self.pool.fabrica = MagicMock(side_effect=ConnectionRefusedError('recusada'))
+
+        # Act
+        resultados = self.pool.enviar_varios([mensagem(), mensagem(), mensagem()])
+
+        # Assert
+        self.assertEqual(resultados, [False, False, False])
+        self.pool.fabrica.assert_called_once()
+
+    # ==================== TESTES DE fechar() ====================
+
+    def test_fechar_encerra_conexoes_ociosas(self):
+        """Testa se fechar envia QUIT para as conexões do pool"""
+        # Arrange
+        self.pool.enviar(mensagem())
+
+        # Act
+        self.pool.fechar()
+
+        # Assert
+        self.conexoes[0].quit.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
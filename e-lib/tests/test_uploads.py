@@ -0,0 +1,107 @@
+"""
+Testes unitários para o tratamento de uploads em disco
+Testa o arquivo temporário assumível e a request que grava uploads grandes nele
+"""
+
+import unittest
+import sys
+import os
+import io
+from flask import Flask, request, jsonify
+
+# Adiciona o caminho do backend ao sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+from app.services.uploads import (
+    ArquivoTemporario, RequisicaoUpload, TAMANHO_MAXIMO_EM_MEMORIA, tamanho_upload, assumir_upload
+)
+
+
+class TestUploads(unittest.TestCase):
+    """Suite de testes unitários para o serviço de uploads"""
+
+    def setUp(self):
+        """Aplicação mínima que registra o que a rota recebeu"""
+        self.app = Flask(__name__)
+        self.app.request_class = RequisicaoUpload
+        self.recebido = {}
+
+        @self.app.route('/upload', methods=['POST'])
+        def upload():
+            arquivo = request.files['file']
+            self.recebido['em_disco'] = isinstance(arquivo.stream, ArquivoTemporario)
+            self.recebido['tamanho'] = tamanho_upload(arquivo)
+            self.recebido['caminho'] = assumir_upload(arquivo, '.bib')
+            return jsonify({})
+
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        caminho = self.recebido.get('caminho')
+        if caminho and os.path.exists(caminho):
+            os.remove(caminho)
+
+    def _enviar(self, conteudo):
+        return self.client.post('/upload', data={'file': (io.BytesIO(conteudo), 'anais.bib')},
+                                content_type='multipart/form-data')
+
+    # ==================== TESTES DE ArquivoTemporario ====================
+
+    def test_arquivo_temporario_removido_ao_fechar(self):
+        """Testa se o arquivo é apagado no close() quando não foi mantido"""
+        # Arrange
+        arquivo = ArquivoTemporario('.bib')
+        arquivo.write(b'@article{a}')
+
+        # Act
+        arquivo.close()
+
+        # Assert
+        self.assertTrue(arquivo.name.endswith('.bib'))
+        self.assertFalse(os.path.exists(arquivo.name))
+
+    def test_arquivo_temporario_mantido_continua_em_disco(self):
+        """Testa se manter() grava o conteúdo e preserva o arquivo após o close()"""
+        # Arrange
+        arquivo = ArquivoTemporario()
+        arquivo.write(b'@article{a}')
+
+        # Act
+        caminho = arquivo.manter()
+        arquivo.close()
+
+        # Assert
+        with open(caminho, 'rb') as f:
+            self.assertEqual(f.read(), b'@article{a}')
+        os.remove(caminho)
+
+    # ==================== TESTES DE RequisicaoUpload ====================
+
+    def test_upload_grande_e_assumido_sem_copia(self):
+        """Testa se um upload grande vai para um ArquivoTemporario que a rota assume"""
+        # Arrange
+        conteudo = b'%' * (TAMANHO_MAXIMO_EM_MEMORIA + 1)
+
+        # Act
+        response = self._enviar(conteudo)
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(self.recebido['em_disco'])
+        self.assertEqual(self.recebido['tamanho'], len(conteudo))
+        self.assertEqual(os.path.getsize(self.recebido['caminho']), len(conteudo))
+
+    def test_upload_pequeno_e_gravado_em_arquivo_novo(self):
+        """Testa se um upload mantido em memória é gravado em um arquivo temporário"""
+        # Arrange & Act
+        self._enviar(b'@article{a, title={A}}')
+
+        # Assert
+        self.assertFalse(self.recebido['em_disco'])
+        self.assertTrue(self.recebido['caminho'].endswith('.bib'))
+        with open(self.recebido['caminho'], 'rb') as f:
+            self.assertEqual(f.read(), b'@article{a, title={A}}')
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
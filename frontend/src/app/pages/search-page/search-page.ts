@@ -31,6 +31,11 @@ export class SearchPage implements OnInit {
   searchResults: Article[] = [];
   searchPerformed = false;
   isLoading = false;
+  isLoadingMore = false;
+  totalResults = 0;
+  nextCursor: string | null = null;
+  private lastQuery = '';
+  private lastFilters: any = {};
 
   constructor(
     private fb: FormBuilder,
@@ -68,29 +73,23 @@ export class SearchPage implements OnInit {
       filters.evento = eventFilter.trim();
     }
 
+    this.lastQuery = searchTerm.trim();
+    this.lastFilters = filters;
+
     // Chamar API de busca
-    this.apiService.searchArticles(searchTerm.trim(), filters).subscribe({
+    this.apiService.searchArticles(this.lastQuery, filters).subscribe({
       next: (response: any) => {
-        // Backend retorna { resultados: [...], total: X }
+        // Backend retorna { resultados: [...], total: X, proximo_cursor: ... }
         const results = response.resultados || response || [];
         
         // Mapear resultados do backend para o modelo frontend
-        this.searchResults = results.map((a: any) => ({
-          id: a._id,
-          title: a.titulo,
-          authors: a.autores?.map((autor: any) => autor.nome || autor) || [],
-          abstract: a.resumo,
-          year: a.edicao_ano || a.ano || new Date().getFullYear(),
-          eventEditionId: a.edicao_id,
-          pdfUrl: a.pdf_path || '',
-          keywords: a.keywords || [],
-          eventName: a.evento_nome,
-          eventSigla: a.evento_sigla
-        }));
+        this.searchResults = results.map((a: any) => this.mapArticle(a));
+        this.totalResults = response.total ?? this.searchResults.length;
+        this.nextCursor = response.proximo_cursor || null;
 
         this.isLoading = false;
         this.snackBar.open(
-          `Busca realizada! ${this.searchResults.length} resultado(s) encontrado(s).`,
+          `Busca realizada! ${this.totalResults} resultado(s) encontrado(s).`,
           'Fechar',
           { duration: 3000, panelClass: ['success-snackbar'] }
         );
@@ -99,6 +98,8 @@ export class SearchPage implements OnInit {
         console.error('Erro na busca:', err);
         this.isLoading = false;
         this.searchResults = [];
+        this.totalResults = 0;
+        this.nextCursor = null;
         this.snackBar.open('Erro ao realizar busca', 'Fechar', { 
           duration: 3000,
           panelClass: ['error-snackbar']
@@ -107,9 +108,51 @@ export class SearchPage implements OnInit {
     });
   }
 
+  loadMore(): void {
+    if (!this.nextCursor || this.isLoadingMore) {
+      return;
+    }
+
+    this.isLoadingMore = true;
+    this.apiService.searchArticles(this.lastQuery, this.lastFilters, this.nextCursor).subscribe({
+      next: (response: any) => {
+        const results = response.resultados || [];
+        this.searchResults = [...this.searchResults, ...results.map((a: any) => this.mapArticle(a))];
+        this.totalResults = response.total ?? this.totalResults;
+        this.nextCursor = response.proximo_cursor || null;
+        this.isLoadingMore = false;
+      },
+      error: (err) => {
+        console.error('Erro ao carregar mais resultados:', err);
+        this.isLoadingMore = false;
+        this.snackBar.open('Erro ao carregar mais resultados', 'Fechar', { 
+          duration: 3000,
+          panelClass: ['error-snackbar']
+        });
+      }
+    });
+  }
+
+  private mapArticle(a: any): Article {
+    return {
+      id: a._id,
+      title: a.titulo,
+      authors: a.autores?.map((autor: any) => autor.nome || autor) || [],
+      abstract: a.resumo,
+      year: a.edicao_ano || a.ano || new Date().getFullYear(),
+      eventEditionId: a.edicao_id,
+      pdfUrl: a.pdf_path || '',
+      keywords: a.keywords || [],
+      eventName: a.evento_nome,
+      eventSigla: a.evento_sigla
+    } as Article;
+  }
+
   clearSearch(): void {
     this.searchForm.reset();
     this.searchResults = [];
+    this.totalResults = 0;
+    this.nextCursor = null;
     this.searchPerformed = false;
   }
 
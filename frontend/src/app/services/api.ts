@@ -1,6 +1,6 @@
 import { Injectable } from '@angular/core';
 import { HttpClient, HttpParams } from '@angular/common/http';
-import { Observable } from 'rxjs';
+import { Observable, exhaustMap, first, of, switchMap, throwError, timer } from 'rxjs';
 import { Event, EventEdition, Article } from '../models/event.model';
 
 @Injectable({
@@ -75,18 +75,40 @@ export class ApiService {
   }
 
   // Batch Upload
+  // O backend responde 202 com o ID da importação; o resultado ({ message, stats }) só é
+  // emitido quando o job termina, então quem chama recebe as estatísticas como antes
   uploadBibtex(formData: FormData): Observable<any> {
-    return this.http.post<any>(`${this.baseUrl}/batch/upload-bibtex`, formData);
+    return this.http.post<any>(`${this.baseUrl}/batch/upload-bibtex`, formData).pipe(
+      switchMap(response => response?.job_id ? this.waitForBatchJob(response.job_id) : of(response))
+    );
+  }
+
+  getBatchJob(jobId: string): Observable<any> {
+    return this.http.get<any>(`${this.baseUrl}/batch/jobs/${jobId}`);
+  }
+
+  // Consulta a situação da importação até ela terminar; uma falha vira erro no mesmo
+  // formato das respostas HTTP de erro (err.error.error)
+  waitForBatchJob(jobId: string, intervalMs = 1000): Observable<any> {
+    return timer(0, intervalMs).pipe(
+      exhaustMap(() => this.getBatchJob(jobId)),
+      first(job => job.status === 'concluida' || job.status === 'falhou'),
+      switchMap(job => job.status === 'concluida'
+        ? of({ message: 'Upload processado com sucesso', stats: job.stats })
+        : throwError(() => ({ error: { error: job.error || 'Erro ao processar arquivo BibTeX' } })))
+    );
   }
 
   // Busca
-  searchArticles(query: string, filters?: any): Observable<any[]> {
+  searchArticles(query: string, filters?: any, cursor?: string | null): Observable<any[]> {
     let params = new HttpParams().set('q', query);
     
     if (filters) {
       if (filters.autor) params = params.set('autor', filters.autor);
       if (filters.evento) params = params.set('evento', filters.evento);
     }
+    // Próxima página: o backend devolve `proximo_cursor` enquanto houver mais resultados
+    if (cursor) params = params.set('cursor', cursor);
     
     return this.http.get<any[]>(`${this.baseUrl}/artigos/busca`, { params });
   }
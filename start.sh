@@ -29,6 +29,9 @@ fi
 source venv/bin/activate
 pip install -q -r requirements.txt
 
+# Aplicar migrações pendentes e criar os índices
+python migrar_banco.py || exit 1
+
 # Iniciar backend em background
 export FLASK_APP=run.py
 export FLASK_ENV=development
@@ -53,6 +53,14 @@ pip install -q -r requirements.txt
 echo "✅ Dependências instaladas"
 echo ""
 
+# Aplicar migrações pendentes e criar os índices
+echo "🔧 Aplicando migrações do banco de dados..."
+if ! python migrar_banco.py; then
+    echo "❌ Erro: Falha ao aplicar as migrações!"
+    exit 1
+fi
+echo ""
+
 # Verificar se banco está populado
 echo "🗄️  Verificando banco de dados..."
 ARTICLE_COUNT=$(mongosh --quiet --eval "db.getSiblingDB('simple-lib').artigos.countDocuments()" 2>/dev/null || echo "0")